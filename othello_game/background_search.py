@@ -0,0 +1,306 @@
+from opening_book import OpeningBook
+from player import Player
+from position import Position
+
+
+# The stop event shared with the main process, the opening book and the
+# headless players of the worker process, kept between moves so that their
+# transposition tables survive from one move to the next
+_WORKER_STATE = {}
+
+# Whether worker processes can be started here, found by the first call to
+# BackgroundSearch.available
+_PROCESS_SUPPORT = {}
+
+
+def _attach_stop_event(stop_event, opening_book_path=None,
+                       book_randomness=0):
+    """
+    Function -- _attach_stop_event
+        Runs once in the worker process: keeps the event the main process
+        sets to stop the running search and maps the opening book, if any
+    Parameters:
+        stop_event: Event, the shared stop event
+        opening_book_path: Optional[str], the opening book file
+        book_randomness: int, the randomness of the book moves (see
+            OpeningBook)
+    Returns:
+        None
+    """
+    _WORKER_STATE["stop_event"] = stop_event
+    _WORKER_STATE["opening_book"] = (
+        OpeningBook(opening_book_path, book_randomness)
+        if opening_book_path is not None else None)
+    _WORKER_STATE["players"] = {}
+
+
+def _select_move_hard(position, time_budget_ms, search_workers,
+                      parallel_mode, start_depth=1):
+    """
+    Function -- _select_move_hard
+        Runs in the worker process: selects the hard AI's move for a position
+        with a headless Player whose searches stop once the stop event is set
+    Parameters:
+        position: tuple[int, int, int, str], the board size, black bitmask,
+            white bitmask and color of the player to move
+        time_budget_ms: Optional[int], the wall-clock time (ms) the search
+            may use
+        search_workers: int, the number of processes the player searches with
+        parallel_mode: str, how the search is spread across processes,
+            ROOT_SPLIT or LAZY_SMP
+        start_depth: int, the first depth of the search (see
+            Player.select_move_hard)
+    Returns:
+        result: tuple[Optional[int], SearchStats], the bit index of the
+            selected move (None if the player has no legal move) and the stats
+            of its search
+    """
+    size, black, white, color = position
+
+    players = _WORKER_STATE["players"]
+    player = players.get((size, color))
+    if player is None:
+        player = Player(None, "Computer", color,
+                        search_workers=search_workers,
+                        parallel_mode=parallel_mode,
+                        position=Position(size),
+                        opening_book=_WORKER_STATE["opening_book"])
+        player.search_engine.stop_event = _WORKER_STATE["stop_event"]
+        player.endgame_solver.stop_event = _WORKER_STATE["stop_event"]
+        if search_workers > 1:
+            # The player's own worker processes stop with the same event
+            player.parallel_search.stop_event = _WORKER_STATE["stop_event"]
+        players[(size, color)] = player
+
+    player.position = Position(size, black, white, color)
+    index = player.select_move_hard(time_budget_ms, start_depth)
+    return index, player.search_stats
+
+
+def _shutdown_players():
+    """
+    Function -- _shutdown_players
+        Runs in the worker process before it stops: stops the processes its
+        players search with, which would otherwise keep it from exiting
+    Parameters:
+        None
+    Returns:
+        None
+    """
+    for player in _WORKER_STATE["players"].values():
+        player.shutdown_search()
+
+
+class BackgroundSearch:
+    """
+    Purpose:
+    The BackgroundSearch class runs the hard AI's search in a worker process
+    so that Processing's draw() thread never waits on it: with the search in
+    its own process, the GIL is never held by the search and every frame
+    renders on time however deep the AI searches. A search is started with
+    start, polled each frame with done and collected with result. cancel
+    stops a running search through an event shared with the worker and with
+    the processes its player searches with, which every search checks as
+    often as it checks its time budget. Positions are sent to the worker as
+    a tuple of the board size, the two tile bitmasks and the side to move.
+
+    Methods:
+    available: returns whether worker processes can be started
+    start: starts searching a position in the worker process
+    result: returns the move and stats of the finished search
+    cancel: stops the running search and drops its result
+    _wait_for_cancelled: waits for a cancelled search to stop
+    shutdown: stops the worker process
+
+    Attributes:
+    _search_workers: int, the number of processes the worker's player
+        searches with
+    _parallel_mode: str, how the worker's player spreads its search across
+        processes, ROOT_SPLIT or LAZY_SMP
+    _opening_book_path: Optional[str], the opening book the worker's player
+        plays from
+    _book_randomness: int, the randomness of the book moves (see
+        OpeningBook)
+    _executor: Optional[ProcessPoolExecutor], the single worker process,
+        started by the first search
+    _stop_event: Optional[Event], set to stop the worker's running search
+    _future: Optional[Future], the running or finished search
+    _cancelled_future: Optional[Future], a cancelled search that may still
+        be stopping
+    """
+
+    def __init__(self, search_workers=1, parallel_mode=Player.ROOT_SPLIT,
+                 opening_book_path=None, book_randomness=0):
+        self._search_workers = search_workers
+        self._parallel_mode = parallel_mode
+        self._opening_book_path = opening_book_path
+        self._book_randomness = book_randomness
+        self._executor = None
+        self._stop_event = None
+        self._future = None
+        self._cancelled_future = None
+
+    @property
+    def search_workers(self):
+        """getter method for self._search_workers"""
+        return self._search_workers
+
+    @property
+    def parallel_mode(self):
+        """getter method for self._parallel_mode"""
+        return self._parallel_mode
+
+    @property
+    def opening_book_path(self):
+        """getter method for self._opening_book_path"""
+        return self._opening_book_path
+
+    @property
+    def running(self):
+        """getter method for whether a search has been started and not
+        collected"""
+        return self._future is not None
+
+    @property
+    def done(self):
+        """getter method for whether the started search has finished"""
+        return self._future is not None and self._future.done()
+
+    @staticmethod
+    def available():
+        """
+        Function -- available
+            Returns whether worker processes can be started here. Jython,
+            which runs the Processing sketch, has neither concurrent.futures
+            nor multiprocessing; the imports are only tried once.
+        Parameters:
+            None
+        Returns:
+            available: bool, True if background searches can run
+        """
+        if "available" not in _PROCESS_SUPPORT:
+            try:
+                import concurrent.futures
+                import multiprocessing
+            except ImportError:
+                _PROCESS_SUPPORT["available"] = False
+            else:
+                _PROCESS_SUPPORT["available"] = True
+        return _PROCESS_SUPPORT["available"]
+
+    def start(self, position, color, time_budget_ms=None, start_depth=1):
+        """
+        Function -- start
+            Starts searching a position for the player of the given color in
+            the worker process and returns at once. A search already running
+            is cancelled first.
+        Parameters:
+            position: Position, the position to search; the worker gets a
+                snapshot of it, so it may change while the search runs
+            color: str, the color of the player to move
+            time_budget_ms: Optional[int], the wall-clock time (ms) the search
+                may use
+            start_depth: int, the first depth of the search, for a position
+                the worker has already searched to that depth (see
+                Player.select_move_hard)
+        Returns:
+            None
+        """
+        if self._future is not None:
+            self.cancel()
+        self._wait_for_cancelled()
+
+        if self._executor is None:
+            # Imported here so that the game loads on Jython, which has no
+            # processes; only the background search mode needs them
+            from concurrent.futures import ProcessPoolExecutor
+            import multiprocessing
+
+            self._stop_event = multiprocessing.Event()
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                initializer=_attach_stop_event,
+                initargs=(self._stop_event, self._opening_book_path,
+                          self._book_randomness))
+
+        self._stop_event.clear()
+        self._future = self._executor.submit(
+            _select_move_hard,
+            (position.size, position.bitboard.black, position.bitboard.white,
+             color),
+            time_budget_ms,
+            self._search_workers,
+            self._parallel_mode,
+            start_depth)
+
+    def result(self):
+        """
+        Function -- result
+            Returns the result of the started search, waiting for it if it
+            has not finished, and clears it so another search can start
+        Parameters:
+            None
+        Returns:
+            result: tuple[Optional[int], SearchStats], the bit index of the
+                selected move (None if the player has no legal move) and the
+                stats of its search
+        """
+        if self._future is None:
+            raise ValueError("No search has been started")
+        future, self._future = self._future, None
+        return future.result()
+
+    def cancel(self):
+        """
+        Function -- cancel
+            Stops the running search, if any, without waiting for it, and
+            drops its result
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        if self._future is None:
+            return
+        self._stop_event.set()
+        if not self._future.cancel():
+            self._cancelled_future = self._future
+        self._future = None
+
+    def _wait_for_cancelled(self):
+        """
+        Function -- _wait_for_cancelled
+            Waits for a cancelled search to stop, so that clearing the stop
+            event cannot let it carry on
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        if self._cancelled_future is not None:
+            from concurrent.futures import CancelledError, wait
+
+            wait([self._cancelled_future])
+            try:
+                self._cancelled_future.result()
+            except CancelledError:
+                pass
+            self._cancelled_future = None
+
+    def shutdown(self):
+        """
+        Function -- shutdown
+            Cancels any running search and stops the worker process, after
+            the processes its players search with. The next search starts a
+            new worker.
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        self.cancel()
+        if self._executor is not None:
+            self._executor.submit(_shutdown_players).result()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._cancelled_future = None
@@ -0,0 +1,136 @@
+from background_search import (BackgroundSearch, _WORKER_STATE,
+                               _attach_stop_event, _select_move_hard)
+from bitboard import Bitboard
+from opening_book import OpeningBook
+from player import Player
+from position import Position
+from search_stats import SearchStats
+
+import multiprocessing
+import pytest
+import time
+
+
+def test_constructor():
+    bs: BackgroundSearch = BackgroundSearch(search_workers=2,
+                                            parallel_mode=Player.LAZY_SMP)
+    assert bs.search_workers == 2
+    assert bs.parallel_mode == Player.LAZY_SMP
+    assert not bs.running
+    assert not bs.done
+    # CPython can start the worker process
+    assert BackgroundSearch.available()
+
+
+def test__select_move_hard():
+    stop_event = multiprocessing.Event()
+    _attach_stop_event(stop_event)
+    try:
+        position: Position = Position(8)
+        position_tuple = (8, position.bitboard.black,
+                          position.bitboard.white, "black")
+
+        # A set stop event ends the search early
+        stop_event.set()
+        index, stats = _select_move_hard(position_tuple, None, 1,
+                                         Player.ROOT_SPLIT)
+        assert stats.depth_reached < Player.MAX_RECURSION_DEPTH
+
+        stop_event.clear()
+        index, stats = _select_move_hard(position_tuple, None, 1,
+                                         Player.ROOT_SPLIT)
+        assert index in [move.index for move in position.legal_moves()]
+        assert isinstance(stats, SearchStats)
+        assert stats.depth_reached == Player.MAX_RECURSION_DEPTH
+        # The worker's player is kept for the next move
+        player = _WORKER_STATE["players"][(8, "black")]
+        assert player.search_engine.stop_event is stop_event
+
+        # A search of a position already searched resumes at its depth
+        resumed_index, resumed_stats = _select_move_hard(
+            position_tuple, None, 1, Player.ROOT_SPLIT,
+            start_depth=Player.MAX_RECURSION_DEPTH)
+        assert resumed_index in [move.index
+                                 for move in position.legal_moves()]
+        assert resumed_stats.nodes < stats.nodes
+    finally:
+        _WORKER_STATE.clear()
+
+
+def test_start_and_result():
+    bs: BackgroundSearch = BackgroundSearch()
+    position: Position = Position(8)
+    try:
+        with pytest.raises(ValueError):
+            bs.result()
+        bs.start(position, "black")
+        assert bs.running
+        deadline = time.time() + 30
+        while not bs.done and time.time() < deadline:
+            time.sleep(0.01)
+        assert bs.done
+        index, stats = bs.result()
+        assert index in [move.index for move in position.legal_moves()]
+        assert stats.nodes > 0
+        assert not bs.running
+    finally:
+        bs.shutdown()
+
+
+def test_cancel():
+    bs: BackgroundSearch = BackgroundSearch()
+    position: Position = Position(8)
+    try:
+        # A search with a budget of minutes stops once cancelled, so the
+        # next search starts at once
+        bs.start(position, "black", time_budget_ms=600000)
+        time.sleep(0.5)
+        bs.cancel()
+        assert not bs.running
+
+        start_time = time.time()
+        bs.start(position, "black", time_budget_ms=50)
+        index, stats = bs.result()
+        assert time.time() - start_time < 10
+        assert index in Bitboard.yield_indices(
+            position.bitboard.calculate_move_mask("black"))
+    finally:
+        bs.shutdown()
+
+
+def test_cancel_parallel():
+    position: Position = Position(8)
+    for parallel_mode in (Player.ROOT_SPLIT, Player.LAZY_SMP):
+        bs: BackgroundSearch = BackgroundSearch(search_workers=2,
+                                                parallel_mode=parallel_mode)
+        try:
+            # The worker's own search processes stop too, so starting the
+            # next search does not wait for the cancelled one
+            bs.start(position, "black", time_budget_ms=600000)
+            time.sleep(0.5)
+            bs.cancel()
+
+            start_time = time.time()
+            bs.start(position, "black", time_budget_ms=50)
+            assert time.time() - start_time < 10
+            index, stats = bs.result()
+            assert index in Bitboard.yield_indices(
+                position.bitboard.calculate_move_mask("black"))
+        finally:
+            bs.shutdown()
+
+
+def test_opening_book(tmp_path):
+    path = str(tmp_path / "book.bin")
+    OpeningBook.build(path, size=8, plies=1, depth=1)
+    bs: BackgroundSearch = BackgroundSearch(opening_book_path=path)
+    assert bs.opening_book_path == path
+    position: Position = Position(8)
+    try:
+        # The worker plays the start position from its mapped book
+        bs.start(position, "black")
+        index, stats = bs.result()
+        assert index in [move.index for move in position.legal_moves()]
+        assert stats.nodes == 0
+    finally:
+        bs.shutdown()
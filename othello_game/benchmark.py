@@ -0,0 +1,325 @@
+from game_board import GameBoard
+from perft import Perft
+from player import Player
+
+import argparse
+import json
+import math
+import sys
+import time
+import tracemalloc
+
+
+class Benchmark:
+    """
+    Purpose:
+    The Benchmark class times the hot paths of the game board and the AI on
+    a fixed set of positions, the stored positions of Perft, so that every
+    change to them can be measured. Each case is run several times per
+    position and reported as the median and 95th percentile time (ms) and
+    the memory allocated by one run (KB, traced with tracemalloc). Results
+    are written as JSON, and a later run can be compared with a stored
+    baseline to flag regressions beyond a threshold.
+
+    Methods:
+    _percentile: returns a percentile of a list of times
+    _setup_board: creates a game board at a stored position
+    _create_cases: returns the setup and timed function of each case
+    _measure: times a case and measures its allocations
+    run: runs every case on every position
+    write: writes results to a JSON file
+    read: reads results from a JSON file
+    compare: finds the regressions between a baseline and new results
+
+    Attributes:
+    _repeats: int, the number of timed runs of each case per position
+    _hard_depth: int, the search depth of the hard AI case
+    _positions: list[str], the names of the stored positions to run on
+    _perft: Perft, replays the stored positions
+    """
+
+    GAME_BOARD_INIT = "game_board_init"
+    CALCULATE_LEGAL_MOVES = "calculate_legal_moves"
+    TAKE_TURN = "take_turn"
+    NEXT_MOVE_MED = "calculate_next_move_med"
+    NEXT_MOVE_HARD = "calculate_next_move_hard"
+    POSITION_COPY = "position_copy"
+
+    # Metrics compared against the baseline; p95 is too noisy to gate on
+    COMPARED_METRICS = ("median_ms", "allocated_kb")
+    DEFAULT_THRESHOLD = 0.10
+
+    def __init__(self, repeats=20, hard_depth=4, positions=None):
+        self._repeats = repeats
+        self._hard_depth = hard_depth
+        self._positions = positions or sorted(Perft.STORED_POSITIONS)
+        self._perft = Perft()
+
+    @property
+    def repeats(self):
+        """getter method for self._repeats"""
+        return self._repeats
+
+    @property
+    def positions(self):
+        """getter method for self._positions"""
+        return self._positions
+
+    @staticmethod
+    def _percentile(times, percentile):
+        """
+        Function -- _percentile
+            Returns a percentile of a list of times (nearest rank)
+        Parameters:
+            times: list[float], the measured times
+            percentile: float, the percentile, from 0 to 100
+        Returns:
+            time: float, the time at that percentile
+        """
+        ordered = sorted(times)
+        rank = max(1, int(math.ceil(percentile / 100.0 * len(ordered))))
+        return ordered[rank - 1]
+
+    def _setup_board(self, name):
+        """
+        Function -- _setup_board
+            Creates a game board at a stored position, with a player of the
+            color to move
+        Parameters:
+            name: str, the name of the stored position
+        Returns:
+            state: tuple[GameBoard, Player], the game board and the player
+        """
+        gb = self._perft.play_moves(Perft.STORED_POSITIONS[name],
+                                    GameBoard(board_size=800))
+        player = Player(gb, "Computer", gb.side_to_move)
+        return gb, player
+
+    def _create_cases(self):
+        """
+        Function -- _create_cases
+            Returns every case to run. Each case has a setup function that
+            prepares a fresh state for a position (untimed) and a function
+            that runs the timed code on that state.
+        Parameters:
+            None
+        Returns:
+            cases: list[tuple[str, bool, function, function]], the name of
+                each case, whether it runs per position, its setup function
+                and its timed function
+        """
+        def setup_moves(name):
+            gb, player = self._setup_board(name)
+            gb.calculate_legal_moves(player.color)
+            return gb, player
+
+        def setup_hard(name):
+            gb, player = setup_moves(name)
+            player.MAX_RECURSION_DEPTH = self._hard_depth
+            # Allocate the transposition table outside the timed search
+            player.search_engine
+            return gb, player
+
+        def take_turn(state):
+            gb, player = state
+            if gb.legal_moves:
+                player.take_turn(*gb.project_square(
+                    gb.legal_moves[0].square_index))
+
+        return [
+            (self.GAME_BOARD_INIT, False,
+             lambda name: None,
+             lambda state: GameBoard(board_size=800)),
+            (self.CALCULATE_LEGAL_MOVES, True,
+             self._setup_board,
+             lambda state: state[0].calculate_legal_moves(state[1].color)),
+            (self.TAKE_TURN, True, setup_moves, take_turn),
+            (self.NEXT_MOVE_MED, True, setup_moves,
+             lambda state: state[1].calculate_next_move_med()),
+            (self.NEXT_MOVE_HARD, True, setup_hard,
+             lambda state: state[1].calculate_next_move_hard()),
+            (self.POSITION_COPY, True,
+             lambda name: self._setup_board(name)[0].position,
+             lambda state: state.copy()),
+        ]
+
+    def _measure(self, setup, function, name):
+        """
+        Function -- _measure
+            Times a case repeats times, each on a freshly set up state, then
+            runs it once more under tracemalloc to measure the memory it
+            allocates
+        Parameters:
+            setup: function, prepares the state of a run
+            function: function, the timed code
+            name: Optional[str], the stored position of the case
+        Returns:
+            result: dict, the median and p95 time (ms), the allocated memory
+                (KB) and the number of timed runs
+        """
+        times = []
+        for _ in range(self._repeats):
+            state = setup(name)
+            start_time = time.perf_counter()
+            function(state)
+            times.append((time.perf_counter() - start_time) * 1000)
+
+        state = setup(name)
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            function(state)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "median_ms": self._percentile(times, 50),
+            "p95_ms": self._percentile(times, 95),
+            "allocated_kb": (peak - before) / 1024.0,
+            "samples": self._repeats,
+        }
+
+    def run(self):
+        """
+        Function -- run
+            Runs every case, on every position for the cases that take one
+        Parameters:
+            None
+        Returns:
+            results: dict, the settings of the run and the result of each
+                case by "case/position" key (see _measure)
+        """
+        results = {}
+        for case, per_position, setup, function in self._create_cases():
+            for name in (self._positions if per_position else [None]):
+                key = case if name is None else case + "/" + name
+                results[key] = self._measure(setup, function, name)
+
+        return {
+            "repeats": self._repeats,
+            "hard_depth": self._hard_depth,
+            "python": sys.version.split()[0],
+            "results": results,
+        }
+
+    @staticmethod
+    def write(results, path):
+        """
+        Function -- write
+            Writes benchmark results to a JSON file
+        Parameters:
+            results: dict, the results of run
+            path: str, the file to write
+        Returns:
+            None
+        """
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def read(path):
+        """
+        Function -- read
+            Reads benchmark results from a JSON file
+        Parameters:
+            path: str, the file to read
+        Returns:
+            results: dict, the results of run
+        """
+        with open(path, "r") as f:
+            return json.load(f)
+
+    @classmethod
+    def compare(cls, baseline, current, threshold=DEFAULT_THRESHOLD):
+        """
+        Function -- compare
+            Compares new results with a baseline and flags every case whose
+            median time or allocated memory grew by more than the threshold.
+            Cases missing from either side are skipped.
+        Parameters:
+            baseline: dict, the stored results of run
+            current: dict, the new results of run
+            threshold: float, the accepted relative growth, 0.10 for 10%
+        Returns:
+            regressions: list[dict], the case, metric, baseline and current
+                values and relative change of each regression
+        """
+        regressions = []
+        for key in sorted(current["results"]):
+            if key not in baseline["results"]:
+                continue
+            for metric in cls.COMPARED_METRICS:
+                before = baseline["results"][key][metric]
+                after = current["results"][key][metric]
+                if before <= 0:
+                    continue
+                change = (after - before) / before
+                if change > threshold:
+                    regressions.append({
+                        "case": key,
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after,
+                        "change": change,
+                    })
+        return regressions
+
+
+def main(argv=None):
+    """
+    Function -- main
+        Command-line entry point. "run" times every case and writes the
+        results as JSON; "compare" flags the regressions of a results file
+        against a baseline and exits with status 1 if there are any.
+    Parameters:
+        argv: Optional[list[str]], the command-line arguments
+    Returns:
+        status: int, 0 on success, 1 if regressions were found
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Othello board and AI hot paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--output", default="benchmark.json")
+    run_parser.add_argument("--repeats", type=int, default=20)
+    run_parser.add_argument("--hard-depth", type=int, default=4)
+    run_parser.add_argument("--position", action="append",
+                            choices=sorted(Perft.STORED_POSITIONS))
+
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float,
+                                default=Benchmark.DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        benchmark = Benchmark(args.repeats, args.hard_depth, args.position)
+        results = benchmark.run()
+        Benchmark.write(results, args.output)
+        for key in sorted(results["results"]):
+            result = results["results"][key]
+            print(key + ": median " + str(round(result["median_ms"], 3)) +
+                  " ms, p95 " + str(round(result["p95_ms"], 3)) + " ms, " +
+                  str(round(result["allocated_kb"], 1)) + " KB")
+        return 0
+
+    regressions = Benchmark.compare(Benchmark.read(args.baseline),
+                                    Benchmark.read(args.current),
+                                    args.threshold)
+    for regression in regressions:
+        print("REGRESSION " + regression["case"] + " " +
+              regression["metric"] + ": " +
+              str(round(regression["baseline"], 3)) + " -> " +
+              str(round(regression["current"], 3)) + " (+" +
+              str(round(regression["change"] * 100, 1)) + "%)")
+    if not regressions:
+        print("No regressions beyond " + str(args.threshold * 100) + "%")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
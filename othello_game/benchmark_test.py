@@ -0,0 +1,78 @@
+from benchmark import Benchmark, main
+
+import pytest
+
+
+def test_constructor():
+    benchmark: Benchmark = Benchmark(repeats=3, positions=["start"])
+    assert benchmark.repeats == 3
+    assert benchmark.positions == ["start"]
+    assert Benchmark().positions == ["diagonal", "endgame", "midgame",
+                                     "parallel", "start"]
+
+
+def test_percentile():
+    times = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert Benchmark._percentile(times, 50) == 3.0
+    assert Benchmark._percentile(times, 95) == 5.0
+    assert Benchmark._percentile([7.0], 95) == 7.0
+
+
+def test_run():
+    benchmark: Benchmark = Benchmark(repeats=2, hard_depth=1,
+                                     positions=["start", "endgame"])
+    results = benchmark.run()
+    assert results["repeats"] == 2
+    assert results["hard_depth"] == 1
+    assert set(results["results"]) == {
+        "game_board_init",
+        "calculate_legal_moves/start", "calculate_legal_moves/endgame",
+        "take_turn/start", "take_turn/endgame",
+        "calculate_next_move_med/start", "calculate_next_move_med/endgame",
+        "calculate_next_move_hard/start",
+        "calculate_next_move_hard/endgame",
+        "position_copy/start", "position_copy/endgame",
+    }
+    for result in results["results"].values():
+        assert result["samples"] == 2
+        assert 0 <= result["median_ms"] <= result["p95_ms"]
+        assert result["allocated_kb"] >= 0
+    assert results["results"]["game_board_init"]["allocated_kb"] > 0
+
+
+def test_compare():
+    baseline = {"results": {
+        "take_turn/start": {"median_ms": 1.0, "allocated_kb": 10.0},
+        "position_copy/start": {"median_ms": 2.0, "allocated_kb": 0.0},
+        "removed_case": {"median_ms": 1.0, "allocated_kb": 1.0},
+    }}
+    current = {"results": {
+        "take_turn/start": {"median_ms": 1.05, "allocated_kb": 20.0},
+        "position_copy/start": {"median_ms": 3.0, "allocated_kb": 5.0},
+        "new_case": {"median_ms": 9.0, "allocated_kb": 9.0},
+    }}
+    regressions = Benchmark.compare(baseline, current, threshold=0.10)
+    assert [(regression["case"], regression["metric"])
+            for regression in regressions] == [
+        ("position_copy/start", "median_ms"),
+        ("take_turn/start", "allocated_kb"),
+    ]
+    assert regressions[0]["change"] == pytest.approx(0.5)
+    assert Benchmark.compare(baseline, current, threshold=1.5) == []
+
+
+def test_main(tmp_path, capsys):
+    baseline_path = str(tmp_path / "baseline.json")
+    current_path = str(tmp_path / "current.json")
+    assert main(["run", "--output", baseline_path, "--repeats", "1",
+                 "--hard-depth", "1", "--position", "diagonal"]) == 0
+    assert "take_turn/diagonal" in capsys.readouterr().out
+
+    results = Benchmark.read(baseline_path)
+    for result in results["results"].values():
+        result["median_ms"] *= 2
+    Benchmark.write(results, current_path)
+    assert main(["compare", baseline_path, baseline_path]) == 0
+    assert "No regressions" in capsys.readouterr().out
+    assert main(["compare", baseline_path, current_path]) == 1
+    assert "REGRESSION game_board_init median_ms" in capsys.readouterr().out
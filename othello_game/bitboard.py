@@ -0,0 +1,400 @@
+# Derives from object so that its setters also run on Python 2.7 (Jython)
+class Bitboard(object):
+    """
+    Purpose:
+    The Bitboard class stores the tiles of an Othello board as two integers,
+    one for the black tiles and one for the white tiles, where each bit
+    represents a single board square (bit index = y_index * size + x_index).
+    Legal move generation and tile flip calculations are run with
+    shift-and-mask operations on these integers so that the game rules can be
+    evaluated without walking the nested lists of BoardSquare objects.
+
+    Methods:
+    index: converts an x, y index pair into a bit index
+    coordinates: converts a bit index into an x, y index pair
+    popcount: counts the number of set bits in a bitmask
+    yield_indices: generator function that yields the bit indices of a mask
+    tiles: returns the bitmask of tiles for a given color
+    place: places a tile of the given color on a single square
+    generate_moves: returns a bitmask of all legal moves for the own/opponent
+        tile masks given
+    generate_affected_squares: returns a bitmask of the empty squares whose
+        legal move may change when the tiles on some squares change
+    generate_neighbors: returns a bitmask of all squares adjacent to a mask
+    generate_flips: returns a bitmask of all tiles flipped by a move for the
+        own/opponent tile masks given
+    calculate_move_mask: returns a bitmask of all legal moves for a color
+    calculate_flip_mask: returns a bitmask of all tiles flipped by a move
+    calculate_legal_moves: returns a list of (index, flip mask) pairs
+    make_move: places a tile and flips tiles for a given move
+
+    Attributes:
+    _size: int, the number of squares along one side of the board
+    _black: int, bitmask of all squares holding a black tile
+    _white: int, bitmask of all squares holding a white tile
+    _FULL_MASK: int, bitmask with a bit set for every square on the board
+    _DIRECTIONS: list[tuple[int, int]], the bit shift and destination mask
+        for each of the 8 directions on the board
+    """
+
+    # Shift tables depend only on the board size, so they are shared by all
+    # Bitboard instances of the same size
+    _DIRECTION_CACHE = {}
+
+    def __init__(self, size, black=0, white=0):
+        self._size = size
+        self._black = black
+        self._white = white
+        self._FULL_MASK = (1 << (size * size)) - 1
+        self._DIRECTIONS = self._generate_directions(size)
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    @property
+    def black(self):
+        """getter method for self._black"""
+        return self._black
+
+    @black.setter
+    def black(self, mask):
+        """setter method for self._black"""
+        self._black = mask
+
+    @property
+    def white(self):
+        """getter method for self._white"""
+        return self._white
+
+    @white.setter
+    def white(self, mask):
+        """setter method for self._white"""
+        self._white = mask
+
+    @property
+    def FULL_MASK(self):
+        """getter method for self._FULL_MASK"""
+        return self._FULL_MASK
+
+    @property
+    def empty(self):
+        """getter method for the bitmask of all empty squares"""
+        return self._FULL_MASK & ~(self._black | self._white)
+
+    @classmethod
+    def _generate_directions(cls, size):
+        """
+        Function -- _generate_directions
+            Creates the bit shift and destination mask for each of the 8
+            directions on a board of the given size. The destination mask
+            clears the column a shifted bit would wrap into so that tiles on
+            one edge of the board never reach the opposite edge.
+        Parameters:
+            size: int, the number of squares along one side of the board
+        Returns:
+            directions: list[tuple[int, int]], (shift, mask) pairs
+        """
+        if size in cls._DIRECTION_CACHE:
+            return cls._DIRECTION_CACHE[size]
+
+        full_mask = (1 << (size * size)) - 1
+        first_column = 0
+        last_column = 0
+        for y_index in range(size):
+            first_column |= 1 << (y_index * size)
+            last_column |= 1 << (y_index * size + size - 1)
+
+        directions = []
+        for y_dir in (-1, 0, 1):
+            for x_dir in (-1, 0, 1):
+                if x_dir == 0 and y_dir == 0:
+                    continue
+
+                mask = full_mask
+                if x_dir == 1:
+                    mask &= ~first_column
+                elif x_dir == -1:
+                    mask &= ~last_column
+
+                directions.append((y_dir * size + x_dir, mask))
+
+        cls._DIRECTION_CACHE[size] = directions
+        return directions
+
+    def index(self, x_index, y_index):
+        """
+        Function -- index
+            Converts an x, y index pair of the board into a bit index
+        Parameters:
+            x_index: int, x index of the square on the board
+            y_index: int, y index of the square on the board
+        Returns:
+            index: int, the bit index of the square
+        """
+        return y_index * self._size + x_index
+
+    def coordinates(self, index):
+        """
+        Function -- coordinates
+            Converts a bit index into an x, y index pair of the board
+        Parameters:
+            index: int, the bit index of the square
+        Returns:
+            coordinates: tuple[int, int], the x and y index of the square
+        """
+        return index % self._size, index // self._size
+
+    @staticmethod
+    def popcount(mask):
+        """
+        Function -- popcount
+            Counts the number of set bits (tiles) in a bitmask
+        Parameters:
+            mask: int, a bitmask of board squares
+        Returns:
+            count: int, the number of set bits
+        """
+        return bin(mask).count("1")
+
+    @staticmethod
+    def yield_indices(mask):
+        """
+        Function -- yield_indices
+            Generator function that yields the bit index of every set bit in
+            the mask from the lowest index to the highest
+        Parameters:
+            mask: int, a bitmask of board squares
+        Yields:
+            index: int, the bit index of a set bit
+        """
+        while mask:
+            lowest_bit = mask & -mask
+            yield lowest_bit.bit_length() - 1
+            mask ^= lowest_bit
+
+    def tiles(self, color):
+        """
+        Function -- tiles
+            Returns the bitmask of tiles of the given color
+        Parameters:
+            color: str, the tile color ("black" or "white")
+        Returns:
+            mask: int, bitmask of the tiles of the given color
+        """
+        return self._black if color == "black" else self._white
+
+    def place(self, color, x_index, y_index):
+        """
+        Function -- place
+            Places a tile of the given color on a single square, removing any
+            tile of the opposing color from that square
+        Parameters:
+            color: str, the tile color ("black" or "white")
+            x_index: int, x index of the square on the board
+            y_index: int, y index of the square on the board
+        Returns:
+            None
+        """
+        bit = 1 << self.index(x_index, y_index)
+
+        if color == "black":
+            self._black |= bit
+            self._white &= ~bit
+        else:
+            self._white |= bit
+            self._black &= ~bit
+
+    def generate_moves(self, own, opponent):
+        """
+        Function -- generate_moves
+            Calculates the bitmask of all empty squares on which a tile of the
+            own color would flip one or more opposing tiles. For each
+            direction, runs of opposing tiles adjacent to the player's tiles
+            are grown one square at a time; an empty square just past the end
+            of a run is a legal move.
+        Parameters:
+            own: int, bitmask of the current turn player's tiles
+            opponent: int, bitmask of the opposing player's tiles
+        Returns:
+            moves: int, bitmask of all legal move squares
+        """
+        empty = self._FULL_MASK & ~(own | opponent)
+        run_length = range(self._size - 3)
+        moves = 0
+
+        for shift, mask in self._DIRECTIONS:
+            opponent_mask = opponent & mask
+
+            if shift > 0:
+                run = (own << shift) & opponent_mask
+                for _ in run_length:
+                    run |= (run << shift) & opponent_mask
+                moves |= (run << shift) & mask & empty
+            else:
+                shift = -shift
+                run = (own >> shift) & opponent_mask
+                for _ in run_length:
+                    run |= (run >> shift) & opponent_mask
+                moves |= (run >> shift) & mask & empty
+
+        return moves
+
+    def generate_affected_squares(self, changed, occupied):
+        """
+        Function -- generate_affected_squares
+            Calculates the bitmask of all empty squares whose legal move may
+            have changed when the tiles on the changed squares were placed,
+            flipped or removed. A square is affected if it is the first
+            unoccupied square reached from a changed square in one of the 8
+            directions, since every square beyond it is out of its reach.
+        Parameters:
+            changed: int, bitmask of the squares whose tiles changed
+            occupied: int, bitmask of the squares holding a tile before or
+                after the change
+        Returns:
+            affected: int, bitmask of all affected unoccupied squares
+        """
+        unoccupied = self._FULL_MASK & ~occupied
+        run_length = range(self._size - 2)
+        affected = 0
+
+        for shift, mask in self._DIRECTIONS:
+            occupied_mask = occupied & mask
+
+            if shift > 0:
+                run = changed
+                for _ in run_length:
+                    run |= (run << shift) & occupied_mask
+                affected |= (run << shift) & mask & unoccupied
+            else:
+                shift = -shift
+                run = changed
+                for _ in run_length:
+                    run |= (run >> shift) & occupied_mask
+                affected |= (run >> shift) & mask & unoccupied
+
+        return affected
+
+    def generate_neighbors(self, mask):
+        """
+        Function -- generate_neighbors
+            Calculates the bitmask of all squares adjacent to a square of the
+            mask in any of the 8 directions
+        Parameters:
+            mask: int, a bitmask of board squares
+        Returns:
+            neighbors: int, bitmask of the adjacent squares, which may include
+                squares of the mask itself
+        """
+        neighbors = 0
+
+        for shift, direction_mask in self._DIRECTIONS:
+            if shift > 0:
+                neighbors |= (mask << shift) & direction_mask
+            else:
+                neighbors |= (mask >> -shift) & direction_mask
+
+        return neighbors
+
+    def generate_flips(self, own, opponent, index):
+        """
+        Function -- generate_flips
+            Calculates the bitmask of all opposing tiles that will be flipped
+            if a tile of the own color is placed on the square at index
+        Parameters:
+            own: int, bitmask of the current turn player's tiles
+            opponent: int, bitmask of the opposing player's tiles
+            index: int, the bit index of the square the tile is placed on
+        Returns:
+            flips: int, bitmask of all flippable tiles (0 if the move is not
+                legal)
+        """
+        start = 1 << index
+        flips = 0
+
+        for shift, mask in self._DIRECTIONS:
+            run = 0
+
+            if shift > 0:
+                square = (start << shift) & mask
+                while square & opponent:
+                    run |= square
+                    square = (square << shift) & mask
+            else:
+                shift = -shift
+                square = (start >> shift) & mask
+                while square & opponent:
+                    run |= square
+                    square = (square >> shift) & mask
+
+            if square & own:
+                flips |= run
+
+        return flips
+
+    def calculate_move_mask(self, color):
+        """
+        Function -- calculate_move_mask
+            Calculates the bitmask of all legal moves for the given color
+        Parameters:
+            color: str, the color of the current turn player
+        Returns:
+            moves: int, bitmask of all legal move squares
+        """
+        if color == "black":
+            return self.generate_moves(self._black, self._white)
+        return self.generate_moves(self._white, self._black)
+
+    def calculate_flip_mask(self, color, index):
+        """
+        Function -- calculate_flip_mask
+            Calculates the bitmask of all opposing tiles that will be flipped
+            if a tile of the given color is placed on the square at index
+        Parameters:
+            color: str, the color of the current turn player
+            index: int, the bit index of the square the tile is placed on
+        Returns:
+            flips: int, bitmask of all flippable tiles (0 if the move is not
+                legal)
+        """
+        if color == "black":
+            return self.generate_flips(self._black, self._white, index)
+        return self.generate_flips(self._white, self._black, index)
+
+    def calculate_legal_moves(self, color):
+        """
+        Function -- calculate_legal_moves
+            Calculates every legal move for the given color along with the
+            tiles each move flips, in row-major order of the board
+        Parameters:
+            color: str, the color of the current turn player
+        Returns:
+            legal_moves: list[tuple[int, int]], (index, flip mask) pairs
+        """
+        return [
+            (index, self.calculate_flip_mask(color, index))
+            for index in self.yield_indices(self.calculate_move_mask(color))
+        ]
+
+    def make_move(self, color, index, flips):
+        """
+        Function -- make_move
+            Places a tile of the given color on the square at index and flips
+            all tiles in the flip mask to that color
+        Parameters:
+            color: str, the color of the current turn player
+            index: int, the bit index of the square the tile is placed on
+            flips: int, bitmask of the tiles flipped by the move
+        Returns:
+            None
+        """
+        changed = flips | (1 << index)
+
+        if color == "black":
+            self._black |= changed
+            self._white &= ~changed
+        else:
+            self._white |= changed
+            self._black &= ~changed
@@ -0,0 +1,141 @@
+from bitboard import Bitboard
+from game_board import GameBoard
+from player import Player
+
+import random
+
+
+def test_constructor():
+    bb: Bitboard = Bitboard(8)
+    assert isinstance(bb, Bitboard)
+    assert bb.size == 8
+    assert bb.black == 0
+    assert bb.white == 0
+    assert bb.FULL_MASK == (1 << 64) - 1
+    assert bb.empty == bb.FULL_MASK
+
+
+def test_index_and_coordinates():
+    bb: Bitboard = Bitboard(8)
+    assert bb.index(0, 0) == 0
+    assert bb.index(7, 0) == 7
+    assert bb.index(0, 1) == 8
+    assert bb.index(7, 7) == 63
+    assert bb.coordinates(0) == (0, 0)
+    assert bb.coordinates(12) == (4, 1)
+    assert bb.coordinates(63) == (7, 7)
+
+
+def test_popcount_and_yield_indices():
+    assert Bitboard.popcount(0) == 0
+    assert Bitboard.popcount(0b1011) == 3
+    assert list(Bitboard.yield_indices(0)) == []
+    assert list(Bitboard.yield_indices(0b100101)) == [0, 2, 5]
+
+
+def test_place():
+    bb: Bitboard = Bitboard(8)
+    bb.place("black", 3, 4)
+    assert bb.black == 1 << 35
+    # Placing the opposing color on a square replaces the existing tile
+    bb.place("white", 3, 4)
+    assert bb.black == 0
+    assert bb.white == 1 << 35
+
+
+def test_calculate_move_mask():
+    gb: GameBoard = GameBoard(board_size=800)
+    bb: Bitboard = gb.bitboard
+    black_moves = [bb.index(3, 2), bb.index(2, 3),
+                   bb.index(5, 4), bb.index(4, 5)]
+    assert sorted(bb.yield_indices(bb.calculate_move_mask("black"))) == (
+        sorted(black_moves))
+
+    # Moves never wrap from one edge of the board to the other
+    bb = Bitboard(8)
+    bb.place("black", 7, 0)
+    bb.place("white", 0, 1)
+    assert bb.calculate_move_mask("black") == 0
+
+
+def test_calculate_flip_mask():
+    gb: GameBoard = GameBoard(board_size=800)
+    bb: Bitboard = gb.bitboard
+    assert bb.calculate_flip_mask("black", bb.index(3, 2)) == (
+        1 << bb.index(3, 3))
+    # Squares that do not flip any tiles return an empty mask
+    assert bb.calculate_flip_mask("black", bb.index(0, 0)) == 0
+
+
+def test_generate_affected_squares():
+    bb: Bitboard = Bitboard(8)
+    # A row of tiles from (1, 0) to (4, 0) with (0, 0) and (5, 0) empty
+    row = sum(1 << index for index in range(1, 5))
+    # A change at (3, 0) reaches the empty squares at both ends of the row
+    # and the empty squares next to it in every other direction
+    affected = bb.generate_affected_squares(1 << 3, row)
+    assert affected & ((1 << 0) | (1 << 5)) == (1 << 0) | (1 << 5)
+    assert affected & row == 0
+    assert affected == (1 << 0) | (1 << 5) | (0b11100 << 8)
+
+    # Squares past the first empty square are out of reach
+    affected = bb.generate_affected_squares(1 << 3, 1 << 3)
+    assert affected == (1 << 2) | (1 << 4) | (0b11100 << 8)
+
+
+def test_generate_neighbors():
+    bb: Bitboard = Bitboard(8)
+    # A corner has 3 neighbors and neighbors never wrap around the board
+    assert bb.generate_neighbors(1) == (1 << 1) | (1 << 8) | (1 << 9)
+    assert bb.generate_neighbors(1 << 7) == (1 << 6) | (1 << 14) | (1 << 15)
+    assert Bitboard.popcount(bb.generate_neighbors(1 << 27)) == 8
+
+
+def test_make_move():
+    gb: GameBoard = GameBoard(board_size=800)
+    bb: Bitboard = gb.bitboard
+    flips = bb.calculate_flip_mask("black", bb.index(3, 2))
+    bb.make_move("black", bb.index(3, 2), flips)
+    assert bb.popcount(bb.black) == 4
+    assert bb.popcount(bb.white) == 1
+    assert bb.tiles("black") & (1 << bb.index(3, 3))
+
+
+def test_bitboard_matches_board_square_scan():
+    # Play random games and confirm the bitboard move generator produces the
+    # same legal moves and flips as the BoardSquare grid scan
+    random.seed(7)
+    for board_size in (400, 600, 800):
+        gb: GameBoard = GameBoard(board_size=board_size)
+        players = [Player(gb, "Player", "black"),
+                   Player(gb, "Computer", "white")]
+        turn = 0
+        passes = 0
+
+        while passes < 2:
+            player = players[turn % 2]
+            grid_moves = gb._calculate_tile_flips(player.color)
+            gb.calculate_legal_moves(player.color)
+
+            assert [move.player_square for move in gb.legal_moves] == (
+                [move.player_square for move in grid_moves])
+            for bit_move, grid_move in zip(gb.legal_moves, grid_moves):
+                # The grid lists flips ray by ray, the bitboard by index
+                assert len(bit_move.flippable_squares) == len(
+                    grid_move.flippable_squares)
+                assert set(bit_move.flippable_squares) == set(
+                    grid_move.flippable_squares)
+
+            if gb.legal_moves:
+                move = random.choice(gb.legal_moves)
+                player._place_tile(move)
+                player._flip_tiles(move.flippable_squares)
+                passes = 0
+            else:
+                passes += 1
+
+            gb.legal_moves = []
+            turn += 1
+
+        assert gb.bitboard.popcount(gb.bitboard.black) == gb.black_tiles
+        assert gb.bitboard.popcount(gb.bitboard.white) == gb.white_tiles
@@ -0,0 +1,391 @@
+from bitboard import Bitboard
+from search_engine import SearchResult, SearchTimeout, run_steps
+
+import time
+
+
+class EndgameSolver:
+    """
+    Purpose:
+    The EndgameSolver class plays the end of the game perfectly. Once few
+    enough squares are empty, it searches every remaining move to the end of
+    the game instead of scoring positions with the hard AI's static
+    evaluation. It can either find the exact final tile difference or, much
+    faster, only whether the position is a win, loss or draw. Moves that
+    leave the opponent the fewest replies are searched first (fastest-first),
+    and for the last few empty squares, moves in regions of the board with an
+    odd number of empty squares are searched first (parity ordering).
+
+    Like the SearchEngine, the solver is a generator (solve_steps) that can
+    run in slices: positions with more than slice_empties empty squares
+    yield after searching each child, and smaller subtrees are solved in
+    one go by the plain recursive _solve, sharing the work done at each
+    position before its children are searched (_expand). solve only pauses
+    between root moves.
+
+    Methods:
+    _generate_region_masks: creates the bitmasks of the 4 board quadrants
+    solve: returns the best move and its final score for a given position
+    solve_steps: the solve as a generator that can be paused between slices
+        of work
+    _solve_steps: scores a position with many empty squares, pausing
+        between its children
+    _solve: recursively scores a position by searching to the end of the game
+    _expand: counts a position and scores it if the game is over, or orders
+        its moves
+    _order_moves: orders the legal moves of a position for the search
+    _out_of_time: checks whether the running solve must stop
+
+    Attributes:
+    _size: int, the number of squares along one side of the board
+    _bitboard: Bitboard, move generator for boards of the given size
+    _nodes: int, the number of positions visited during the last solve
+    _deadline: Optional[float], the time (s) at which the running solve must
+        stop, if it has a time budget
+    _slice_empties: Optional[int], the empty squares at or below which the
+        running solve stops pausing, or None to pause only at the root
+    _stop_event: Optional[Event], stops the running solve once set, such as
+        when another process cancels it
+    _REGION_MASKS: list[int], bitmasks of the 4 quadrants of the board
+    """
+
+    WIN_LOSS_DRAW = "wld"
+    EXACT = "exact"
+
+    FASTEST_FIRST_EMPTIES = 7  # empties above which moves go fastest-first
+    TIME_CHECK_INTERVAL = 1024  # nodes visited between clock reads
+    SLICE_EMPTIES = 4  # empties at or below which a subtree is solved at once
+
+    def __init__(self, size):
+        self._size = size
+        self._bitboard = Bitboard(size)
+        self._nodes = 0
+        self._deadline = None
+        self._slice_empties = None
+        self._stop_event = None
+        self._generate_region_masks()
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    @property
+    def nodes(self):
+        """getter method for self._nodes"""
+        return self._nodes
+
+    @property
+    def stop_event(self):
+        """getter method for self._stop_event"""
+        return self._stop_event
+
+    @stop_event.setter
+    def stop_event(self, stop_event):
+        """setter method for self._stop_event"""
+        self._stop_event = stop_event
+
+    def _generate_region_masks(self):
+        """
+        Function -- _generate_region_masks
+            Creates the bitmasks of the 4 quadrants of the board used for
+            parity ordering
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        half = (self._size + 1) // 2
+        self._REGION_MASKS = []
+
+        for y_start, y_end in ((0, half), (half, self._size)):
+            for x_start, x_end in ((0, half), (half, self._size)):
+                region_mask = 0
+                for y_index in range(y_start, y_end):
+                    for x_index in range(x_start, x_end):
+                        region_mask |= 1 << self._bitboard.index(x_index,
+                                                                 y_index)
+                self._REGION_MASKS.append(region_mask)
+
+    def solve(self, bitboard, color, mode=EXACT, time_budget_ms=None):
+        """
+        Function -- solve
+            Searches the position on the given bitboard to the end of the
+            game for the player of the given color. In EXACT mode the score
+            is the final tile difference with perfect play from both players;
+            in WIN_LOSS_DRAW mode it is only 1, 0 or -1. Raises SearchTimeout
+            if the time budget runs out or the stop event is set before the
+            position is solved.
+        Parameters:
+            bitboard: Bitboard, the tiles of the position to solve
+            color: str, the color of the player to move
+            mode: str, EXACT or WIN_LOSS_DRAW
+            time_budget_ms: Optional[int], the wall-clock time (ms) the solve
+                may use
+        Returns:
+            best_move: tuple[Optional[int], int], the bit index of the best
+                move (None if the player has no legal move) and its score from
+                the player's point of view
+        """
+        return run_steps(self.solve_steps(bitboard, color, mode,
+                                          time_budget_ms, slice_empties=None))
+
+    def solve_steps(self, bitboard, color, mode=EXACT, time_budget_ms=None,
+                    slice_empties=SLICE_EMPTIES):
+        """
+        Function -- solve_steps
+            Runs the solve (see solve) as a generator. Each step solves at
+            most one subtree of slice_empties empty squares, then yields, so
+            the caller can pause the solve between steps and resume it later.
+            A time budget is measured in wall-clock time, including any
+            pauses.
+        Parameters:
+            bitboard: Bitboard, the tiles of the position to solve
+            color: str, the color of the player to move
+            mode: str, EXACT or WIN_LOSS_DRAW
+            time_budget_ms: Optional[int], the wall-clock time (ms) the solve
+                may use
+            slice_empties: Optional[int], the empty squares at or below
+                which a subtree is solved in one step, or None to yield only
+                between root moves
+        Returns:
+            steps: generator, yields the number of nodes visited so far after
+                each step, then a SearchResult of the best move and its score
+                (see solve)
+        """
+        own = bitboard.tiles(color)
+        opponent = bitboard.black if color == "white" else bitboard.white
+
+        self._nodes = 1
+        self._slice_empties = slice_empties
+        self._deadline = (time.time() + time_budget_ms / 1000.0
+                          if time_budget_ms is not None else None)
+
+        if mode == self.WIN_LOSS_DRAW:
+            alpha, beta = -1, 1
+        else:
+            alpha, beta = -self._size * self._size, self._size * self._size
+
+        moves = self._bitboard.generate_moves(own, opponent)
+        best_index = None
+        best_score = -self._size * self._size - 1
+        try:
+            if not moves:
+                for step in self._solve_steps(opponent, own, -beta, -alpha,
+                                              False):
+                    if isinstance(step, SearchResult):
+                        best_score = max(min(-step.value, beta), alpha)
+                    else:
+                        yield step
+            else:
+                for index, flips in self._order_moves(own, opponent, moves):
+                    for step in self._solve_steps(opponent & ~flips,
+                                                  own | flips | (1 << index),
+                                                  -beta,
+                                                  -max(alpha, best_score),
+                                                  False):
+                        if isinstance(step, SearchResult):
+                            score = -step.value
+                        else:
+                            yield step
+                    yield self._nodes
+                    if score > best_score:
+                        best_index, best_score = index, score
+                        if best_score >= beta:
+                            break
+        finally:
+            self._deadline = None
+
+        if mode == self.WIN_LOSS_DRAW:
+            best_score = max(min(best_score, 1), -1)
+
+        yield SearchResult((best_index, best_score))
+
+    def _solve_steps(self, own, opponent, alpha, beta, passed):
+        """
+        Function -- _solve_steps
+            Scores a position exactly as _solve does, but as a generator that
+            yields the number of nodes visited after solving each child. A
+            position with slice_empties empty squares or fewer, or any
+            position below the root when the solve has no slice size, is
+            handed to _solve, so no step solves more than one such subtree.
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+            alpha: int, the score the player to move is already guaranteed
+            beta: int, the score the opposing player is already guaranteed
+            passed: bool, True if the opposing player just passed their turn
+        Returns:
+            steps: generator, yields the number of nodes visited so far, then
+                a SearchResult of the final tile difference for the player to
+                move
+        """
+        empty = self._bitboard.FULL_MASK & ~(own | opponent)
+        if (self._slice_empties is None or
+                Bitboard.popcount(empty) <= self._slice_empties):
+            yield SearchResult(self._solve(own, opponent, alpha, beta,
+                                           passed))
+            return
+
+        score, ordered_moves = self._expand(own, opponent, passed)
+        if score is not None:
+            yield SearchResult(score)
+            return
+
+        if not ordered_moves:
+            for step in self._solve_steps(opponent, own, -beta, -alpha,
+                                          True):
+                if isinstance(step, SearchResult):
+                    score = -step.value
+                else:
+                    yield step
+            yield SearchResult(score)
+            return
+
+        best_score = -self._size * self._size - 1
+        for index, flips in ordered_moves:
+            for step in self._solve_steps(opponent & ~flips,
+                                          own | flips | (1 << index),
+                                          -beta,
+                                          -alpha,
+                                          False):
+                if isinstance(step, SearchResult):
+                    score = -step.value
+                else:
+                    yield step
+            yield self._nodes
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        yield SearchResult(best_score)
+
+    def _solve(self, own, opponent, alpha, beta, passed):
+        """
+        Function -- _solve
+            Scores the position for the player to move by searching every
+            move to the end of the game with alpha-beta pruning. The score is
+            the final tile difference from the player's point of view.
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+            alpha: int, the score the player to move is already guaranteed
+            beta: int, the score the opposing player is already guaranteed
+            passed: bool, True if the opposing player just passed their turn
+        Returns:
+            score: int, the final tile difference for the player to move
+        """
+        score, ordered_moves = self._expand(own, opponent, passed)
+        if score is not None:
+            return score
+
+        if not ordered_moves:
+            return -self._solve(opponent, own, -beta, -alpha, True)
+
+        best_score = -self._size * self._size - 1
+        for index, flips in ordered_moves:
+            score = -self._solve(opponent & ~flips,
+                                 own | flips | (1 << index),
+                                 -beta,
+                                 -alpha,
+                                 False)
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        return best_score
+
+    def _expand(self, own, opponent, passed):
+        """
+        Function -- _expand
+            Does the work of a position that comes before solving its
+            children, for both _solve and _solve_steps: counts the node,
+            scores the position if neither player can move and orders its
+            legal moves. Raises SearchTimeout once the solve's deadline has
+            passed or its stop event is set.
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+            passed: bool, True if the opposing player just passed their turn
+        Returns:
+            node: tuple[Optional[int], Optional[list[tuple[int, int]]]], the
+                final tile difference if the game is over, else None and the
+                (index, flip mask) pairs of the legal moves in search order,
+                an empty list if the player to move must pass
+        """
+        self._nodes += 1
+        if (not self._nodes % self.TIME_CHECK_INTERVAL and
+                self._out_of_time()):
+            raise SearchTimeout()
+
+        moves = self._bitboard.generate_moves(own, opponent)
+        if not moves:
+            if passed:
+                return (Bitboard.popcount(own) -
+                        Bitboard.popcount(opponent)), None
+            return None, []
+        return None, self._order_moves(own, opponent, moves)
+
+    def _order_moves(self, own, opponent, moves):
+        """
+        Function -- _order_moves
+            Orders the legal moves of a position for the search. With many
+            empty squares left, moves are sorted by the number of replies
+            they leave the opponent (fastest-first). With few empty squares
+            left, moves in quadrants with an odd number of empty squares are
+            searched first, since the last move in a region is usually an
+            advantage.
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+            moves: int, bitmask of the player's legal moves
+        Returns:
+            ordered_moves: list[tuple[int, int]], (index, flip mask) pairs in
+                search order
+        """
+        generate_flips = self._bitboard.generate_flips
+        empty = self._bitboard.FULL_MASK & ~(own | opponent)
+        ordered_moves = []
+
+        if Bitboard.popcount(empty) > self.FASTEST_FIRST_EMPTIES:
+            generate_moves = self._bitboard.generate_moves
+            for index in Bitboard.yield_indices(moves):
+                flips = generate_flips(own, opponent, index)
+                replies = Bitboard.popcount(generate_moves(
+                    opponent & ~flips, own | flips | (1 << index)))
+                ordered_moves.append((replies, index, flips))
+            ordered_moves.sort()
+            return [(index, flips) for _, index, flips in ordered_moves]
+
+        odd_moves = 0
+        for region_mask in self._REGION_MASKS:
+            if Bitboard.popcount(empty & region_mask) & 1:
+                odd_moves |= moves & region_mask
+
+        for move_mask in (odd_moves, moves & ~odd_moves):
+            for index in Bitboard.yield_indices(move_mask):
+                ordered_moves.append(
+                    (index, generate_flips(own, opponent, index)))
+
+        return ordered_moves
+
+    def _out_of_time(self):
+        """
+        Function -- _out_of_time
+            Checks whether the running solve must stop: its deadline has
+            passed or its stop event is set
+        Parameters:
+            None
+        Returns:
+            out_of_time: bool, True if the solve must stop
+        """
+        return ((self._deadline is not None and
+                 time.time() > self._deadline) or
+                (self._stop_event is not None and
+                 self._stop_event.is_set()))
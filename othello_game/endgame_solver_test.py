@@ -0,0 +1,140 @@
+from bitboard import Bitboard
+from endgame_solver import EndgameSolver
+from game_board import GameBoard
+from search_engine import SearchResult, SearchTimeout
+
+import pytest
+import random
+import threading
+
+
+def perfect_play(bb, own, opponent, passed=False):
+    # Reference solver without pruning or move ordering
+    moves = bb.generate_moves(own, opponent)
+    if not moves:
+        if passed:
+            return Bitboard.popcount(own) - Bitboard.popcount(opponent)
+        return -perfect_play(bb, opponent, own, True)
+    best = None
+    for index in Bitboard.yield_indices(moves):
+        flips = bb.generate_flips(own, opponent, index)
+        score = -perfect_play(bb, opponent & ~flips,
+                              own | flips | (1 << index))
+        if best is None or score > best:
+            best = score
+    return best
+
+
+def endgame_position(seed, empty_squares, board_size=800):
+    random.seed(seed)
+    bb: Bitboard = GameBoard(board_size=board_size).bitboard
+    color = "black"
+    while Bitboard.popcount(bb.empty) > empty_squares:
+        moves = bb.calculate_legal_moves(color)
+        if moves:
+            index, flips = random.choice(moves)
+            bb.make_move(color, index, flips)
+        elif not bb.calculate_legal_moves(
+                "white" if color == "black" else "black"):
+            break
+        color = "white" if color == "black" else "black"
+    return bb, color
+
+
+def test_constructor():
+    es: EndgameSolver = EndgameSolver(8)
+    assert isinstance(es, EndgameSolver)
+    assert es.size == 8
+    assert es.nodes == 0
+    # The 4 quadrants cover every square exactly once
+    assert sum(Bitboard.popcount(mask) for mask in es._REGION_MASKS) == 64
+    union = 0
+    for mask in es._REGION_MASKS:
+        union |= mask
+    assert union == (1 << 64) - 1
+
+
+def test_solve_exact():
+    es: EndgameSolver = EndgameSolver(8)
+    for seed in range(4):
+        bb, color = endgame_position(seed, 7)
+        own = bb.tiles(color)
+        opponent = bb.white if color == "black" else bb.black
+        index, score = es.solve(bb, color, EndgameSolver.EXACT)
+        assert score == perfect_play(bb, own, opponent)
+        if index is not None:
+            # The solved move achieves the solved score
+            flips = bb.generate_flips(own, opponent, index)
+            assert -perfect_play(bb, opponent & ~flips,
+                                 own | flips | (1 << index)) == score
+
+
+def test_solve_win_loss_draw():
+    es: EndgameSolver = EndgameSolver(8)
+    for seed in range(4):
+        bb, color = endgame_position(seed, 9)
+        index, exact_score = es.solve(bb, color, EndgameSolver.EXACT)
+        index, wld_score = es.solve(bb, color, EndgameSolver.WIN_LOSS_DRAW)
+        assert wld_score == (exact_score > 0) - (exact_score < 0)
+
+
+def test_solve_small_board():
+    # The whole game on a 4x4 board can be solved from the start
+    gb: GameBoard = GameBoard(board_size=400)
+    es: EndgameSolver = EndgameSolver(4)
+    index, score = es.solve(gb.bitboard, "black", EndgameSolver.EXACT)
+    assert score == perfect_play(gb.bitboard, gb.bitboard.black,
+                                 gb.bitboard.white)
+
+
+def test_solve_time_budget():
+    es: EndgameSolver = EndgameSolver(8)
+    bb, color = endgame_position(1, 24)
+    with pytest.raises(SearchTimeout):
+        es.solve(bb, color, EndgameSolver.EXACT, time_budget_ms=1)
+
+
+def test__order_moves():
+    es: EndgameSolver = EndgameSolver(8)
+    bb, color = endgame_position(2, 5)
+    own = bb.tiles(color)
+    opponent = bb.white if color == "black" else bb.black
+    moves = bb.generate_moves(own, opponent)
+    ordered_moves = es._order_moves(own, opponent, moves)
+    assert sorted(index for index, flips in ordered_moves) == (
+        list(Bitboard.yield_indices(moves)))
+
+    # Moves in quadrants with an odd number of empty squares come first
+    odd = [any(Bitboard.popcount(bb.empty & mask) & 1 and (mask >> index) & 1
+               for mask in es._REGION_MASKS)
+           for index, flips in ordered_moves]
+    assert odd == sorted(odd, reverse=True)
+
+
+def test_solve_steps():
+    es: EndgameSolver = EndgameSolver(8)
+    bb, color = endgame_position(5, 11)
+    steps = es.solve_steps(bb, color, EndgameSolver.EXACT)
+    counts = []
+    for step in steps:
+        if isinstance(step, SearchResult):
+            index, score = step.value
+        else:
+            counts.append(step)
+    assert len(counts) > 1
+    assert counts == sorted(counts)
+
+    # Solving in steps gives the same result as solving in one go
+    assert EndgameSolver(8).solve(bb, color, EndgameSolver.EXACT) == (
+        index, score)
+
+
+def test_stop_event():
+    es: EndgameSolver = EndgameSolver(8)
+    stop_event = threading.Event()
+    es.stop_event = stop_event
+    assert es.stop_event is stop_event
+    stop_event.set()
+    bb, color = endgame_position(6, 14)
+    with pytest.raises(SearchTimeout):
+        es.solve(bb, color, EndgameSolver.EXACT)
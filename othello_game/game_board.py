@@ -1,27 +1,51 @@
+from bitboard import Bitboard
 from board_corner import BoardCorner
 from board_square import BoardSquare
 from legal_move import LegalMove
+from move import Move
+from position import Position
 from tile import Tile
 
 
-class GameBoard:
+# Derives from object so that its setters also run on Python 2.7 (Jython)
+class GameBoard(object):
     """
     Purpose:
     The GameBoard class creates the game board, monitors its state, and serves
     as an interface by which players and the game controller can interact with
-    it
+    it. The state of the game and its rules live in a rendering-free
+    Position; the GameBoard projects that position onto the BoardSquares and
+    Tiles drawn on the screen.
 
     Methods:
     _generate_game_board: creates the nested lists of BoardSquares on the board
-    _set_starting_tiles: places the black and white starting tiles on the board
+    _set_starting_tiles: places a Tile on the board for every starting tile of
+        the position
     _generate_board_corners: creates four BoardCorner instances that represent
         each corner of the board and the 3 tiles that surround it.
     _generate_board_diagonals: create a list of all BoardSquare instances that
         are diagonal to the game board's 4 corners
+    _generate_rays: creates the rays of squares leaving each square of a board
+        in the 8 directions
+    update_frontier: adds the empty neighbors of a newly placed tile to the
+        frontier
+    potential_mobility: counts the frontier squares next to a player's
+        opponent
     calculate_legal_moves: interface by which objects can identify legal moves
+    _update_legal_moves: updates a color's grid-scan legal moves for the
+        squares whose legality may have changed since they were last
+        calculated
+    _calculate_bitboard_moves: creates a list of all moves that flip opposing
+        tiles using the bitboard move generator
     _calculate_tile_flips: creates a list of all moves that flip opposing tiles
-    _get_flippable_squares: gets list of all flippable squares with tiles
+    _get_flippable_squares: gets list of all squares whose tiles a move flips
     _format_legal_move: formats each legal move and creates LegalMove instance
+    apply_move: places a legal move's tile, flips its tiles and records the
+        change on the undo stack
+    pass_turn: gives the turn to the other player and records the pass on
+        the undo stack
+    undo_move: reverts the most recent move or pass on the undo stack
+    project_square: returns the screen coordinates of a square's center
     yield_board_squares: generator function that yields all board squares
     display: displays all board squares that comprise the game board
     display_on_turn: displays all game board components relevant to player turn
@@ -29,6 +53,10 @@ class GameBoard:
     Attributes:
     board: list[list[BoardSquare]], a list representation of the Othello board
         BoardSquare objects
+    _SQUARES: list[BoardSquare], the board squares in row-major order, so
+        that the square at (x, y) has index y * (MAX_INDEX + 1) + x
+    _RAYS: list[tuple[tuple[int, ...], ...]], for each square index, the rays
+        of square indices leaving the square in the 8 directions
     _board_size: int, the size of the width/height of the game board (px)
     _board_start_x: int, the top-left, x pixel coordinate of the board
         relative to the game screen
@@ -43,6 +71,22 @@ class GameBoard:
     _white_tiles: int, the number of white tiles on the board
     _black_tiles: int, the number of black tiles on the board
     _legal_moves: list[LegalMove], list of legal move objects for reference
+    _use_bitboard: bool, specifies whether legal moves are generated from the
+        bitboard rather than by scanning the BoardSquare grid
+    _position: Position, the rendering-free state of the game: the tiles as
+        a Bitboard, the side to move, the position hash and the frontier
+    _incremental_moves: bool, specifies whether the grid scan updates legal
+        moves only for squares affected by tiles that changed since the last
+        call rather than scanning every square; the bitboard always
+        generates every move, which is no slower
+    _verify_moves: bool, debug mode in which every incremental update is
+        checked against a full scan
+    _move_cache: dict[str, tuple[int, int, dict[int, LegalMove]]], for each
+        color, the black and white bitmasks its grid-scan legal moves were
+        last calculated for and those legal moves by square index
+    _undo_stack: list[tuple], one record per applied move holding the placed
+        square, the flipped squares, their previous color and the tile
+        counters from before the move; the position keeps its own record
     """
 
     NUM_STARTING_TILES = 2
@@ -51,14 +95,28 @@ class GameBoard:
     SPACING = 100
     SCOREBOARD_DISPLACEMENT = 100
     STD_BOARD_SIZE = 800
-
-    def __init__(self, board_size=800):
+    DIRECTIONS = ((-1, -1), (0, -1), (1, -1),
+                  (-1, 0), (1, 0),
+                  (-1, 1), (0, 1), (1, 1))
+
+    # Rays depend only on the number of squares per side, so they are shared
+    # by all GameBoard instances of the same size
+    _RAY_CACHE = {}
+
+    def __init__(self,
+                 board_size=800,
+                 use_bitboard=True,
+                 incremental_moves=True,
+                 verify_moves=False):
         self._board_size = board_size
         self._board_start_x = 0
         self._board_start_y = (self.SCOREBOARD_DISPLACEMENT
                                if board_size == self.STD_BOARD_SIZE else 0)
         self._MAX_INDEX = int((self.board_size / self.SPACING) - 1)
+        self._position = Position(self.MAX_INDEX + 1)
         self._generate_game_board()
+        self._SQUARES = [square for row in self.board for square in row]
+        self._RAYS = self._generate_rays(self.MAX_INDEX + 1)
         self._set_starting_tiles()
         self._BOARD_CORNERS = self._generate_board_corners()
         self._empty_tiles = ((board_size / self.SPACING) ** 2) - (
@@ -68,6 +126,11 @@ class GameBoard:
         self._white_tiles = self.NUM_STARTING_TILES
         self._black_tiles = self.NUM_STARTING_TILES
         self._legal_moves = []
+        self._use_bitboard = use_bitboard
+        self._incremental_moves = incremental_moves
+        self._verify_moves = verify_moves
+        self._move_cache = {}
+        self._undo_stack = []
 
     @property
     def board_size(self):
@@ -143,6 +206,76 @@ class GameBoard:
                 move.player_square.tile_hint = None
         self._legal_moves = legal_moves
 
+    @property
+    def use_bitboard(self):
+        """getter method for self._use_bitboard"""
+        return self._use_bitboard
+
+    @property
+    def squares(self):
+        """getter method for self._SQUARES"""
+        return self._SQUARES
+
+    @property
+    def position(self):
+        """getter method for self._position"""
+        return self._position
+
+    @property
+    def bitboard(self):
+        """getter method for the position's bitboard"""
+        return self._position.bitboard
+
+    @property
+    def frontier(self):
+        """getter method for the position's frontier"""
+        return self._position.frontier
+
+    @property
+    def incremental_moves(self):
+        """getter method for self._incremental_moves"""
+        return self._incremental_moves
+
+    @property
+    def verify_moves(self):
+        """getter method for self._verify_moves"""
+        return self._verify_moves
+
+    @verify_moves.setter
+    def verify_moves(self, verify_moves):
+        """setter method for self._verify_moves"""
+        self._verify_moves = verify_moves
+
+    @property
+    def undo_stack(self):
+        """getter method for self._undo_stack"""
+        return self._undo_stack
+
+    @property
+    def zobrist(self):
+        """getter method for the position's zobrist"""
+        return self._position.zobrist
+
+    @property
+    def side_to_move(self):
+        """getter method for the position's side_to_move"""
+        return self._position.side_to_move
+
+    @side_to_move.setter
+    def side_to_move(self, color):
+        """setter method for the position's side_to_move"""
+        self._position.side_to_move = color
+
+    @property
+    def position_hash(self):
+        """getter method for the position's position_hash"""
+        return self._position.position_hash
+
+    @position_hash.setter
+    def position_hash(self, position_hash):
+        """setter method for the position's position_hash"""
+        self._position.position_hash = position_hash
+
     def _get_board_start(self):
         if self.board_size == self.STD_BOARD_SIZE:
             return 0, self.SCOREBOARD_DISPLACEMENT
@@ -184,58 +317,23 @@ class GameBoard:
 
     def _set_starting_tiles(self):
         """
-        Function -- _generate_game_board
-            Creates the game board by producing nested lists of BoardSquare
-            objects with a length of (self.board_size / 100). For a board size
-            of 800 pixels, this will result in a width and a height of 8 board
-            squares.
+        Function -- _set_starting_tiles
+            Projects the starting tiles of the position onto the board by
+            placing a Tile of the matching color on each of their board
+            squares
         Parameters:
             None
         Returns:
             None
         """
-        # Prevent start tiles on boards with zero of odd number of squares
-        if self.board_size % 2 == 0 and self.board_size != 0:
-
-            # For 800px, MIDDLE_OF_BOARD = 4
-            MIDDLE_OF_BOARD = int((len(self.board) / 2))
-
-            top_row = MIDDLE_OF_BOARD - 1
-            bottom_row = MIDDLE_OF_BOARD
-            left_col = MIDDLE_OF_BOARD - 1
-            right_col = MIDDLE_OF_BOARD
-
-            # top left starting tile
-            square = self.board[top_row][left_col]
-            square.tile = Tile(
-                square.x + self.PIXEL_DISPLACEMENT,
-                square.y + self.PIXEL_DISPLACEMENT,
-                "white",
-            )
-
-            # top right starting tile
-            square = self.board[top_row][right_col]
-            square.tile = Tile(
-                square.x + self.PIXEL_DISPLACEMENT,
-                square.y + self.PIXEL_DISPLACEMENT,
-                "black",
-            )
-
-            # bottom left starting tile
-            square = self.board[bottom_row][left_col]
-            square.tile = Tile(
-                square.x + self.PIXEL_DISPLACEMENT,
-                square.y + self.PIXEL_DISPLACEMENT,
-                "black",
-            )
-
-            # bottom right starting tile
-            square = self.board[bottom_row][right_col]
-            square.tile = Tile(
-                square.x + self.PIXEL_DISPLACEMENT,
-                square.y + self.PIXEL_DISPLACEMENT,
-                "white",
-            )
+        for color in ("black", "white"):
+            for index in Bitboard.yield_indices(self._position.tiles(color)):
+                square = self._SQUARES[index]
+                square.tile = Tile(
+                    square.x + self.PIXEL_DISPLACEMENT,
+                    square.y + self.PIXEL_DISPLACEMENT,
+                    color,
+                )
 
     def _generate_board_corners(self):
         """
@@ -306,168 +404,387 @@ class GameBoard:
 
         return board_diagonals
 
-    def calculate_legal_moves(self, player):
+    @classmethod
+    def _generate_rays(cls, size):
+        """
+        Function -- _generate_rays
+            Creates, for each square of a board with the given number of
+            squares per side, the rays of square indices leaving the square
+            in the 8 DIRECTIONS, nearest square first. Rays shorter than 2
+            squares are left out since a move can never flip tiles along
+            them. Rays are computed once per board size.
+        Parameters:
+            size: int, the number of squares along one side of the board
+        Returns:
+            rays: list[tuple[tuple[int, ...], ...]], the rays of each square
+                index
+        """
+        if size in cls._RAY_CACHE:
+            return cls._RAY_CACHE[size]
+
+        rays = []
+        for y_index in range(size):
+            for x_index in range(size):
+                square_rays = []
+                for x_dir, y_dir in cls.DIRECTIONS:
+                    ray = []
+                    x_ray, y_ray = x_index + x_dir, y_index + y_dir
+                    while 0 <= x_ray < size and 0 <= y_ray < size:
+                        ray.append(y_ray * size + x_ray)
+                        x_ray += x_dir
+                        y_ray += y_dir
+                    if len(ray) >= 2:
+                        square_rays.append(tuple(ray))
+                rays.append(tuple(square_rays))
+
+        cls._RAY_CACHE[size] = rays
+        return rays
+
+    def update_frontier(self, square_index):
+        """
+        Function -- update_frontier
+            Updates the frontier after a tile is placed on a square: the
+            square leaves the frontier and its empty neighbors join it
+        Parameters:
+            square_index: int, the bit index of the square the tile was
+                placed on
+        Returns:
+            None
+        """
+        self._position.update_frontier(square_index)
+
+    def potential_mobility(self, color):
+        """
+        Function -- potential_mobility
+            Counts the frontier squares adjacent to at least one tile of the
+            player's opponent. These are the squares the player may be able
+            to move to later in the game, which evaluation functions can use
+            alongside the number of legal moves.
+        Parameters:
+            color: str, the color of the player
+        Returns:
+            potential_mobility: int, the number of such frontier squares
+        """
+        return self._position.potential_mobility(color)
+
+    def calculate_legal_moves(self, color):
         """
         Function -- calculate_legal_moves
             Serves as the interface by which the game controller and players
             can access a list of all legal moves for a given turn to prevent
             an illegal move from occuring and to assist in computer AI
-            implementations
+            implementations. The bitboard generates every move at once. The
+            grid scan, with incremental_moves, keeps the player's legal moves
+            from the previous call and only recalculates the squares affected
+            by tiles placed, flipped or removed since then; with
+            verify_moves, the result is also checked against a full scan and
+            a RuntimeError is raised if they differ. The
+            position is only inspected: the side to move changes with moves
+            and passes, not here.
         Parameters:
-            player: Player, a player object for calculations needing tile color
+            color: str, the color of the player whose legal moves are
+                calculated
         Returns:
             None
         """
-        self.legal_moves = self._calculate_tile_flips(player)
+        if self.use_bitboard:
+            # A full bitboard generation costs no more than an incremental
+            # update, so only the grid scan is updated incrementally
+            self.legal_moves = self._calculate_bitboard_moves(color)
+            return
+
+        if not self.incremental_moves:
+            self.legal_moves = self._calculate_tile_flips(color)
+            return
+
+        self.legal_moves = self._update_legal_moves(color)
+
+        if self.verify_moves:
+            full_moves = self._calculate_tile_flips(color)
+            if ([legal_move.move for legal_move in self.legal_moves] !=
+                    [legal_move.move for legal_move in full_moves]):
+                raise RuntimeError(
+                    "Incremental legal moves for " + color +
+                    " do not match a full recalculation")
+
+    def _update_legal_moves(self, color):
+        """
+        Function -- _update_legal_moves
+            Updates the cached grid-scan legal moves of a color. Every square
+            whose
+            tile changed since the moves were last calculated, and every
+            empty square that can reach one along a line of tiles, is
+            recalculated; all other moves are reused as they are, since
+            nothing that decides their flips has changed. The first call for
+            a color calculates every empty square.
+        Parameters:
+            color: str, the color of the player to move
+        Returns:
+            legal_moves: list[LegalMove], all legal moves for the color in
+                board order
+        """
+        black = self.bitboard.black
+        white = self.bitboard.white
+        cached = self._move_cache.get(color)
+
+        if cached is None:
+            moves = {}
+            dirty = self.bitboard.empty
+        else:
+            cached_black, cached_white, moves = cached
+            changed = (cached_black ^ black) | (cached_white ^ white)
+            dirty = changed
+            if changed:
+                dirty |= self.bitboard.generate_affected_squares(
+                    changed, cached_black | cached_white | black | white)
 
-    def _calculate_tile_flips(self, player):
+        for index in [index for index in moves if (dirty >> index) & 1]:
+            del moves[index]
+
+        squares = self._SQUARES
+        legal_moves = []
+        for index in Bitboard.yield_indices(dirty & self._position.frontier):
+            flippable_squares = self._get_flippable_squares(color,
+                                                            squares[index])
+            if flippable_squares:
+                self._format_legal_move(squares[index],
+                                        flippable_squares,
+                                        legal_moves,
+                                        color=color)
+                moves[index] = legal_moves[-1]
+
+        self._move_cache[color] = (black, white, moves)
+        return [moves[index] for index in sorted(moves)]
+
+    def _calculate_bitboard_moves(self, color):
+        """
+        Function -- _calculate_bitboard_moves
+            Runs the bitboard move generator for the player's color and
+            wraps each (index, flip mask) pair in a LegalMove view of the
+            game board
+        Parameters:
+            color: str, the color of the player
+        Returns:
+            legal_moves: list[LegalMove], all legal moves for the player
+        """
+        return [LegalMove(self, Move(index, flip_mask, color))
+                for index, flip_mask in self.bitboard.calculate_legal_moves(
+                    color)]
+
+    def _calculate_tile_flips(self, color):
         """
         Function -- _calculate_tile_flips
             Runs the logic for determining all board squares that will yield
-            one or more tile flips for the current player
+            one or more tile flips for the current player. Only squares on the
+            frontier are checked, since a square with no adjacent tile can
+            never flip one.
         Parameters:
-            player: Player, a player object for calculations needing tile color
+            color: str, the color of the player
         Returns:
-            None
+            legal_moves: list[LegalMove], all legal moves for the player
         """
-        NEG_DIR_INDEX = -1
-        POS_DIR_INDEX = 2
-
         legal_moves = []
-        for player_square in self.yield_board_squares():
+        for square_index in Bitboard.yield_indices(self._position.frontier):
+            player_square = self._SQUARES[square_index]
 
             if player_square.is_empty:
-                flippable_squares = set()
-
-                for y_dir in range(NEG_DIR_INDEX, POS_DIR_INDEX):
-                    for x_dir in range(NEG_DIR_INDEX, POS_DIR_INDEX):
-                        flip_squares = self._get_flippable_squares(
-                            player.color, player_square, x_dir, y_dir, set()
-                        )
-
-                        flippable_squares.update(flip_squares)
+                flippable_squares = self._get_flippable_squares(
+                    color, player_square)
 
                 if flippable_squares:
 
                     self._format_legal_move(
-                        player_square, flippable_squares, legal_moves
+                        player_square,
+                        flippable_squares,
+                        legal_moves,
+                        color=color,
                     )
 
         return legal_moves
 
-    def _get_flippable_squares(
-        self, player_color, start_square, x_dir, y_dir, flip_squares
-    ):
+    def _get_flippable_squares(self, player_color, start_square):
         """
         Function -- _get_flippable_squares
-            Uses recursion to identify all flippable tiles emanating from
-            the given start square. Function recursively calls itself as long
-            as the start_square is bordered by tiles opposite the player's
-            color. If a player's "partner" tile is found at the end of the
-            recursive call, all intermediate, opposing tiles are returned as
-            flippable. Otherwise, no tiles are returned.
+            Identifies all squares whose tiles are flipped by placing a tile
+            of the player's color on the start square. Each precomputed ray
+            leaving the start square is walked outward over tiles of the
+            opposing color; if a "partner" tile of the player's color ends
+            the run, all the opposing tiles before it are flippable.
+            Otherwise, no tiles along that ray are flippable.
         Parameters:
             player_color: String, the color of the current turn player
             start_square: BoardSquare, the board square from which the
                 flippable squares are identified
-            x_dir: int, the x-direction in which the recursive call will move
-            y_dir: int, the y-direction in which the recursive call will move
-            flip_squares: set, a set of all flippable tiles in the x_dir, y_dir
-                direction
         Returns:
-            flip_squares: set, either empty set or set of flippable squares
+            flippable_squares: list[BoardSquare], the flippable squares in
+                every direction, or an empty list
         """
-        next_square = None
+        squares = self._SQUARES
+        flippable_squares = []
 
-        # Confirm a square exists in the direction of (x_dir, y_dir)
-        if (0 <= start_square.x_index + x_dir <= self._MAX_INDEX) and (
-            0 <= start_square.y_index + y_dir <= self._MAX_INDEX
-        ):
+        for ray in self._RAYS[start_square.y_index * (self._MAX_INDEX + 1) +
+                              start_square.x_index]:
+            for count, index in enumerate(ray):
+                tile = squares[index].tile
 
-            next_square = self.board[start_square.y_index + y_dir][
-                start_square.x_index + x_dir
-            ]
+                # An empty square ends the run without a partner tile
+                if tile is None:
+                    break
 
-        # If no square exists, no tiles are flippable in this (x_dir, y_dir)
-        # Therefore, make flip_squares an empty set and return it
-        if next_square is None or next_square.tile is None:
-            flip_squares = set()
-
-        # If next square holds a tile of the opposing player, it is flippable
-        # Therefore, add the tile to flip squares and continue to search for
-        # a partner tile to complete the flip
-        elif next_square.tile.color != player_color:
-            flip_squares.add(next_square)
-            flip_squares = self._get_flippable_squares(
-                player_color, next_square, x_dir, y_dir, flip_squares
-            )
+                # A partner tile completes the flip of the run before it
+                if tile.color == player_color:
+                    if count:
+                        flippable_squares.extend(
+                            [squares[flip] for flip in ray[:count]])
+                    break
 
-        # If neither of the above two conditions are met, a partner tile has
-        # been found and the current flip_squares set contains flippable tiles
-        return flip_squares
+        return flippable_squares
 
     def _format_legal_move(self,
                            player_square,
                            flippable_squares,
-                           legal_moves):
+                           legal_moves,
+                           color=None):
         """
         Function -- _format_legal_move
-            Creates a LegalMove instance with all information required to
-            support Player hint functionality and Computer AI decision-making.
-            Associates a BoardCorner instance with the LegalMove if applicable
-            and also determines whether the move is a corner move or not. Once
-            the LegalMove instance is created, it is appended onto the list of
-            all legal moves for the given turn.
+            Creates a compact Move for a player square and its flippable
+            squares and wraps it in a LegalMove view, which supplies all
+            information required to support Player hint functionality and
+            Computer AI decision-making. Once the LegalMove instance is
+            created, it is appended onto the list of all legal moves for the
+            given turn.
         Parameters:
             player_square: BoardSquare, the board square of the legal move
             flippable_squares: list[BoardSquare], all squares that will be
                 flipped if the legal move is made
             legal_moves: list[LegalMove], list of all LegalMove instances
                 created and appended for the turn so far
+            color: Optional[str], the color of the player making the move
         Returns:
             None
         """
-        tracked_board_corner = None
-        is_corner_move = False
-        is_edge_move = False
-
-        x_index = player_square.x_index
-        y_index = player_square.y_index
-
-        # Determines if the move is in an X square (borders a corner square)
-        for board_corner in self.BOARD_CORNERS:
-            if (x_index, y_index) in board_corner.x_squares:
-                tracked_board_corner = board_corner
-
-        # Determines if the move occupies a corner square
-        if (
-            (x_index, y_index) == (0, 0) or
-            (x_index, y_index) == (0, self.MAX_INDEX) or
-            (x_index, y_index) == (self.MAX_INDEX, 0) or
-            (x_index, y_index) == (self.MAX_INDEX, self.MAX_INDEX)
-        ):
-            is_corner_move = True
-
-        # Determines if the move occupies a square on the edge of the board
-        if (
-            (player_square.x_index == 0)
-            or (player_square.y_index == 0)
-            or (player_square.x_index == self.MAX_INDEX)
-            or (player_square.y_index == self.MAX_INDEX)
-        ):
-
-            is_edge_move = True
-
-        legal_move = LegalMove(
+        size = self._MAX_INDEX + 1
+        square_index = player_square.y_index * size + player_square.x_index
+
+        flip_mask = 0
+        for flippable_square in flippable_squares:
+            flip_mask |= 1 << (flippable_square.y_index * size +
+                               flippable_square.x_index)
+
+        legal_moves.append(LegalMove(self,
+                                     Move(square_index, flip_mask, color),
+                                     flippable_squares))
+
+    def apply_move(self, legal_move, color=None):
+        """
+        Function -- apply_move
+            Places a tile on the legal move's player square, flips the legal
+            move's flippable squares and adjusts the tile counts. A compact
+            record of the change is pushed onto the undo stack so that the
+            move can be reverted with undo_move instead of copying the board.
+        Parameters:
+            legal_move: LegalMove, the legal move to execute
+            color: Optional[str], the color of the player making the move,
+                defaults to the color the legal move was generated for
+        Returns:
+            None
+        """
+        if color is None:
+            color = legal_move.color
+
+        player_square = legal_move.player_square
+        flippable_squares = legal_move.flippable_squares
+        total_flips = len(flippable_squares)
+
+        self._undo_stack.append((
             player_square,
             flippable_squares,
-            len(flippable_squares),
-            tracked_board_corner,
-            is_corner_move,
-            is_edge_move,
+            color,
+            self._empty_tiles,
+            self._black_tiles,
+            self._white_tiles,
+        ))
+
+        player_square.tile = Tile(
+            player_square.x + self.PIXEL_DISPLACEMENT,
+            player_square.y + self.PIXEL_DISPLACEMENT,
+            color,
         )
+        for flippable_square in flippable_squares:
+            flippable_square.tile.color = color
 
-        legal_moves.append(legal_move)
+        self._position.apply_move(legal_move.move, color)
+
+        self._empty_tiles -= 1
+        if color == "black":
+            self._black_tiles += total_flips + 1
+            self._white_tiles -= total_flips
+        else:
+            self._white_tiles += total_flips + 1
+            self._black_tiles -= total_flips
+
+    def pass_turn(self):
+        """
+        Function -- pass_turn
+            Gives the turn to the other player without placing a tile, for a
+            player with no legal move. The pass is pushed onto the undo stack
+            like a move.
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        self._undo_stack.append((
+            None,
+            [],
+            self.side_to_move,
+            self._empty_tiles,
+            self._black_tiles,
+            self._white_tiles,
+        ))
+        self._position.pass_turn()
+
+    def undo_move(self):
+        """
+        Function -- undo_move
+            Reverts the most recent move made with apply_move by removing the
+            placed tile, flipping the flipped tiles back to the opposing color
+            and restoring the tile counts, bitboard masks, side to move,
+            position hash and frontier, or reverts the most recent pass
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        (player_square,
+         flippable_squares,
+         color,
+         self._empty_tiles,
+         self._black_tiles,
+         self._white_tiles) = self._undo_stack.pop()
+        self._position.undo_move()
+        if player_square is None:
+            return
+
+        opposing_color = "white" if color == "black" else "black"
+
+        player_square.tile = None
+        for flippable_square in flippable_squares:
+            flippable_square.tile.color = opposing_color
+
+    def project_square(self, index):
+        """
+        Function -- project_square
+            Projects a square of the position onto the screen
+        Parameters:
+            index: int, the bit index of the square
+        Returns:
+            coordinates: tuple(int, int), the x, y coordinates of the center
+                of the square (px)
+        """
+        square = self._SQUARES[index]
+        return (square.x + self.PIXEL_DISPLACEMENT,
+                square.y + self.PIXEL_DISPLACEMENT)
 
     def yield_board_squares(self):
         """
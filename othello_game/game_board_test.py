@@ -3,6 +3,8 @@ from board_square import BoardSquare
 from player import Player
 from tile import Tile
 
+import random
+
 
 def test_constructor():
     gb: GameBoard = GameBoard(board_size=800)
@@ -174,8 +176,137 @@ def test__generate_board_diagonals():
     assert (7, 0) in gb.BOARD_DIAGONALS
 
 
+def test__generate_bitboard():
+    gb: GameBoard = GameBoard(board_size=800)
+    assert gb.use_bitboard is True
+    assert gb.bitboard is gb.position.bitboard
+    assert gb.bitboard.size == 8
+    # Starting tiles are mirrored in the bitboard
+    assert gb.bitboard.black == (1 << 28) | (1 << 35)
+    assert gb.bitboard.white == (1 << 27) | (1 << 36)
+
+    gb: GameBoard = GameBoard(board_size=0)
+    assert gb.bitboard.black == 0
+    assert gb.bitboard.white == 0
+
+
+def test_frontier():
+    gb: GameBoard = GameBoard(board_size=800)
+    # The 12 empty squares around the 4 starting tiles
+    block = 0
+    for y_index in range(2, 6):
+        for x_index in range(2, 6):
+            block |= 1 << (y_index * 8 + x_index)
+    assert gb.frontier == block & gb.bitboard.empty
+    assert gb.frontier == gb.position.frontier
+
+    # Placing a tile takes its square off the frontier and adds its empty
+    # neighbors; undoing the move restores the frontier
+    p: Player = Player(gb, "Player", "black")
+    gb.calculate_legal_moves(p.color)
+    frontier = gb.frontier
+    gb.apply_move(gb.legal_moves[0])
+    assert not gb.frontier & (1 << 19)
+    assert gb.frontier == frontier & ~(1 << 19) | (
+        (1 << 10) | (1 << 11) | (1 << 12))
+    gb.undo_move()
+    assert gb.frontier == frontier
+
+    # Moves placed by a Player update the frontier too
+    gb.calculate_legal_moves(p.color)
+    p._place_tile(gb.legal_moves[0])
+    assert gb.frontier == frontier & ~(1 << 19) | (
+        (1 << 10) | (1 << 11) | (1 << 12))
+
+
+def test_potential_mobility():
+    gb: GameBoard = GameBoard(board_size=800)
+    # 10 frontier squares touch each color's 2 starting tiles
+    assert gb.potential_mobility("black") == 10
+    assert gb.potential_mobility("white") == 10
+
+
 def test_calculate_legal_moves():
     gb: GameBoard = GameBoard(board_size=800)
+    p: Player = Player(gb, "Player", "black")
+    gb.calculate_legal_moves(p.color)
+    assert [(move.player_square.x_index, move.player_square.y_index)
+            for move in gb.legal_moves] == [(3, 2), (2, 3), (5, 4), (4, 5)]
+    assert gb.legal_moves[0].square_index == 19
+    assert gb.legal_moves[0].flip_mask == 1 << 27
+
+    # The BoardSquare grid scan produces the same moves
+    gb: GameBoard = GameBoard(board_size=800, use_bitboard=False)
+    gb.calculate_legal_moves(p.color)
+    assert [(move.player_square.x_index, move.player_square.y_index)
+            for move in gb.legal_moves] == [(3, 2), (2, 3), (5, 4), (4, 5)]
+    assert gb.legal_moves[0].square_index == 19
+    assert gb.legal_moves[0].flip_mask == 1 << 27
+
+
+def test__update_legal_moves():
+    # Incremental updates of the grid scan match a full scan through a
+    # whole game, including moves taken back
+    random.seed(7)
+    gb: GameBoard = GameBoard(board_size=800, use_bitboard=False,
+                              verify_moves=True)
+    assert gb.incremental_moves is True
+    players = [Player(gb, "Player", "black"),
+               Player(gb, "Computer", "white")]
+    turn = 0
+    passes = 0
+
+    while passes < 2:
+        player = players[turn % 2]
+        gb.calculate_legal_moves(player.color)
+        if gb.legal_moves and gb.undo_stack and random.random() < 0.2:
+            gb.undo_move()
+        elif gb.legal_moves:
+            gb.apply_move(random.choice(gb.legal_moves), player.color)
+            passes = 0
+        else:
+            passes += 1
+        gb.legal_moves = []
+        turn += 1
+
+    # Moves are reused when nothing on the board has changed
+    gb: GameBoard = GameBoard(board_size=800, use_bitboard=False)
+    p: Player = Player(gb, "Player", "black")
+    gb.calculate_legal_moves(p.color)
+    first_moves = gb.legal_moves
+    gb.calculate_legal_moves(p.color)
+    assert all(move is first_move
+               for move, first_move in zip(gb.legal_moves, first_moves))
+
+    # Only moves affected by a changed tile are recalculated: after black
+    # plays (3, 2), the move at (4, 5) is not in line with a changed square
+    gb.apply_move(first_moves[0], "black")
+    gb.calculate_legal_moves(p.color)
+    moves = {move.square_index: move for move in gb.legal_moves}
+    assert 19 not in moves
+    assert 26 not in moves
+    assert moves[37] is not first_moves[2]
+    assert moves[44] is first_moves[3]
+
+    # The debug mode reports moves that no longer match the board
+    gb.verify_moves = True
+    gb._move_cache["black"][2].pop(44)
+    try:
+        gb.calculate_legal_moves(p.color)
+        assert False
+    except RuntimeError:
+        pass
+
+    # Without incremental updates, or on the bitboard, every call
+    # recalculates the moves
+    for gb in (GameBoard(board_size=800, use_bitboard=False,
+                         incremental_moves=False),
+               GameBoard(board_size=800)):
+        gb.calculate_legal_moves(p.color)
+        first_moves = gb.legal_moves
+        gb.calculate_legal_moves(p.color)
+        assert gb.legal_moves[0] is not first_moves[0]
+        assert gb._move_cache == {}
 
 
 def test__calculate_tile_flips():
@@ -186,7 +317,7 @@ def test__calculate_tile_flips():
     # Conduct test on legal move assessment for tile start positions
 
     legal_move_list = [(3, 2), (2, 3), (4, 5), (5, 4)]
-    gb._calculate_tile_flips(p)
+    gb._calculate_tile_flips(p.color)
 
     for legal_move in gb.legal_moves:
         assert (legal_move.player_square.x_index,
@@ -206,22 +337,29 @@ def test__get_flippable_squares():
     # at (x=4, y=4), (x=4, y=5), and (x=6, y=6) by meeting the black partner
     # tiles at (x=4, y=3) and (x=6, y=6).
     start_square = gb.board[6][4]
-    flip_squares = set()
-    # Call to x_dir = 0, y_dir = -1 adds squares (4, 4) and (4, 5) to set
-    flip_squares.update(gb._get_flippable_squares("black",
-                                                  start_square,
-                                                  0,
-                                                  -1,
-                                                  flip_squares))
-    # Call to x_dir = 1, y_dir = 0 adds squares (5, 6) to set
-    flip_squares.update(gb._get_flippable_squares("black",
-                                                  start_square,
-                                                  1,
-                                                  0,
-                                                  flip_squares))
-    assert gb.board[4][4] in flip_squares
-    assert gb.board[5][4] in flip_squares
-    assert gb.board[6][5] in flip_squares
+    # The ray going up flips squares (4, 5) and (4, 4), nearest first, and
+    # the ray going right flips square (5, 6)
+    flip_squares = gb._get_flippable_squares("black", start_square)
+    assert flip_squares == [gb.board[5][4], gb.board[4][4], gb.board[6][5]]
+
+    # No tiles are flipped from a square without a partner tile
+    assert gb._get_flippable_squares("black", gb.board[0][0]) == []
+    assert gb._get_flippable_squares("white", start_square) == []
+
+
+def test__generate_rays():
+    rays = GameBoard._generate_rays(8)
+    assert len(rays) == 64
+    # A corner has 3 rays, each running to the far side of the board
+    assert rays[0] == ((1, 2, 3, 4, 5, 6, 7),
+                       (8, 16, 24, 32, 40, 48, 56),
+                       (9, 18, 27, 36, 45, 54, 63))
+    # Rays shorter than 2 squares are left out
+    assert len(rays[9]) == 3
+    assert len(rays[27]) == 8
+    # Rays are shared by every board of the same size
+    gb: GameBoard = GameBoard(board_size=800)
+    assert gb._RAYS is rays
 
 
 def test__format_legal_move():
@@ -239,19 +377,8 @@ def test__format_legal_move():
     gb.board[6][6].tile = Tile(650, 750, "black")
 
     start_square = gb.board[6][4]
-    flip_squares = set()
-    # Call to x_dir = 0, y_dir = -1 adds squares (4, 4) and (4, 5) to set
-    flip_squares.update(gb._get_flippable_squares("black",
-                                                  start_square,
-                                                  0,
-                                                  -1,
-                                                  flip_squares))
-    # Call to x_dir = 1, y_dir = 0 adds squares (5, 6) to set
-    flip_squares.update(gb._get_flippable_squares("black",
-                                                  start_square,
-                                                  1,
-                                                  0,
-                                                  flip_squares))
+    # Adds squares (4, 5), (4, 4) and (5, 6) to the list
+    flip_squares = gb._get_flippable_squares("black", start_square)
 
     gb._format_legal_move(start_square, flip_squares, gb.legal_moves)
 
@@ -289,13 +416,8 @@ def test__format_legal_move():
 
     # Start square is now a corner square
     start_square = gb.board[7][7]
-    flip_squares = set()
-    # Call to x_dir = 0, y_dir = -1 adds squares (7, 5) and (7, 6) to set
-    flip_squares.update(gb._get_flippable_squares("black",
-                                                  start_square,
-                                                  0,
-                                                  -1,
-                                                  flip_squares))
+    # Adds squares (7, 6) and (7, 5) to the list
+    flip_squares = gb._get_flippable_squares("black", start_square)
 
     gb._format_legal_move(start_square, flip_squares, gb.legal_moves)
 
@@ -331,13 +453,8 @@ def test__format_legal_move():
 
     # Start square is now a corner square
     start_square = gb.board[6][7]
-    flip_squares = set()
-    # Call to x_dir = 0, y_dir = -1 adds squares (7, 5) to set
-    flip_squares.update(gb._get_flippable_squares("black",
-                                                  start_square,
-                                                  0,
-                                                  -1,
-                                                  flip_squares))
+    # Adds square (7, 5) to the list
+    flip_squares = gb._get_flippable_squares("black", start_square)
 
     gb._format_legal_move(start_square, flip_squares, gb.legal_moves)
 
@@ -360,6 +477,15 @@ def test__format_legal_move():
     assert gb.legal_moves[0].is_edge_move is True
 
 
+def test_project_square():
+    gb: GameBoard = GameBoard(board_size=800)
+    # Square (3, 2) is drawn below the scoreboard
+    assert gb.project_square(19) == (350, 350)
+
+    gb: GameBoard = GameBoard(board_size=400)
+    assert gb.project_square(5) == (150, 150)
+
+
 def test_yield_board_squares():
     gb: GameBoard = GameBoard(board_size=800)
     # Ensure yield_board_squares function returns a generator that produces
@@ -371,3 +497,87 @@ def test_yield_board_squares():
     for board_square in gb.yield_board_squares():
         accumulator += 1
     assert accumulator == 64
+
+
+def test_apply_move():
+    gb: GameBoard = GameBoard(board_size=800)
+    p: Player = Player(gb, "Player", "black")
+    gb.calculate_legal_moves(p.color)
+    legal_move = gb.legal_moves[0]
+    assert legal_move.color == "black"
+
+    gb.apply_move(legal_move)
+    assert gb.board[2][3].tile.color == "black"
+    assert gb.board[3][3].tile.color == "black"
+    assert gb.empty_tiles == 59
+    assert gb.black_tiles == 4
+    assert gb.white_tiles == 1
+    assert gb.bitboard.popcount(gb.bitboard.black) == 4
+    assert len(gb.undo_stack) == 1
+
+
+def test_undo_move():
+    gb: GameBoard = GameBoard(board_size=800)
+    black_mask = gb.bitboard.black
+    white_mask = gb.bitboard.white
+    p_1: Player = Player(gb, "Player", "black")
+    p_2: Player = Player(gb, "Computer", "white")
+
+    # Apply two moves and undo them in reverse order
+    gb.calculate_legal_moves(p_1.color)
+    gb.apply_move(gb.legal_moves[0])
+    gb.calculate_legal_moves(p_2.color)
+    gb.apply_move(gb.legal_moves[0])
+    gb.undo_move()
+    assert gb.empty_tiles == 59
+    assert gb.black_tiles == 4
+    assert gb.white_tiles == 1
+
+    gb.undo_move()
+    assert gb.undo_stack == []
+    assert gb.board[2][3].is_empty is True
+    assert gb.board[3][3].tile.color == "white"
+    assert gb.empty_tiles == 60
+    assert gb.black_tiles == 2
+    assert gb.white_tiles == 2
+    assert gb.bitboard.black == black_mask
+    assert gb.bitboard.white == white_mask
+
+
+def test_position_hash():
+    gb: GameBoard = GameBoard(board_size=800)
+    start_hash = gb.position_hash
+    assert gb.side_to_move == "black"
+    assert start_hash == gb.zobrist.calculate_hash(
+        gb.bitboard.black, gb.bitboard.white, "black")
+
+    # Moves made by players update the hash incrementally
+    p_1: Player = Player(gb, "Player", "black")
+    p_2: Player = Player(gb, "Computer", "white")
+    gb.calculate_legal_moves(p_1.color)
+    p_1.take_turn(350, 350)
+    assert gb.side_to_move == "white"
+    assert gb.position_hash == gb.zobrist.calculate_hash(
+        gb.bitboard.black, gb.bitboard.white, "white")
+
+    # apply_move and undo_move keep the hash in sync
+    gb.calculate_legal_moves(p_2.color)
+    before_hash = gb.position_hash
+    gb.apply_move(gb.legal_moves[0])
+    assert gb.position_hash == gb.zobrist.calculate_hash(
+        gb.bitboard.black, gb.bitboard.white, "black")
+    gb.undo_move()
+    assert gb.position_hash == before_hash
+
+    # Calculating legal moves only inspects the position; a passed turn
+    # changes the side to move and is undone like a move
+    gb.calculate_legal_moves(p_1.color)
+    assert gb.side_to_move == "white"
+    assert gb.position_hash == before_hash
+    gb.pass_turn()
+    assert gb.side_to_move == "black"
+    assert gb.position_hash == before_hash ^ gb.zobrist.SIDE_KEY
+    gb.undo_move()
+    assert gb.side_to_move == "white"
+    assert gb.position_hash == before_hash
+    assert gb.white_tiles == 1
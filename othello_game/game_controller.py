@@ -1,8 +1,13 @@
+from background_search import BackgroundSearch
 from game_board import GameBoard
+from opening_book import OpeningBook
+from ponder import Ponder
 from player import Player
 from banner import Banner
 from scoreboard import Scoreboard
+from sliced_search import SlicedSearch
 
+import os
 import re
 import sys
 
@@ -18,20 +23,52 @@ class GameController:
 
     Methods:
     update: alternates player turns and declares winner at game end
+    _pondered_depth: returns the depth pondering reached for the position
+        on the board
+    _poll_computer_move: checks whether the hard AI's move is ready
+    _complete_computer_turn: plays the computer's move and hands the turn
+        back to player 1
     declare_winner: assigns self.winner based on tile count
     read_winner: reads scores.txt and finds the correct placement for the
         latest game score update
     write_winner: writes the latest score update to scores.txt
     print_winner: prints the winner and the game score to stdout
+    log_search_stats: prints the stats of a hard AI search to stdout
 
     Attributes:
     _gb: GameBoard, the Othello game board
     _player_1: Player, the human player is player 1
-    _player_2: Player, the computer player is player 1
+    _player_2: Player, the computer player is player 2, searching with
+        search_workers processes in the given parallel_mode on hard
+        difficulty and passing the SearchStats of every hard AI move to
+        on_search_stats, if given (log_search_stats prints them)
+    _opening_book_path: Optional[str], the opening book the hard AI plays
+        its first moves from, or None if there is none
+    _book_randomness: int, the randomness of the book moves (see
+        OpeningBook)
     _active_turn: Player, designates the player whose turn it is
     _hint_preference: str, specifies whether tile hints will be shown for
         the player during his/her turn
     _difficulty: str, the difficulty of the game (easy, medium, hard)
+    _time_budget_ms: Optional[int], the time (ms) the computer may spend
+        searching for each move, if its difficulty searches ahead
+    _search_mode: str, how the hard AI searches without blocking a frame:
+        in a worker process (BACKGROUND_SEARCH) or a slice per frame on the
+        draw() thread (SLICED_SEARCH), for runtimes without processes or
+        threads; a background search falls back to SLICED_SEARCH where
+        processes cannot be started
+    _frame_budget_ms: Optional[float], the time (ms) each frame may spend on
+        a sliced search
+    _frame_budget_nodes: Optional[int], the number of nodes each frame may
+        visit in a sliced search
+    _background_search: Optional[BackgroundSearch], runs the hard AI's
+        search in a worker process, created on the first hard move
+    _sliced_search: Optional[SlicedSearch], the running sliced search
+    _pondering: bool, whether the hard AI searches its replies to player
+        1's likely moves during player 1's turn; never with more than one
+        search worker
+    _ponder: Optional[Ponder], the hard AI's pondering, created on player
+        1's first turn
     _passed_turn_counter: int, the number of turns passed in the game without
         a move available to a player
     _display_counter: int, the number of calls to update() to permit several
@@ -46,6 +83,14 @@ class GameController:
     ENDGAME_DISPLAY_TIME = 500
     COMPUTER_AI_WAIT_TIME = 100
     MAX_TURN_PASS = 2
+    TIME_BUDGETS_MS = {"e": None, "m": None, "h": 1000}
+
+    BACKGROUND_SEARCH = "background"
+    SLICED_SEARCH = "sliced"
+    FRAME_BUDGET_MS = 8
+    # Next to this module, wherever the game is started from
+    OPENING_BOOK_PATH = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
 
     def __init__(self,
                  game_board_size,
@@ -54,13 +99,53 @@ class GameController:
                  player_name,
                  hint_preference,
                  difficulty,
-                 font_dict):
+                 font_dict,
+                 time_budget_ms=None,
+                 search_workers=1,
+                 parallel_mode=Player.ROOT_SPLIT,
+                 on_search_stats=None,
+                 search_mode=BACKGROUND_SEARCH,
+                 frame_budget_ms=FRAME_BUDGET_MS,
+                 frame_budget_nodes=None,
+                 pondering=True,
+                 opening_book_path=OPENING_BOOK_PATH,
+                 book_randomness=0):
         self._gb = GameBoard(game_board_size)
+        if opening_book_path is not None and not os.path.exists(
+                opening_book_path):
+            print("Could not read opening book " + opening_book_path)
+            opening_book_path = None
+        self._opening_book_path = opening_book_path
+        self._book_randomness = book_randomness
         self._player_1 = Player(self.gb, name=player_name, color="black")
-        self._player_2 = Player(self.gb, name="Computer", color="white")
+        self._player_2 = Player(self.gb,
+                                name="Computer",
+                                color="white",
+                                search_workers=search_workers,
+                                parallel_mode=parallel_mode,
+                                on_search_stats=on_search_stats,
+                                opening_book=(
+                                    OpeningBook(opening_book_path,
+                                                book_randomness)
+                                    if opening_book_path is not None
+                                    else None))
         self._active_turn = self._player_1
         self._hint_preference = hint_preference
         self._difficulty = difficulty
+        self._time_budget_ms = (time_budget_ms if time_budget_ms is not None
+                                else self.TIME_BUDGETS_MS.get(difficulty))
+        if (search_mode == self.BACKGROUND_SEARCH and
+                not BackgroundSearch.available()):
+            # Without processes, as on Jython, search a slice per frame
+            search_mode = self.SLICED_SEARCH
+        self._search_mode = search_mode
+        self._frame_budget_ms = frame_budget_ms
+        self._frame_budget_nodes = frame_budget_nodes
+        self._background_search = None
+        self._sliced_search = None
+        # The multi-process searches cannot resume at a pondered depth
+        self._pondering = pondering and search_workers == 1
+        self._ponder = None
         self._passed_turn_counter = 0
         self._display_counter = 0
         self._font_dict = font_dict
@@ -107,6 +192,77 @@ class GameController:
         """getter method for self._difficulty"""
         return self._difficulty
 
+    @property
+    def time_budget_ms(self):
+        """getter method for self._time_budget_ms"""
+        return self._time_budget_ms
+
+    @time_budget_ms.setter
+    def time_budget_ms(self, time_budget_ms):
+        """setter method for self._time_budget_ms"""
+        self._time_budget_ms = time_budget_ms
+
+    @property
+    def search_mode(self):
+        """getter method for self._search_mode"""
+        return self._search_mode
+
+    @property
+    def frame_budget_ms(self):
+        """getter method for self._frame_budget_ms"""
+        return self._frame_budget_ms
+
+    @property
+    def frame_budget_nodes(self):
+        """getter method for self._frame_budget_nodes"""
+        return self._frame_budget_nodes
+
+    @property
+    def sliced_search(self):
+        """getter method for self._sliced_search"""
+        return self._sliced_search
+
+    @property
+    def opening_book_path(self):
+        """getter method for self._opening_book_path"""
+        return self._opening_book_path
+
+    @property
+    def pondering(self):
+        """getter method for self._pondering"""
+        return self._pondering
+
+    @property
+    def ponder(self):
+        """getter method for self._ponder, created on first use: it searches
+        in the background search's worker process, or a slice per frame in
+        the SLICED_SEARCH mode, including where processes cannot be
+        started"""
+        if self._ponder is None:
+            if self.search_mode == self.SLICED_SEARCH:
+                self._ponder = Ponder(self.player_2,
+                                      self.time_budget_ms,
+                                      slice_ms=self.frame_budget_ms,
+                                      slice_nodes=self.frame_budget_nodes)
+            else:
+                self._ponder = Ponder(
+                    self.player_2,
+                    self.time_budget_ms,
+                    background_search=self.background_search)
+        return self._ponder
+
+    @property
+    def background_search(self):
+        """getter method for self._background_search, created on first
+        use"""
+        if self._background_search is None:
+            self._background_search = BackgroundSearch(
+                self.player_2.search_workers,
+                self.player_2.parallel_mode,
+                self._opening_book_path,
+                self._book_randomness)
+        return self._background_search
+
     @property
     def passed_turn_counter(self):
         """getter method for self._passed_turn_counter"""
@@ -157,7 +313,13 @@ class GameController:
         Function -- update
             Is repeatedly called by draw() in Processing file. Monitors and
             updates the state of the game by alternating player turns, running
-            game logic, and declaring winner at game end.
+            game logic, and declaring winner at game end. The hard AI
+            searches in a background process, polled once per call, or in
+            the SLICED_SEARCH mode advances its search by one frame budget
+            per call, so the board and scoreboard keep rendering while it
+            thinks. While pondering, the hard AI also searches its replies to
+            player 1's likely moves during player 1's turn, and starts its
+            own search at the depth pondering reached for the move played.
         Parameters:
             None
         Returns:
@@ -173,6 +335,14 @@ class GameController:
                 if not self.winner_printed:  # Print final score only once
                     self.print_winner()
                     self.winner_printed = True
+                    if self._background_search is not None:
+                        self._background_search.shutdown()
+                    if self._sliced_search is not None:
+                        self._sliced_search.cancel()
+                        self._sliced_search = None
+                    if self._ponder is not None:
+                        self._ponder.stop()
+                    self.player_2.shutdown_search()
 
             if self.gb.board_size == self.SCOREBOARD_DISPLAY_SIZE:
                 self.winner_banner.display()
@@ -185,22 +355,31 @@ class GameController:
         elif self.active_turn == self.player_1:
 
             if self.player_1.turn_complete:
+                if self._ponder is not None:
+                    self._ponder.stop()
                 self.gb.legal_moves = []
                 self.player_2.turn_complete = False
                 self.active_turn = self.player_2
 
             elif not self.gb.legal_moves:
-                self.gb.calculate_legal_moves(self.active_turn)
+                self.gb.calculate_legal_moves(self.active_turn.color)
 
                 if not self.gb.legal_moves:
+                    self.gb.pass_turn()
                     self.player_1.turn_complete = True
                     self.passed_turn_counter += 1
                 else:
                     self.passed_turn_counter = 0
+                    if self.difficulty == "h" and self.pondering:
+                        self.ponder.time_budget_ms = self.time_budget_ms
+                        self.ponder.start(self.gb.position,
+                                          self.player_1.color)
 
             else:
                 if self.hint_preference == "y":
                     self.gb.display_on_turn(self.active_turn)
+                if self._ponder is not None:
+                    self._ponder.advance()
 
         # Computer Turn
         elif self.active_turn == self.player_2:
@@ -210,25 +389,95 @@ class GameController:
             if self.display_counter == self.COMPUTER_AI_WAIT_TIME:
 
                 if not self.gb.legal_moves:
-                    self.gb.calculate_legal_moves(self.active_turn)
+                    self.gb.calculate_legal_moves(self.active_turn.color)
 
                 if self.difficulty == "e":
-                    next_move = self.player_2.calculate_next_move_easy()
+                    self._complete_computer_turn(
+                        self.player_2.calculate_next_move_easy())
                 elif self.difficulty == "m":
-                    next_move = self.player_2.calculate_next_move_med()
+                    self._complete_computer_turn(
+                        self.player_2.calculate_next_move_med())
+                elif self.search_mode == self.SLICED_SEARCH:
+                    self._sliced_search = SlicedSearch(
+                        self.player_2.select_move_hard_steps(
+                            self.time_budget_ms,
+                            start_depth=self._pondered_depth()),
+                        self.frame_budget_ms,
+                        self.frame_budget_nodes)
                 else:
-                    next_move = self.player_2.calculate_next_move_hard()
+                    self.background_search.start(self.gb.position,
+                                                 self.player_2.color,
+                                                 self.time_budget_ms,
+                                                 self._pondered_depth())
 
-                if next_move:
-                    self.player_2.take_turn(*next_move)
-                    self.passed_turn_counter = 0
-                else:
-                    self.passed_turn_counter += 1
+            # Poll the hard AI's search without blocking the frame
+            elif self.display_counter > self.COMPUTER_AI_WAIT_TIME:
+                self._poll_computer_move()
 
-                self.gb.legal_moves = []
-                self.display_counter = 0
-                self.player_1.turn_complete = False
-                self.active_turn = self.player_1
+    def _pondered_depth(self):
+        """
+        Function -- _pondered_depth
+            Returns the depth the hard AI's search starts at: the depth
+            pondering reached for the position on the board, if it was
+            pondered
+        Parameters:
+            None
+        Returns:
+            start_depth: int, the first depth of the search
+        """
+        if self._ponder is not None:
+            reply = self._ponder.lookup(self.gb.position, self.player_2.color)
+            if reply is not None:
+                return max(1, reply[1])
+        return 1
+
+    def _poll_computer_move(self):
+        """
+        Function -- _poll_computer_move
+            Checks whether the hard AI's move is ready, first advancing a
+            sliced search by one frame budget, and plays it if it is
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        if self._sliced_search is not None:
+            if not self._sliced_search.advance():
+                return
+            index = self._sliced_search.result
+            self._sliced_search = None
+        elif self.background_search.done:
+            index, stats = self.background_search.result()
+            if self.player_2.on_search_stats is not None:
+                self.player_2.on_search_stats(stats)
+        else:
+            return
+
+        self._complete_computer_turn(
+            None if index is None else self.gb.project_square(index))
+
+    def _complete_computer_turn(self, next_move):
+        """
+        Function -- _complete_computer_turn
+            Plays the computer's move, or counts a passed turn if it has
+            none, and hands the turn back to player 1
+        Parameters:
+            next_move: Optional[tuple(int, int)], the coordinates of the
+                computer's move, or None if it has no legal move
+        Returns:
+            None
+        """
+        if next_move:
+            self.player_2.take_turn(*next_move)
+            self.passed_turn_counter = 0
+        else:
+            self.gb.pass_turn()
+            self.passed_turn_counter += 1
+
+        self.gb.legal_moves = []
+        self.display_counter = 0
+        self.player_1.turn_complete = False
+        self.active_turn = self.player_1
 
     def declare_winner(self):
         """
@@ -331,3 +580,25 @@ class GameController:
         else:
             print("Tie Game!")
         print(str(self.gb.black_tiles) + " - " + str(self.gb.white_tiles))
+
+    @staticmethod
+    def log_search_stats(stats):
+        """
+        Function -- log_search_stats
+            Prints the stats of a hard AI search to the stdout on one line.
+            Pass it as on_search_stats to log every move of the computer.
+        Parameters:
+            stats: SearchStats, the stats of the search
+        Returns:
+            None
+        """
+        print("Search: depth " + str(stats.depth_reached) + ", " +
+              str(stats.nodes) + " nodes, " +
+              str(stats.leaf_evaluations) + " evaluations, branching " +
+              str(round(stats.branching_factor, 2)) + ", " +
+              str(round(stats.elapsed_s * 1000)) + " ms (" +
+              str(int(stats.nodes_per_second)) + " nodes/s), table hits " +
+              str(round(stats.table_hit_rate * 100, 1)) + "%, movegen " +
+              str(round(stats.move_generation_s * 1000)) + " ms, eval " +
+              str(round(stats.evaluation_s * 1000)) + " ms, make move " +
+              str(round(stats.make_move_s * 1000)) + " ms")
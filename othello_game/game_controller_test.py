@@ -3,7 +3,43 @@ from game_controller import GameController
 from game_board import GameBoard
 from scoreboard import Scoreboard
 
+import background_search
+import os
 import pytest
+import subprocess
+import sys
+import time
+
+
+# Plays the first moves of a game with the modules that Jython, which runs
+# the sketch, does not have made unimportable, in sliced search mode or, with
+# the argument "default", with the controller's default arguments
+WITHOUT_PROCESSES_SCRIPT = """
+import sys
+for name in ("multiprocessing", "concurrent", "concurrent.futures", "mmap"):
+    sys.modules[name] = None
+
+from game_controller import GameController
+
+options = {}
+if sys.argv[1:] != ["default"]:
+    options = {"search_mode": GameController.SLICED_SEARCH,
+               "frame_budget_nodes": 200}
+gc = GameController(game_board_size=800, score_board_width=800,
+                    score_board_height=100, player_name="Brian",
+                    hint_preference="n", difficulty="h", font_dict=None,
+                    **options)
+print(gc.search_mode)
+gc.update()
+gc.update()
+gc.player_1.take_turn(*gc.gb.project_square(
+    gc.gb.legal_moves[0].square_index))
+gc.update()
+gc.display_counter = 99
+while gc.active_turn == gc.player_2:
+    gc.update()
+print(gc.gb.black_tiles + gc.gb.white_tiles)
+"""
 
 
 def test_constructor():
@@ -29,6 +65,24 @@ def test_constructor():
     assert gc.display_counter == 0
     assert gc.winner is None
     assert gc.winner_printed is False
+    assert gc.time_budget_ms == gc.TIME_BUDGETS_MS["h"]
+
+    gc: GameController = GameController(game_board_size=800,
+                                        score_board_width=800,
+                                        score_board_height=100,
+                                        player_name="Brian",
+                                        hint_preference="y",
+                                        difficulty="h",
+                                        font_dict=None,
+                                        time_budget_ms=250,
+                                        search_workers=4,
+                                        parallel_mode=Player.LAZY_SMP)
+    assert gc.time_budget_ms == 250
+    assert gc.player_2.search_workers == 4
+    assert gc.player_1.search_workers == 1
+    assert gc.player_2.parallel_mode == Player.LAZY_SMP
+    # The multi-process searches cannot resume at a pondered depth
+    assert not gc.pondering
 
 
 def test_turn_handoff():
@@ -56,10 +110,23 @@ def test_turn_handoff():
     assert gc.active_turn == gc.player_2
     gc.display_counter = 99
     gc.update()
-    # Confirm the current turn goes to player 1 after player 2 turn complete
-    assert gc.active_turn == gc.player_1
-    # Confirm the player 2 turn complete is reverted to False
-    assert gc.player_2.turn_complete is True
+    # Confirm the hard AI searches in the background, polled every update
+    assert gc.background_search.running
+    assert gc.active_turn == gc.player_2
+    try:
+        deadline = time.time() + 30
+        while gc.active_turn == gc.player_2 and time.time() < deadline:
+            gc.update()
+            time.sleep(0.01)
+        # Confirm the current turn goes to player 1 after player 2 turn
+        # complete
+        assert gc.active_turn == gc.player_1
+        assert not gc.background_search.running
+        # Confirm the player 2 turn complete is reverted to False
+        assert gc.player_2.turn_complete is True
+        assert gc.gb.white_tiles == 4
+    finally:
+        gc.background_search.shutdown()
 
 
 @pytest.mark.skip(reason="Banner class is called requiring display functions")
@@ -84,3 +151,197 @@ def test_passed_turn_counter():
     assert gc.passed_turn_counter == 2
     gc.update()
     assert gc.active_turn is None
+
+
+def test_log_search_stats(capsys):
+    gc: GameController = GameController(
+        game_board_size=800,
+        score_board_width=800,
+        score_board_height=100,
+        player_name="Brian",
+        hint_preference="y",
+        difficulty="h",
+        font_dict=None,
+        on_search_stats=GameController.log_search_stats)
+    assert gc.player_2.on_search_stats is GameController.log_search_stats
+    assert gc.player_1.on_search_stats is None
+
+    gc.player_2.select_move_hard()
+    output = capsys.readouterr().out
+    assert output.startswith("Search: depth " +
+                             str(Player.MAX_RECURSION_DEPTH) + ", ")
+    assert "nodes/s" in output
+
+
+def test_sliced_search():
+    gc: GameController = GameController(
+        game_board_size=800,
+        score_board_width=800,
+        score_board_height=100,
+        player_name="Brian",
+        hint_preference="y",
+        difficulty="h",
+        font_dict=None,
+        search_mode=GameController.SLICED_SEARCH,
+        frame_budget_nodes=200)
+    assert gc.search_mode == GameController.SLICED_SEARCH
+    assert gc.frame_budget_nodes == 200
+
+    gc.player_1.turn_complete = True
+    gc.update()
+    gc.display_counter = 99
+    gc.update()
+    # The search starts on the computer's frame and runs a slice per update
+    sliced_search = gc.sliced_search
+    assert sliced_search is not None
+    while gc.active_turn == gc.player_2:
+        gc.update()
+    assert sliced_search.done
+    assert sliced_search.slices > 1
+    assert gc.sliced_search is None
+    assert gc.gb.white_tiles == 4
+
+
+def test_pondering():
+    gc: GameController = GameController(
+        game_board_size=800,
+        score_board_width=800,
+        score_board_height=100,
+        player_name="Brian",
+        hint_preference="n",
+        difficulty="h",
+        font_dict=None,
+        time_budget_ms=50,
+        search_mode=GameController.SLICED_SEARCH,
+        frame_budget_nodes=200,
+        opening_book_path=None)
+    assert gc.pondering
+
+    # Pondering starts once player 1's legal moves are known and searches
+    # the replies to them on the following updates
+    gc.update()
+    assert len(gc.ponder.queue) == 4
+    deadline = time.time() + 30
+    while (gc.ponder.queue or gc.ponder.running) and time.time() < deadline:
+        gc.update()
+    assert len(gc.ponder.cache) == 4
+    assert gc.active_turn == gc.player_1
+
+    gc.player_1.take_turn(*gc.gb.project_square(
+        gc.gb.legal_moves[0].square_index))
+    gc.update()
+    assert gc.active_turn == gc.player_2
+    # The computer's search starts at the depth pondering reached
+    reply = gc.ponder.lookup(gc.gb.position, gc.player_2.color)
+    assert reply is not None
+    assert gc._pondered_depth() == max(1, reply[1])
+
+    gc.display_counter = 99
+    gc.update()
+    while gc.active_turn == gc.player_2:
+        gc.update()
+    assert gc.player_2.search_stats.depth_reached >= reply[1]
+    assert gc.gb.white_tiles == 3
+
+
+def test_pondering_without_processes(monkeypatch):
+    # Without processes, pondering with the default arguments searches a
+    # slice per frame rather than starting a background search
+    monkeypatch.setitem(background_search._PROCESS_SUPPORT, "available",
+                        False)
+    gc: GameController = GameController(game_board_size=800,
+                                        score_board_width=800,
+                                        score_board_height=100,
+                                        player_name="Brian",
+                                        hint_preference="n",
+                                        difficulty="h",
+                                        font_dict=None)
+    assert gc.pondering
+    gc.time_budget_ms = 50
+    gc.update()
+    assert len(gc.ponder.queue) == 4
+    deadline = time.time() + 30
+    while (gc.ponder.queue or gc.ponder.running) and time.time() < deadline:
+        gc.update()
+    assert len(gc.ponder.cache) == 4
+    assert gc._background_search is None
+
+
+def test_pondering_off():
+    gc: GameController = GameController(game_board_size=800,
+                                        score_board_width=800,
+                                        score_board_height=100,
+                                        player_name="Brian",
+                                        hint_preference="n",
+                                        difficulty="h",
+                                        font_dict=None,
+                                        pondering=False)
+    gc.update()
+    gc.update()
+    assert gc._ponder is None
+    assert gc._pondered_depth() == 1
+
+
+def test_opening_book(capsys, monkeypatch, tmp_path):
+    gc: GameController = GameController(
+        game_board_size=800,
+        score_board_width=800,
+        score_board_height=100,
+        player_name="Brian",
+        hint_preference="n",
+        difficulty="h",
+        font_dict=None,
+        search_mode=GameController.SLICED_SEARCH,
+        frame_budget_nodes=200,
+        pondering=False)
+    assert gc.opening_book_path == GameController.OPENING_BOOK_PATH
+    assert gc.player_2.opening_book is not None
+    assert gc.player_1.opening_book is None
+
+    # The computer's first move comes from the book without a search
+    gc.update()
+    gc.player_1.take_turn(*gc.gb.project_square(
+        gc.gb.legal_moves[0].square_index))
+    gc.update()
+    gc.display_counter = 99
+    gc.update()
+    gc.update()
+    assert gc.active_turn == gc.player_1
+    assert gc.player_2.search_stats.nodes == 0
+    assert gc.gb.white_tiles == 3
+
+    gc: GameController = GameController(game_board_size=800,
+                                        score_board_width=800,
+                                        score_board_height=100,
+                                        player_name="Brian",
+                                        hint_preference="n",
+                                        difficulty="h",
+                                        font_dict=None,
+                                        opening_book_path="missing.bin")
+    assert gc.opening_book_path is None
+    assert gc.player_2.opening_book is None
+    assert "Could not read opening book missing.bin" in (
+        capsys.readouterr().out)
+
+    # The book is found next to the module from any working directory
+    monkeypatch.chdir(tmp_path)
+    gc: GameController = GameController(game_board_size=800,
+                                        score_board_width=800,
+                                        score_board_height=100,
+                                        player_name="Brian",
+                                        hint_preference="n",
+                                        difficulty="h",
+                                        font_dict=None)
+    assert gc.player_2.opening_book is not None
+
+
+def test_without_processes():
+    # Only the background search mode needs worker processes, and it falls
+    # back to the sliced search mode where they cannot be started
+    for arguments in [[], ["default"]]:
+        result = subprocess.run(
+            [sys.executable, "-c", WITHOUT_PROCESSES_SCRIPT] + arguments,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=120)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split() == [GameController.SLICED_SEARCH, "6"]
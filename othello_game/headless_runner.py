@@ -0,0 +1,325 @@
+from game_controller import GameController
+from move import Move
+from player import Player
+from position import Position
+
+import argparse
+import time
+
+
+class GameResult:
+    """
+    Purpose:
+    The GameResult class records the outcome of one game played by the
+    HeadlessRunner: the final tile counts, the winner, every move played and
+    how long the game took.
+
+    Methods:
+    to_dict: returns the result as a dict of plain values
+
+    Attributes:
+    _black_strategy: str, the name of the strategy that played black
+    _white_strategy: str, the name of the strategy that played white
+    _black_tiles: int, the number of black tiles at the end of the game
+    _white_tiles: int, the number of white tiles at the end of the game
+    _winner: Optional[str], the color of the winner, or None on a tie
+    _moves: list[Optional[int]], the bit index of every move played in
+        order, None for a passed turn
+    _duration_s: float, the wall-clock time the game took (s)
+    """
+
+    def __init__(self, black_strategy, white_strategy, black_tiles,
+                 white_tiles, winner, moves, duration_s):
+        self._black_strategy = black_strategy
+        self._white_strategy = white_strategy
+        self._black_tiles = black_tiles
+        self._white_tiles = white_tiles
+        self._winner = winner
+        self._moves = moves
+        self._duration_s = duration_s
+
+    @property
+    def black_strategy(self):
+        """getter method for self._black_strategy"""
+        return self._black_strategy
+
+    @property
+    def white_strategy(self):
+        """getter method for self._white_strategy"""
+        return self._white_strategy
+
+    @property
+    def black_tiles(self):
+        """getter method for self._black_tiles"""
+        return self._black_tiles
+
+    @property
+    def white_tiles(self):
+        """getter method for self._white_tiles"""
+        return self._white_tiles
+
+    @property
+    def winner(self):
+        """getter method for self._winner"""
+        return self._winner
+
+    @property
+    def moves(self):
+        """getter method for self._moves"""
+        return self._moves
+
+    @property
+    def duration_s(self):
+        """getter method for self._duration_s"""
+        return self._duration_s
+
+    @property
+    def tile_difference(self):
+        """getter method for the black tile count minus the white one"""
+        return self._black_tiles - self._white_tiles
+
+    def to_dict(self):
+        """
+        Function -- to_dict
+            Returns the result as a dict of plain values, ready to be written
+            as JSON for analytics
+        Parameters:
+            None
+        Returns:
+            result: dict, the fields of the result
+        """
+        return {
+            "black_strategy": self._black_strategy,
+            "white_strategy": self._white_strategy,
+            "black_tiles": self._black_tiles,
+            "white_tiles": self._white_tiles,
+            "winner": self._winner,
+            "moves": list(self._moves),
+            "duration_s": self._duration_s,
+        }
+
+
+class HeadlessRunner:
+    """
+    Purpose:
+    The HeadlessRunner class plays complete games between two strategies as
+    fast as the CPU allows, without Processing. It follows the turn rules of
+    the GameController (a player with no legal move passes and the game ends
+    after MAX_TURN_PASS consecutive passes) but plays on a rendering-free
+    Position, skips the computer's frame delays and returns a GameResult
+    instead of exiting. A strategy is one of the GameController difficulty
+    codes ("e", "m", "h") or a custom function that takes a Position and a
+    color and returns the bit index of its move, or None to pass.
+
+    Methods:
+    _create_strategy: turns a difficulty code or function into a move chooser
+    play_game: plays one game and returns its result
+    benchmark: plays several games and measures the games per second
+    shutdown: stops any worker processes used by the hard AI
+
+    Attributes:
+    _size: int, the number of squares along one side of the board
+    _time_budget_ms: Optional[int], the time (ms) the hard AI may spend
+        searching for each move; it searches to a fixed depth without one
+    _players: dict[str, Player], the headless Player of each color, used by
+        the difficulty-code strategies
+    _strategies: dict[str, function], the move chooser of each color
+    _strategy_names: dict[str, str], the name of each color's strategy
+    """
+
+    DIFFICULTIES = ("e", "m", "h")
+
+    def __init__(self, black_strategy="h", white_strategy="h", size=8,
+                 time_budget_ms=None, search_workers=1,
+                 parallel_mode=Player.ROOT_SPLIT):
+        self._size = size
+        self._time_budget_ms = time_budget_ms
+        self._players = {
+            "black": Player(None, "Black", "black",
+                            search_workers=search_workers,
+                            parallel_mode=parallel_mode,
+                            position=Position(size)),
+            "white": Player(None, "White", "white",
+                            search_workers=search_workers,
+                            parallel_mode=parallel_mode,
+                            position=Position(size)),
+        }
+        self._strategies = {
+            "black": self._create_strategy(black_strategy, "black"),
+            "white": self._create_strategy(white_strategy, "white"),
+        }
+        self._strategy_names = {
+            "black": getattr(black_strategy, "__name__", black_strategy),
+            "white": getattr(white_strategy, "__name__", white_strategy),
+        }
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    @property
+    def time_budget_ms(self):
+        """getter method for self._time_budget_ms"""
+        return self._time_budget_ms
+
+    @property
+    def players(self):
+        """getter method for self._players"""
+        return self._players
+
+    def _create_strategy(self, strategy, color):
+        """
+        Function -- _create_strategy
+            Turns a strategy into a function that takes a Position and a
+            color and returns the bit index of the move to play. Difficulty
+            codes are played by the color's headless Player.
+        Parameters:
+            strategy: str or function, a difficulty code ("e", "m", "h") or a
+                custom move chooser
+            color: str, the color the strategy plays
+        Returns:
+            choose_move: function, the move chooser
+        """
+        if callable(strategy):
+            return strategy
+        if strategy not in self.DIFFICULTIES:
+            raise ValueError("Unknown strategy: " + str(strategy))
+
+        player = self._players[color]
+
+        def choose_move(position, color):
+            player.position = position
+            if strategy == "e":
+                return player.select_move_easy()
+            elif strategy == "m":
+                return player.select_move_med()
+            return player.select_move_hard(self._time_budget_ms)
+
+        return choose_move
+
+    def play_game(self, position=None):
+        """
+        Function -- play_game
+            Plays one complete game between the two strategies, starting
+            from the given position or the standard opening. Each side in
+            turn chooses a move, passing when it has none, until
+            MAX_TURN_PASS turns in a row have been passed.
+        Parameters:
+            position: Optional[Position], the position to start from; it is
+                copied, so the caller's position is left unchanged
+        Returns:
+            result: GameResult, the outcome of the game
+        """
+        start_time = time.time()
+        position = (Position(self._size) if position is None
+                    else position.copy())
+        moves = []
+        passed_turn_counter = 0
+
+        while passed_turn_counter < GameController.MAX_TURN_PASS:
+            color = position.side_to_move
+            index = None
+            if position.has_legal_move(color):
+                index = self._strategies[color](position, color)
+
+            if index is None:
+                position.pass_turn()
+                passed_turn_counter += 1
+            else:
+                flip_mask = position.bitboard.calculate_flip_mask(color,
+                                                                  index)
+                if not flip_mask:
+                    raise ValueError(
+                        "Illegal move " + str(index) + " chosen for " +
+                        color + " by " + str(self._strategy_names[color]))
+                position.apply_move(Move(index, flip_mask, color))
+                passed_turn_counter = 0
+            moves.append(index)
+
+        # The passes that ended the game are not moves
+        del moves[-GameController.MAX_TURN_PASS:]
+
+        return GameResult(self._strategy_names["black"],
+                          self._strategy_names["white"],
+                          position.black_tiles,
+                          position.white_tiles,
+                          position.winner(),
+                          moves,
+                          time.time() - start_time)
+
+    def benchmark(self, num_games):
+        """
+        Function -- benchmark
+            Plays several games in a row and measures the throughput of the
+            runner
+        Parameters:
+            num_games: int, the number of games to play
+        Returns:
+            summary: dict, the number of games, the total time (s), the games
+                per second and the black wins, white wins and draws
+        """
+        start_time = time.time()
+        results = [self.play_game() for _ in range(num_games)]
+        seconds = time.time() - start_time
+
+        return {
+            "games": num_games,
+            "seconds": seconds,
+            "games_per_second": num_games / seconds if seconds else 0.0,
+            "black_wins": sum(result.winner == "black" for result in results),
+            "white_wins": sum(result.winner == "white" for result in results),
+            "draws": sum(result.winner is None for result in results),
+        }
+
+    def shutdown(self):
+        """
+        Function -- shutdown
+            Stops the worker processes of the players' multi-process
+            searches, if they were started
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        for player in self._players.values():
+            player.shutdown_search()
+
+
+def main(argv=None):
+    """
+    Function -- main
+        Command-line entry point: plays games between two strategies and
+        prints the games-per-second benchmark
+    Parameters:
+        argv: Optional[list[str]], the command-line arguments
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(
+        description="Play headless Othello games between two strategies")
+    parser.add_argument("--black", default="h",
+                        choices=HeadlessRunner.DIFFICULTIES)
+    parser.add_argument("--white", default="h",
+                        choices=HeadlessRunner.DIFFICULTIES)
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--size", type=int, default=8)
+    parser.add_argument("--time-budget-ms", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    runner = HeadlessRunner(args.black, args.white, args.size,
+                            args.time_budget_ms)
+    try:
+        summary = runner.benchmark(args.games)
+    finally:
+        runner.shutdown()
+
+    print(str(summary["games"]) + " games in " +
+          str(round(summary["seconds"], 2)) + " s (" +
+          str(round(summary["games_per_second"], 2)) + " games/s)")
+    print("Black " + str(summary["black_wins"]) + " - White " +
+          str(summary["white_wins"]) + " - Draws " + str(summary["draws"]))
+
+
+if __name__ == "__main__":
+    main()
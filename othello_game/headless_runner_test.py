@@ -0,0 +1,94 @@
+from headless_runner import GameResult, HeadlessRunner, main
+from player import Player
+from position import Position
+
+import pytest
+import random
+
+
+def test_constructor():
+    runner: HeadlessRunner = HeadlessRunner("e", "m", size=6,
+                                            time_budget_ms=50)
+    assert runner.size == 6
+    assert runner.time_budget_ms == 50
+    assert isinstance(runner.players["black"], Player)
+    assert runner.players["white"].color == "white"
+    assert runner.players["black"].gb is None
+
+    with pytest.raises(ValueError):
+        HeadlessRunner("x", "e")
+
+
+def test_play_game():
+    random.seed(3)
+    runner: HeadlessRunner = HeadlessRunner("e", "m")
+    result: GameResult = runner.play_game()
+    assert isinstance(result, GameResult)
+    assert result.black_strategy == "e"
+    assert result.white_strategy == "m"
+    assert result.duration_s >= 0
+
+    # Replaying the moves reaches the same final tile counts
+    position: Position = Position()
+    for index in result.moves:
+        if index is None:
+            position.pass_turn()
+        else:
+            move = [move for move in position.legal_moves()
+                    if move.index == index][0]
+            position.apply_move(move)
+    assert position.is_game_over() is True
+    assert position.black_tiles == result.black_tiles
+    assert position.white_tiles == result.white_tiles
+    assert result.winner == position.winner()
+    assert result.tile_difference == (
+        result.black_tiles - result.white_tiles)
+
+    # The result converts to plain values
+    assert result.to_dict()["moves"] == result.moves
+    assert result.to_dict()["winner"] == result.winner
+
+
+def test_play_game_hard():
+    # The hard AI plays a 4x4 board with the endgame solver
+    runner: HeadlessRunner = HeadlessRunner("h", "e", size=4)
+    result: GameResult = runner.play_game()
+    assert result.black_tiles + result.white_tiles <= 16
+    runner.shutdown()
+
+
+def test_custom_strategy():
+    def first_move(position, color):
+        legal_moves = position.legal_moves(color)
+        return legal_moves[0].index if legal_moves else None
+
+    runner: HeadlessRunner = HeadlessRunner(first_move, first_move)
+    result: GameResult = runner.play_game()
+    assert result.black_strategy == "first_move"
+    # The same deterministic strategies always play the same game
+    assert runner.play_game().moves == result.moves
+
+    # Games can start from a given position, which is left unchanged
+    position: Position = Position()
+    position.apply_move(position.legal_moves()[0])
+    result = runner.play_game(position)
+    assert result.moves[0] != 19
+    assert position.side_to_move == "white"
+    assert len(position.undo_stack) == 1
+
+    # Illegal moves are rejected
+    runner = HeadlessRunner(lambda position, color: 0, first_move)
+    with pytest.raises(ValueError):
+        runner.play_game()
+
+
+def test_benchmark(capsys):
+    runner: HeadlessRunner = HeadlessRunner("e", "e")
+    summary = runner.benchmark(5)
+    assert summary["games"] == 5
+    assert summary["black_wins"] + summary["white_wins"] + (
+        summary["draws"]) == 5
+    assert summary["games_per_second"] > 0
+
+    main(["--black", "e", "--white", "m", "--games", "2"])
+    assert "2 games in" in capsys.readouterr().out
@@ -0,0 +1,260 @@
+from bitboard import Bitboard
+from search_engine import SearchEngine
+from search_stats import SearchStats
+from transposition_table import TranspositionTable
+
+import time
+
+
+# The shared transposition table block, the search engines and the stop event
+# of each worker process, attached once when the worker starts
+_WORKER_STATE = {}
+
+
+def _attach_shared_table(block_name, table_size_mb, stop_event=None):
+    """
+    Function -- _attach_shared_table
+        Runs once in each worker process: attaches the shared memory block
+        holding the transposition table shared by every worker and keeps
+        the event that stops the worker's searches
+    Parameters:
+        block_name: str, the name of the shared memory block
+        table_size_mb: float, the memory budget of the shared table
+        stop_event: Optional[Event], the shared stop event
+    Returns:
+        None
+    """
+    from multiprocessing import shared_memory
+
+    # The block belongs to the main process, which unlinks it on shutdown
+    block = shared_memory.SharedMemory(name=block_name)
+    _WORKER_STATE["block"] = block
+    _WORKER_STATE["table"] = TranspositionTable(table_size_mb,
+                                                buffer=block.buf)
+    _WORKER_STATE["engines"] = {}
+    _WORKER_STATE["stop_event"] = stop_event
+
+
+def _search_position(position, root_moves, depth, start_depth,
+                     time_budget_ms):
+    """
+    Function -- _search_position
+        Runs in a worker process: searches the whole root position with the
+        worker's SearchEngine, which reads and writes the shared table
+    Parameters:
+        position: tuple[int, int, int, str], the board size, black bitmask,
+            white bitmask and color of the player to move
+        root_moves: list[int], bit indices of the root legal moves, in the
+            order the worker searches them
+        depth: Optional[int], the maximum number of plies to search
+        start_depth: int, the first depth the worker searches
+        time_budget_ms: Optional[int], the wall-clock time (ms) the search
+            may use
+    Returns:
+        result: tuple[int, Optional[int], int, SearchStats], the deepest depth
+            the worker completed, its best move, its score and the stats of
+            its search
+    """
+    size, black, white, color = position
+
+    engines = _WORKER_STATE["engines"]
+    engine = engines.get(size)
+    if engine is None:
+        engine = SearchEngine(size, table_size_mb=0)
+        engine.transposition_table = _WORKER_STATE["table"]
+        engine.stop_event = _WORKER_STATE.get("stop_event")
+        engines[size] = engine
+
+    index, score = engine.search(Bitboard(size, black, white), color, depth,
+                                 time_budget_ms, root_moves, start_depth)
+    return engine.depth_reached, index, score, engine.stats
+
+
+class LazySMPSearch:
+    """
+    Purpose:
+    The LazySMPSearch class spreads the hard AI's search across several
+    processes that all search the whole root position (Lazy SMP). The
+    workers share one transposition table held in a shared memory block, so
+    results found by one worker cut off the search of the others without
+    any pickling per probe. Workers start their iterative deepening at
+    staggered depths and search the root moves in rotated orders so that
+    they explore different parts of the tree. The result of the worker that
+    completed the deepest depth is returned. Unlike root splitting, every
+    worker is useful even when the root has only a handful of legal moves.
+    A stop event set before the first search is handed to every worker,
+    whose searches stop once it is set.
+
+    Methods:
+    search: returns the best move and its score for a given position
+    _rotate_moves: orders the root legal moves for a worker
+    shutdown: stops the worker processes and frees the shared table
+
+    Attributes:
+    _size: int, the number of squares along one side of the board
+    _workers: int, the number of worker processes
+    _max_depth: int, the default number of plies searched
+    _table_size_mb: float, the size of the shared transposition table
+    _bitboard: Bitboard, move generator for boards of the given size
+    _block: Optional[SharedMemory], the shared memory block holding the
+        transposition table, created by the first search
+    _executor: Optional[ProcessPoolExecutor], the pool of worker processes,
+        started by the first search
+    _stop_event: Optional[Event], stops the workers' searches once set,
+        such as when another process cancels the search
+    _depth_reached: int, the deepest depth completed in the last search
+    _stats: Optional[SearchStats], the combined stats of the workers in the
+        last search
+    """
+
+    def __init__(self, size, workers=4, max_depth=6, table_size_mb=16):
+        self._size = size
+        self._workers = workers
+        self._max_depth = max_depth
+        self._table_size_mb = table_size_mb
+        self._bitboard = Bitboard(size)
+        self._block = None
+        self._executor = None
+        self._stop_event = None
+        self._depth_reached = 0
+        self._stats = None
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    @property
+    def workers(self):
+        """getter method for self._workers"""
+        return self._workers
+
+    @property
+    def max_depth(self):
+        """getter method for self._max_depth"""
+        return self._max_depth
+
+    @property
+    def stop_event(self):
+        """getter method for self._stop_event"""
+        return self._stop_event
+
+    @stop_event.setter
+    def stop_event(self, stop_event):
+        """setter method for self._stop_event, handed to the workers when
+        the first search starts them"""
+        self._stop_event = stop_event
+
+    @property
+    def depth_reached(self):
+        """getter method for self._depth_reached"""
+        return self._depth_reached
+
+    @property
+    def stats(self):
+        """getter method for self._stats"""
+        return self._stats
+
+    def search(self, bitboard, color, depth=None, time_budget_ms=None):
+        """
+        Function -- search
+            Searches the position on the given bitboard for the player of the
+            given color in every worker process at once. Odd-numbered workers
+            start one ply deeper than even-numbered ones. The best move comes
+            from the worker that completed the deepest depth, preferring
+            lower-numbered workers on ties.
+        Parameters:
+            bitboard: Bitboard, the tiles of the position to search
+            color: str, the color of the player to move
+            depth: Optional[int], the maximum number of plies to search,
+                defaults to max_depth without a time budget
+            time_budget_ms: Optional[int], the wall-clock time (ms) the search
+                may use
+        Returns:
+            best_move: tuple[Optional[int], Optional[int]], the bit index of
+                the best move and its score, or (None, None) if the player has
+                no legal move
+        """
+        start_time = time.time()
+        if depth is None and time_budget_ms is None:
+            depth = self._max_depth
+
+        own = bitboard.tiles(color)
+        opponent = bitboard.black if color == "white" else bitboard.white
+        moves = list(Bitboard.yield_indices(
+            self._bitboard.generate_moves(own, opponent)))
+        self._depth_reached = 0
+        self._stats = SearchStats(nodes=1)
+        if not moves:
+            return None, None
+
+        if self._executor is None:
+            # Process pools and shared memory are only loaded once needed
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import shared_memory
+
+            self._block = shared_memory.SharedMemory(
+                create=True,
+                size=TranspositionTable.calculate_bytes(self._table_size_mb))
+            self._block.buf[:] = bytes(self._block.size)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                initializer=_attach_shared_table,
+                initargs=(self._block.name, self._table_size_mb,
+                          self._stop_event))
+
+        position = (self._size, bitboard.black, bitboard.white, color)
+        futures = [
+            self._executor.submit(_search_position,
+                                  position,
+                                  self._rotate_moves(moves, worker),
+                                  depth,
+                                  1 + worker % 2,
+                                  time_budget_ms)
+            for worker in range(self._workers)
+        ]
+        worker_results = [future.result() for future in futures]
+
+        best_depth, best_index, best_score = worker_results[0][:3]
+        for result_depth, index, score, stats in worker_results[1:]:
+            if result_depth > best_depth:
+                best_depth, best_index, best_score = result_depth, index, score
+
+        self._depth_reached = best_depth
+        self._stats = SearchStats.combine(
+            [result[3] for result in worker_results],
+            best_depth,
+            time.time() - start_time)
+        return best_index, best_score
+
+    def _rotate_moves(self, moves, worker):
+        """
+        Function -- _rotate_moves
+            Orders the root legal moves for a worker by rotating the list by
+            the worker's number, so that workers start on different moves
+        Parameters:
+            moves: list[int], bit indices of the root legal moves
+            worker: int, the number of the worker
+        Returns:
+            rotated_moves: list[int], the moves in the worker's search order
+        """
+        shift = worker % len(moves)
+        return moves[shift:] + moves[:shift]
+
+    def shutdown(self):
+        """
+        Function -- shutdown
+            Stops the worker processes and frees the shared transposition
+            table. The next search starts a new pool with an empty table.
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
@@ -0,0 +1,106 @@
+from bitboard import Bitboard
+from game_board import GameBoard
+from lazy_smp_search import (LazySMPSearch, _WORKER_STATE,
+                             _attach_shared_table, _search_position)
+from search_engine import SearchEngine
+from transposition_table import TranspositionTable
+
+from multiprocessing import shared_memory
+import multiprocessing
+import random
+
+
+def midgame_position(seed, plies):
+    random.seed(seed)
+    bb: Bitboard = GameBoard(board_size=800).bitboard
+    color = "black"
+    for _ in range(plies):
+        moves = bb.calculate_legal_moves(color)
+        if moves:
+            index, flips = random.choice(moves)
+            bb.make_move(color, index, flips)
+        color = "white" if color == "black" else "black"
+    return bb, color
+
+
+def test_constructor():
+    ls: LazySMPSearch = LazySMPSearch(8, workers=3)
+    assert isinstance(ls, LazySMPSearch)
+    assert ls.size == 8
+    assert ls.workers == 3
+    assert ls.max_depth == 6
+    assert ls.depth_reached == 0
+
+
+def test__rotate_moves():
+    ls: LazySMPSearch = LazySMPSearch(8, workers=3)
+    assert ls._rotate_moves([1, 2, 3], 0) == [1, 2, 3]
+    assert ls._rotate_moves([1, 2, 3], 2) == [3, 1, 2]
+    assert ls._rotate_moves([1, 2], 3) == [2, 1]
+
+
+def test__search_position():
+    block = shared_memory.SharedMemory(
+        create=True, size=TranspositionTable.calculate_bytes(1))
+    try:
+        block.buf[:] = bytes(block.size)
+        _attach_shared_table(block.name, 1)
+        bb, color = midgame_position(3, 16)
+        moves = list(Bitboard.yield_indices(bb.calculate_move_mask(color)))
+        depth, index, score, stats = _search_position(
+            (8, bb.black, bb.white, color), moves, 3, 2, None)
+        assert depth == 3
+        assert stats.depth_reached == 3
+        assert index in moves
+        # The worker's results are written to the shared block
+        assert _WORKER_STATE["table"].stores > 0
+        assert any(block.buf)
+    finally:
+        _WORKER_STATE["table"] = None
+        _WORKER_STATE["engines"] = {}
+        _WORKER_STATE.pop("block").close()
+        block.close()
+        block.unlink()
+
+
+def test_search():
+    bb, color = midgame_position(4, 18)
+    ls: LazySMPSearch = LazySMPSearch(8, workers=2, table_size_mb=1)
+    try:
+        index, score = ls.search(bb, color, depth=3)
+        assert ls.depth_reached == 3
+        assert ls.stats.depth_reached == 3
+        assert ls.stats.nodes > 1
+
+        # Every worker searches the whole root, so the score matches a
+        # single process
+        se: SearchEngine = SearchEngine(8, table_size_mb=0)
+        serial_index, serial_score = se.search(bb, color, 3)
+        assert score == serial_score
+
+        index, score = ls.search(bb, color, time_budget_ms=200)
+        assert index in Bitboard.yield_indices(bb.calculate_move_mask(color))
+        assert ls.depth_reached >= 1
+    finally:
+        ls.shutdown()
+
+    # A player without legal moves has no best move
+    bb: Bitboard = Bitboard(8)
+    bb.place("black", 0, 0)
+    assert ls.search(bb, "white", depth=3) == (None, None)
+
+
+def test_stop_event():
+    bb, color = midgame_position(4, 18)
+    stop_event = multiprocessing.Event()
+    stop_event.set()
+    ls: LazySMPSearch = LazySMPSearch(8, workers=2, table_size_mb=1)
+    ls.stop_event = stop_event
+    assert ls.stop_event is stop_event
+    try:
+        # The workers stop at their first time check
+        index, score = ls.search(bb, color, depth=8)
+    finally:
+        ls.shutdown()
+    assert index in Bitboard.yield_indices(bb.calculate_move_mask(color))
+    assert ls.depth_reached < 8
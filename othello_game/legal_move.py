@@ -1,106 +1,107 @@
 class LegalMove:
     """
     Purpose:
-    The LegalMove class creates a legal move for a given turn and supplies all
-    necessary information concerning that move for the player move hint system
-    and the computer's hard AI algorithm
+    The LegalMove class presents a legal move for a given turn to the player
+    move hint system and the rest of the UI. It is a thin view over a
+    compact Move and the GameBoard it was generated on: the BoardSquare
+    objects and the corner and edge information of the move are looked up
+    from the board when they are first needed rather than stored up front.
 
     Methods: None
 
     Attributes:
-    _player_square: BoardSquare, the board square on which a player must place
-        the tile to execute this move
-    _flippable_squares: list[Board], list of BoardSquare objects whose tiles
-        can be flipped on this move
-    _total_flips: int, the total number of flips this move will accomplish
-    _board_corner: BoardCorner, a 4-tile corner of the board the move is
-        associated with, if applicable
-    _is_corner_move: bool, True if the move places a tile in a corner square,
-        False if it does not
-    _is_edge_move: bool, True if the move places a tile in an edge square,
-        False if it does not
-    _move_value: float, the float value of the move specifying its favorability
-        for the computer's hard AI decision-making tree.
-    _max_tiles: int, the max number of tiles making this move can achieve
-        under the conditions determined by the hard AI algorithm
+    _gb: GameBoard, the game board the move was generated on
+    _move: Move, the square index, flip mask and color of the move
+    _flippable_squares: Optional[list[BoardSquare]], BoardSquare objects whose
+        tiles can be flipped on this move, looked up on first use
     """
 
-    def __init__(
-        self,
-        player_square,
-        flippable_squares,
-        total_flips,
-        board_corner,
-        is_corner_move,
-        is_edge_move,
-    ):
-        self._player_square = player_square
-        self._flippable_squares = flippable_squares
-        self._total_flips = total_flips
-        self._board_corner = board_corner
-        self._is_corner_move = is_corner_move
-        self._is_edge_move = is_edge_move
-        self._move_value = 0
-        self._max_tiles = 0
+    __slots__ = ("_gb", "_move", "_flippable_squares")
 
-    def __eq__(self, other):
-        """Return a boolean representing equality of the move's move value"""
-        return self.move_value == other.move_value
+    def __init__(self, gb, move, flippable_squares=None):
+        self._gb = gb
+        self._move = move
+        self._flippable_squares = flippable_squares
 
-    def __lt__(self, other):
-        """Return a boolean for the less than relationship"""
-        return self.move_value < other.move_value
+    @property
+    def gb(self):
+        """getter method for self._gb"""
+        return self._gb
 
-    def __gt__(self, other):
-        """Return a boolean for the greater than relationship"""
-        return self.move_value > other.move_value
+    @property
+    def move(self):
+        """getter method for self._move"""
+        return self._move
 
     @property
     def player_square(self):
-        """getter method for self._player_square"""
-        return self._player_square
+        """getter method for the board square on which a player must place
+        the tile to execute this move"""
+        return self._gb.squares[self._move.index]
 
     @property
     def flippable_squares(self):
-        """getter method for self._flippable_squares"""
+        """getter method for self._flippable_squares, looked up on first
+        use"""
+        if self._flippable_squares is None:
+            squares = self._gb.squares
+            self._flippable_squares = [
+                squares[flip_index]
+                for flip_index in self._move.yield_flip_indices()
+            ]
         return self._flippable_squares
 
     @property
     def total_flips(self):
-        """getter method for self._total_flips"""
-        return self._total_flips
+        """getter method for the total number of flips this move will
+        accomplish"""
+        return self._move.total_flips
 
     @property
     def board_corner(self):
-        """getter method for self._board_corner"""
-        return self._board_corner
+        """getter method for the 4-tile corner of the board the move is
+        associated with, if the move is on one of its x-squares"""
+        player_square = self.player_square
+        coordinates = (player_square.x_index, player_square.y_index)
+
+        board_corner = None
+        for corner in self._gb.BOARD_CORNERS or ():
+            if coordinates in corner.x_squares:
+                board_corner = corner
+        return board_corner
 
     @property
     def is_corner_move(self):
-        """getter method for self._is_corner_move"""
-        return self._is_corner_move
+        """getter method for whether the move places a tile in a corner
+        square"""
+        player_square = self.player_square
+        max_index = self._gb.MAX_INDEX
+        return (player_square.x_index in (0, max_index) and
+                player_square.y_index in (0, max_index))
 
     @property
     def is_edge_move(self):
-        """getter method for self._is_edge_move"""
-        return self._is_edge_move
+        """getter method for whether the move places a tile in an edge
+        square"""
+        player_square = self.player_square
+        max_index = self._gb.MAX_INDEX
+        return (player_square.x_index in (0, max_index) or
+                player_square.y_index in (0, max_index))
 
     @property
-    def move_value(self):
-        """getter method for self._move_value"""
-        return self._move_value
+    def square_index(self):
+        """getter method for the bit index of the player square on the game
+        board's Bitboard"""
+        return self._move.index
 
-    @move_value.setter
-    def move_value(self, move_value):
-        """setter method for self._move_value"""
-        self._move_value = move_value
+    @property
+    def flip_mask(self):
+        """getter method for the bitmask of the flippable squares on the game
+        board's Bitboard"""
+        return self._move.flip_mask
 
     @property
-    def max_tiles(self):
-        """getter method for self._max_tiles"""
-        return self._max_tiles
-
-    @max_tiles.setter
-    def max_tiles(self, max_tiles):
-        """setter method for self._max_tiles"""
-        self._max_tiles = max_tiles
+    def color(self):
+        """getter method for the color of the player the move was generated
+        for"""
+        return self._move.color
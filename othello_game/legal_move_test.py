@@ -2,33 +2,49 @@ from board_square import BoardSquare
 from legal_move import LegalMove
 from game_board import GameBoard
 from board_corner import BoardCorner
+from move import Move
 
 
 def test_constructor():
     gb: GameBoard = GameBoard(board_size=800)
-    lm: LegalMove = LegalMove(
-        gb.board[5][4], set(), 1, gb.BOARD_CORNERS[0], False, False
-    )
+    lm: LegalMove = LegalMove(gb, Move(19, 1 << 27, "black"))
 
     assert isinstance(lm, LegalMove)
+    assert lm.gb is gb
+    assert lm.move == Move(19, 1 << 27, "black")
     assert isinstance(lm.player_square, BoardSquare)
-    assert isinstance(lm.flippable_squares, set)
-    assert isinstance(lm.board_corner, BoardCorner)
+    assert lm.player_square is gb.board[2][3]
+    assert lm.flippable_squares == [gb.board[3][3]]
+    assert lm.board_corner is None
 
     assert lm.total_flips == 1
     assert lm.is_corner_move is False
     assert lm.is_edge_move is False
-    assert lm.move_value == 0
-    assert lm.max_tiles == 0
+    assert lm.square_index == 19
+    assert lm.flip_mask == 1 << 27
+    assert lm.color == "black"
+
+    # Flippable squares given up front are used as they are
+    flippable_squares = [gb.board[3][3]]
+    lm = LegalMove(gb, Move(19, 1 << 27, "black"), flippable_squares)
+    assert lm.flippable_squares is flippable_squares
+
+    # A view has no per-instance dict
+    assert not hasattr(lm, "__dict__")
 
 
-def test_move_value_comparison():
+def test_board_position():
     gb: GameBoard = GameBoard(board_size=800)
-    lm_1: LegalMove = LegalMove(gb.board[5][4], set(), 0, None, False, False)
 
-    lm_2: LegalMove = LegalMove(gb.board[2][3], set(), 0, None, False, False)
+    # A corner square is also an edge square
+    lm: LegalMove = LegalMove(gb, Move(63, 1 << 54, "white"))
+    assert lm.is_corner_move is True
+    assert lm.is_edge_move is True
+    assert lm.board_corner is None
 
-    assert lm_1 == lm_2
-    lm_1.move_value = 1.0
-    assert lm_1 > lm_2
-    assert lm_2 < lm_1
+    # An x-square is associated with its corner
+    lm = LegalMove(gb, Move(62, 1 << 61, "white"))
+    assert lm.is_corner_move is False
+    assert lm.is_edge_move is True
+    assert isinstance(lm.board_corner, BoardCorner)
+    assert lm.board_corner is gb.BOARD_CORNERS[3]
@@ -0,0 +1,72 @@
+from bitboard import Bitboard
+
+
+class Move:
+    """
+    Purpose:
+    The Move class is the compact representation of a legal move: the bit
+    index of the square the tile is placed on, the bitmask of the tiles it
+    flips and the color of the player making it. It uses __slots__ and
+    holds no BoardSquare references, so creating many moves allocates
+    little memory. LegalMove wraps a Move to present it to the UI.
+
+    Methods:
+    yield_flip_indices: generator function that yields the bit index of every
+        flipped tile
+
+    Attributes:
+    _index: int, the bit index of the square the tile is placed on
+    _flip_mask: int, bitmask of the tiles the move flips
+    _color: Optional[str], the color of the player making the move
+    """
+
+    __slots__ = ("_index", "_flip_mask", "_color")
+
+    def __init__(self, index, flip_mask, color=None):
+        self._index = index
+        self._flip_mask = flip_mask
+        self._color = color
+
+    def __eq__(self, other):
+        """Return a boolean representing equality of the moves' squares,
+        flips and colors"""
+        return (isinstance(other, Move) and
+                self._index == other.index and
+                self._flip_mask == other.flip_mask and
+                self._color == other.color)
+
+    def __hash__(self):
+        """Return the hash of the move's square, flips and color"""
+        return hash((self._index, self._flip_mask, self._color))
+
+    @property
+    def index(self):
+        """getter method for self._index"""
+        return self._index
+
+    @property
+    def flip_mask(self):
+        """getter method for self._flip_mask"""
+        return self._flip_mask
+
+    @property
+    def color(self):
+        """getter method for self._color"""
+        return self._color
+
+    @property
+    def total_flips(self):
+        """getter method for the number of tiles the move flips"""
+        return Bitboard.popcount(self._flip_mask)
+
+    def yield_flip_indices(self):
+        """
+        Function -- yield_flip_indices
+            Generator function that yields the bit index of every tile the
+            move flips, from the lowest index to the highest
+        Parameters:
+            None
+        Yields:
+            index: int, the bit index of a flipped tile
+        """
+        return Bitboard.yield_indices(self._flip_mask)
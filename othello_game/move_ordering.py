@@ -0,0 +1,230 @@
+from bitboard import Bitboard
+
+
+class MoveOrdering:
+    """
+    Purpose:
+    The MoveOrdering class decides the order in which the hard AI's search
+    tries the legal moves of a position. Alpha-beta pruning cuts off the
+    most branches when the best move is searched first, so moves are tried
+    in the following order: the transposition table's best move (hash
+    move), the killer moves that caused a cutoff at the same ply elsewhere
+    in the tree, and then the remaining moves by their history score and
+    their static square priority. The class also counts how often the first
+    move searched caused the cutoff, which measures how good the ordering
+    is.
+
+    Methods:
+    _generate_square_priorities: creates the static priority of each square
+    killers: returns the killer moves of a ply
+    new_search: resets the killer moves and counters for a new search
+    order_moves: returns the legal moves of a position in search order
+    record_cutoff: updates the killer moves, history and counters after a
+        move caused a cutoff
+
+    Attributes:
+    _size: int, the number of squares along one side of the board
+    _killers: list[list[int]], the killer moves of each ply, most recent
+        first (NO_MOVE if none)
+    _history: dict[str, list[int]], the history score of each square for
+        each color
+    _cutoffs: int, the number of nodes cut off since the last new_search
+    _first_move_cutoffs: int, the number of those cutoffs caused by the
+        first move searched
+    _SQUARE_PRIORITIES: list[int], the static priority of each square
+    """
+
+    NO_MOVE = -1
+    KILLER_SLOTS = 2
+
+    # Static square priorities: corners first, x-squares last
+    CORNER_PRIORITY = 3
+    EDGE_PRIORITY = 2
+    INNER_PRIORITY = 1
+    X_SQUARE_PRIORITY = 0
+
+    def __init__(self, size, board_corners=None):
+        self._size = size
+        self._killers = [[self.NO_MOVE] * self.KILLER_SLOTS
+                         for _ in range(size * size + 1)]
+        self._history = {"black": [0] * (size * size),
+                         "white": [0] * (size * size)}
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+        self._SQUARE_PRIORITIES = self._generate_square_priorities(
+            board_corners)
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    @property
+    def history(self):
+        """getter method for self._history"""
+        return self._history
+
+    @property
+    def cutoffs(self):
+        """getter method for self._cutoffs"""
+        return self._cutoffs
+
+    @property
+    def first_move_cutoffs(self):
+        """getter method for self._first_move_cutoffs"""
+        return self._first_move_cutoffs
+
+    @property
+    def first_move_cutoff_rate(self):
+        """getter method for the fraction of cutoffs caused by the first
+        move searched"""
+        if not self._cutoffs:
+            return 0.0
+        return self._first_move_cutoffs / float(self._cutoffs)
+
+    @property
+    def SQUARE_PRIORITIES(self):
+        """getter method for self._SQUARE_PRIORITIES"""
+        return self._SQUARE_PRIORITIES
+
+    def killers(self, ply):
+        """
+        Function -- killers
+            Returns the killer moves of a ply
+        Parameters:
+            ply: int, the number of moves from the root of the search
+        Returns:
+            killers: list[int], the killer moves, most recent first
+        """
+        return self._killers[ply]
+
+    def _generate_square_priorities(self, board_corners):
+        """
+        Function -- _generate_square_priorities
+            Creates the static priority of each square: corners, then edges,
+            then inner squares, then the squares surrounding each corner. The
+            squares surrounding the corners are taken from the GameBoard's
+            BoardCorners when they are given.
+        Parameters:
+            board_corners: Optional[list[BoardCorner]], the corners of the
+                game board and their x_squares
+        Returns:
+            square_priorities: list[int], the priority of each bit index
+        """
+        bitboard = Bitboard(self._size)
+        max_index = self._size - 1
+        square_priorities = [self.INNER_PRIORITY] * (self._size * self._size)
+
+        for y_index in range(self._size):
+            for x_index in range(self._size):
+                if x_index in (0, max_index) or y_index in (0, max_index):
+                    square_priorities[bitboard.index(x_index, y_index)] = (
+                        self.EDGE_PRIORITY)
+
+        if board_corners:
+            corners = [(board_corner.corner_square.x_index,
+                        board_corner.corner_square.y_index,
+                        board_corner.x_squares)
+                       for board_corner in board_corners]
+        else:
+            corners = []
+            for x_index, y_index, x_dir, y_dir in (
+                    (0, 0, 1, 1),
+                    (max_index, 0, -1, 1),
+                    (0, max_index, 1, -1),
+                    (max_index, max_index, -1, -1)):
+                corners.append((x_index, y_index, (
+                    (x_index + x_dir, y_index),
+                    (x_index + x_dir, y_index + y_dir),
+                    (x_index, y_index + y_dir))))
+
+        if self._size < 2:
+            return square_priorities
+
+        for x_index, y_index, x_squares in corners:
+            for x_square_x, x_square_y in x_squares:
+                square_priorities[bitboard.index(x_square_x, x_square_y)] = (
+                    self.X_SQUARE_PRIORITY)
+        for x_index, y_index, x_squares in corners:
+            square_priorities[bitboard.index(x_index, y_index)] = (
+                self.CORNER_PRIORITY)
+
+        return square_priorities
+
+    def new_search(self):
+        """
+        Function -- new_search
+            Prepares for a new search: clears the killer moves and cutoff
+            counters and halves the history scores, so that history from
+            earlier moves of the game still counts but fades out
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        for killers in self._killers:
+            killers[:] = [self.NO_MOVE] * self.KILLER_SLOTS
+        for scores in self._history.values():
+            scores[:] = [score >> 1 for score in scores]
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+
+    def order_moves(self, moves, hash_move, ply, color):
+        """
+        Function -- order_moves
+            Returns the legal moves of a position in search order: the hash
+            move, then the killer moves of the ply, then the remaining moves
+            by history score and static square priority
+        Parameters:
+            moves: int, bitmask of the legal moves of the position
+            hash_move: int, the bit index of the transposition table's best
+                move for the position, or NO_MOVE
+            ply: int, the number of moves from the root of the search
+            color: str, the color of the player to move
+        Returns:
+            ordered_moves: list[int], bit indices of the moves in search order
+        """
+        ordered_moves = []
+        if hash_move != self.NO_MOVE and (moves >> hash_move) & 1:
+            ordered_moves.append(hash_move)
+            moves ^= 1 << hash_move
+
+        for killer in self._killers[ply]:
+            if killer != self.NO_MOVE and (moves >> killer) & 1:
+                ordered_moves.append(killer)
+                moves ^= 1 << killer
+
+        history = self._history[color]
+        priorities = self._SQUARE_PRIORITIES
+        ordered_moves.extend(sorted(
+            Bitboard.yield_indices(moves),
+            key=lambda index: (history[index], priorities[index]),
+            reverse=True))
+        return ordered_moves
+
+    def record_cutoff(self, index, ply, depth, color, move_number):
+        """
+        Function -- record_cutoff
+            Updates the killer moves of the ply and the history score of the
+            move after it caused a cutoff. Deeper cutoffs raise the history
+            score more, since they prune larger subtrees.
+        Parameters:
+            index: int, the bit index of the move that caused the cutoff
+            ply: int, the number of moves from the root of the search
+            depth: int, the number of plies that were left to search
+            color: str, the color of the player who made the move
+            move_number: int, the position of the move in the search order,
+                starting at 0
+        Returns:
+            None
+        """
+        self._cutoffs += 1
+        if not move_number:
+            self._first_move_cutoffs += 1
+
+        killers = self._killers[ply]
+        if killers[0] != index:
+            killers[1:] = killers[:-1]
+            killers[0] = index
+
+        self._history[color][index] += depth * depth
@@ -0,0 +1,69 @@
+from game_board import GameBoard
+from move_ordering import MoveOrdering
+
+
+def test_constructor():
+    mo: MoveOrdering = MoveOrdering(8)
+    assert isinstance(mo, MoveOrdering)
+    assert mo.size == 8
+    assert mo.cutoffs == 0
+    assert mo.first_move_cutoff_rate == 0.0
+    assert mo.killers(3) == [MoveOrdering.NO_MOVE, MoveOrdering.NO_MOVE]
+    assert mo.history["black"] == [0] * 64
+
+
+def test__generate_square_priorities():
+    mo: MoveOrdering = MoveOrdering(8)
+    priorities = mo.SQUARE_PRIORITIES
+    assert priorities[0] == MoveOrdering.CORNER_PRIORITY
+    assert priorities[63] == MoveOrdering.CORNER_PRIORITY
+    assert priorities[3] == MoveOrdering.EDGE_PRIORITY
+    assert priorities[27] == MoveOrdering.INNER_PRIORITY
+    for index in (1, 8, 9, 6, 14, 15, 48, 49, 57, 54, 55, 62):
+        assert priorities[index] == MoveOrdering.X_SQUARE_PRIORITY
+
+    # The GameBoard's BoardCorners give the same squares
+    gb: GameBoard = GameBoard(board_size=800)
+    assert MoveOrdering(8, gb.BOARD_CORNERS).SQUARE_PRIORITIES == priorities
+
+
+def test_order_moves():
+    mo: MoveOrdering = MoveOrdering(8)
+    moves = (1 << 0) | (1 << 9) | (1 << 20) | (1 << 3)
+
+    # Without history, moves follow the static square priorities
+    assert mo.order_moves(moves, MoveOrdering.NO_MOVE, 1, "black") == [
+        0, 3, 20, 9]
+
+    # The hash move comes first, then the killers of the ply
+    mo.record_cutoff(9, 1, 2, "black", 1)
+    assert mo.order_moves(moves, 20, 1, "black") == [20, 9, 0, 3]
+
+    # Killers only apply to their own ply; history applies everywhere
+    mo.record_cutoff(3, 2, 4, "black", 0)
+    assert mo.order_moves(moves, MoveOrdering.NO_MOVE, 5, "black") == [
+        3, 9, 0, 20]
+    assert mo.order_moves(moves, MoveOrdering.NO_MOVE, 5, "white") == [
+        0, 3, 20, 9]
+
+
+def test_record_cutoff():
+    mo: MoveOrdering = MoveOrdering(8)
+    mo.record_cutoff(10, 2, 3, "white", 0)
+    mo.record_cutoff(11, 2, 2, "white", 2)
+    mo.record_cutoff(11, 2, 2, "white", 0)
+    assert mo.killers(2) == [11, 10]
+    assert mo.history["white"][10] == 9
+    assert mo.history["white"][11] == 8
+    assert mo.cutoffs == 3
+    assert mo.first_move_cutoffs == 2
+    assert mo.first_move_cutoff_rate == 2 / 3.0
+
+
+def test_new_search():
+    mo: MoveOrdering = MoveOrdering(8)
+    mo.record_cutoff(10, 2, 3, "white", 0)
+    mo.new_search()
+    assert mo.killers(2) == [MoveOrdering.NO_MOVE, MoveOrdering.NO_MOVE]
+    assert mo.history["white"][10] == 4
+    assert mo.cutoffs == 0
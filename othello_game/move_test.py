@@ -0,0 +1,30 @@
+from move import Move
+
+
+def test_constructor():
+    m: Move = Move(19, (1 << 27) | (1 << 35), "black")
+    assert isinstance(m, Move)
+    assert m.index == 19
+    assert m.flip_mask == (1 << 27) | (1 << 35)
+    assert m.color == "black"
+    assert not hasattr(m, "__dict__")
+
+    m = Move(0, 0)
+    assert m.color is None
+
+
+def test_total_flips():
+    assert Move(19, (1 << 27) | (1 << 35), "black").total_flips == 2
+    assert Move(19, 0, "black").total_flips == 0
+
+
+def test_yield_flip_indices():
+    m: Move = Move(19, (1 << 35) | (1 << 27), "black")
+    assert list(m.yield_flip_indices()) == [27, 35]
+
+
+def test_equality():
+    assert Move(19, 1 << 27, "black") == Move(19, 1 << 27, "black")
+    assert Move(19, 1 << 27, "black") != Move(19, 1 << 27, "white")
+    assert Move(19, 1 << 27, "black") != Move(19, 1 << 28, "black")
+    assert len({Move(19, 1 << 27), Move(19, 1 << 27)}) == 1
@@ -0,0 +1,403 @@
+from bitboard import Bitboard
+from position import Position
+from search_engine import SearchEngine
+from zobrist import Zobrist
+
+import argparse
+import random
+import struct
+import sys
+
+try:
+    import mmap
+except ImportError:
+    # Jython, which runs the Processing sketch, has no mmap
+    mmap = None
+
+
+class OpeningBook:
+    """
+    Purpose:
+    The OpeningBook class gives the hard AI its moves in the opening without
+    searching. The book is a binary file: a header followed by fixed-size
+    (position hash, move, score, count) records sorted by hash. The file is
+    memory-mapped rather than read, so opening a book costs the same however
+    large it is, and a position's records are found by binary search on
+    the mapped bytes; only the pages touched by a lookup are ever read from
+    disk. Where mmap is not available, the file is read into memory.
+
+    Positions are stored in a canonical form: of the eight rotations and
+    reflections of the board, the one with the smallest black and white
+    bitmasks. A lookup canonicalizes the position, finds its records by the
+    Zobrist hash of the canonical form and maps the book's moves back onto
+    the board, so a book built from one orientation of an opening also
+    covers the other seven.
+
+    The book move is chosen among the moves scoring within randomness of the
+    best, weighted by how many lines of the opening play them. A randomness
+    of 0 always plays the best move.
+
+    Methods:
+    _generate_symmetries: creates the square mapping of each symmetry of a
+        board size
+    _transform: maps the tiles of a bitmask onto a symmetry
+    canonicalize: returns the canonical form of a position
+    _read_hash: reads the position hash of a record
+    _lower_bound: finds the first record of a position hash
+    probe: returns the book moves of a position
+    select_move: chooses a book move for a position
+    close: unmaps the book file
+    write: writes book records to a file
+    build: builds a book by searching every move of the opening positions
+
+    Attributes:
+    _path: str, the book file
+    _mmap: mmap, the memory-mapped book file, or its bytes without mmap
+    _size: int, the number of squares along one side of the book's board
+    _num_records: int, the number of records in the book
+    _randomness: int, the score below the best move's at which book moves
+        are still played
+    _zobrist: Zobrist, the keys used to hash the canonical positions
+    """
+
+    MAGIC = b"OTHBOOK1"
+    # Magic, board size and number of records
+    HEADER = struct.Struct("<8sII")
+    # Position hash, move, score and count
+    RECORD = struct.Struct("<QHiH")
+    HASH = struct.Struct("<Q")
+    MAX_COUNT = 0xFFFF
+
+    # Square mappings depend only on the board size, so they are shared by
+    # all books of the same size
+    _SYMMETRY_CACHE = {}
+
+    def __init__(self, path, randomness=0):
+        self._path = path
+        with open(path, "rb") as f:
+            if mmap is None:
+                self._mmap = f.read()
+            else:
+                self._mmap = mmap.mmap(f.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+        magic, self._size, self._num_records = self.HEADER.unpack_from(
+            self._mmap, 0)
+        if magic != self.MAGIC or len(self._mmap) != (
+                self.HEADER.size + self._num_records * self.RECORD.size):
+            self.close()
+            raise ValueError(str(path) + " is not an opening book")
+        self._randomness = randomness
+        self._zobrist = Zobrist(self._size)
+
+    @property
+    def path(self):
+        """getter method for self._path"""
+        return self._path
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    @property
+    def num_records(self):
+        """getter method for self._num_records"""
+        return self._num_records
+
+    @property
+    def randomness(self):
+        """getter method for self._randomness"""
+        return self._randomness
+
+    @randomness.setter
+    def randomness(self, randomness):
+        """setter method for self._randomness"""
+        self._randomness = randomness
+
+    @classmethod
+    def _generate_symmetries(cls, size):
+        """
+        Function -- _generate_symmetries
+            Creates the square mapping of each of the eight rotations and
+            reflections of a board, the identity first
+        Parameters:
+            size: int, the number of squares along one side of the board
+        Returns:
+            symmetries: list[tuple[list[int], list[int]]], for each symmetry,
+                the square each square is mapped onto and the inverse mapping
+        """
+        if size in cls._SYMMETRY_CACHE:
+            return cls._SYMMETRY_CACHE[size]
+
+        last = size - 1
+        transforms = [
+            lambda x, y: (x, y),
+            lambda x, y: (last - x, y),
+            lambda x, y: (x, last - y),
+            lambda x, y: (last - x, last - y),
+            lambda x, y: (y, x),
+            lambda x, y: (last - y, x),
+            lambda x, y: (y, last - x),
+            lambda x, y: (last - y, last - x),
+        ]
+        symmetries = []
+        for transform in transforms:
+            mapping = [0] * (size * size)
+            inverse = [0] * (size * size)
+            for index in range(size * size):
+                x, y = transform(index % size, index // size)
+                mapping[index] = y * size + x
+                inverse[y * size + x] = index
+            symmetries.append((mapping, inverse))
+
+        cls._SYMMETRY_CACHE[size] = symmetries
+        return symmetries
+
+    @staticmethod
+    def _transform(mask, mapping):
+        """
+        Function -- _transform
+            Maps the tiles of a bitmask onto the squares of a symmetry
+        Parameters:
+            mask: int, a bitmask of board squares
+            mapping: list[int], the square each square is mapped onto
+        Returns:
+            mask: int, the mapped bitmask
+        """
+        transformed = 0
+        for index in Bitboard.yield_indices(mask):
+            transformed |= 1 << mapping[index]
+        return transformed
+
+    @classmethod
+    def canonicalize(cls, size, black, white):
+        """
+        Function -- canonicalize
+            Returns the canonical form of a position: of its eight rotations
+            and reflections, the one with the smallest black bitmask, then
+            the smallest white bitmask
+        Parameters:
+            size: int, the number of squares along one side of the board
+            black: int, bitmask of the black tiles
+            white: int, bitmask of the white tiles
+        Returns:
+            canonical: tuple[int, int, int], the black and white bitmasks of
+                the canonical form and the number of the symmetry that maps
+                the position onto it
+        """
+        best = None
+        for number, (mapping, _) in enumerate(
+                cls._generate_symmetries(size)):
+            candidate = (cls._transform(black, mapping),
+                         cls._transform(white, mapping),
+                         number)
+            if best is None or candidate[:2] < best[:2]:
+                best = candidate
+        return best
+
+    def _read_hash(self, record_number):
+        """
+        Function -- _read_hash
+            Reads the position hash of a record from the mapped file
+        Parameters:
+            record_number: int, the number of the record
+        Returns:
+            position_hash: int, the record's position hash
+        """
+        return self.HASH.unpack_from(
+            self._mmap,
+            self.HEADER.size + record_number * self.RECORD.size)[0]
+
+    def _lower_bound(self, position_hash):
+        """
+        Function -- _lower_bound
+            Binary searches the sorted records for the first record whose
+            position hash is not below the given one
+        Parameters:
+            position_hash: int, the position hash to find
+        Returns:
+            record_number: int, the number of that record, or the number of
+                records if every hash is below it
+        """
+        low, high = 0, self._num_records
+        while low < high:
+            middle = (low + high) // 2
+            if self._read_hash(middle) < position_hash:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def probe(self, bitboard, color):
+        """
+        Function -- probe
+            Looks up the book moves of a position. Moves that are not legal
+            in the position, as after a hash collision, are left out.
+        Parameters:
+            bitboard: Bitboard, the tiles of the position
+            color: str, the color of the player to move
+        Returns:
+            moves: list[tuple[int, int, int]], the bit index on the board,
+                score and count of each book move, in the book's order
+        """
+        if bitboard.size != self._size:
+            return []
+
+        black, white, number = self.canonicalize(
+            self._size, bitboard.black, bitboard.white)
+        position_hash = self._zobrist.calculate_hash(black, white, color)
+        inverse = self._generate_symmetries(self._size)[number][1]
+        legal_mask = bitboard.calculate_move_mask(color)
+
+        moves = []
+        record_number = self._lower_bound(position_hash)
+        while record_number < self._num_records:
+            record_hash, move, score, count = self.RECORD.unpack_from(
+                self._mmap,
+                self.HEADER.size + record_number * self.RECORD.size)
+            if record_hash != position_hash:
+                break
+            index = inverse[move]
+            if (legal_mask >> index) & 1:
+                moves.append((index, score, count))
+            record_number += 1
+        return moves
+
+    def select_move(self, bitboard, color):
+        """
+        Function -- select_move
+            Chooses a book move for a position among the moves scoring within
+            randomness of the best book move, at random in proportion to
+            their counts. With a randomness of 0, the best move is played,
+            the one with the highest count among equal scores.
+        Parameters:
+            bitboard: Bitboard, the tiles of the position
+            color: str, the color of the player to move
+        Returns:
+            index: Optional[int], the bit index of the book move, or None if
+                the position is not in the book
+        """
+        moves = self.probe(bitboard, color)
+        if not moves:
+            return None
+
+        best_score = max(score for _, score, _ in moves)
+        candidates = [(index, count) for index, score, count in moves
+                      if score >= best_score - self._randomness]
+        if not self._randomness:
+            return max(candidates, key=lambda move: (move[1], -move[0]))[0]
+
+        # Picked by hand rather than with random.choices, which Python 2.7,
+        # and so Jython, does not have
+        weights = [max(count, 1) for _, count in candidates]
+        pick = random.randrange(sum(weights))
+        for (index, _), weight in zip(candidates, weights):
+            if pick < weight:
+                return index
+            pick -= weight
+
+    def close(self):
+        """
+        Function -- close
+            Unmaps the book file
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        if mmap is not None:
+            self._mmap.close()
+
+    @classmethod
+    def write(cls, path, size, records):
+        """
+        Function -- write
+            Writes book records to a file, sorted by position hash and move
+        Parameters:
+            path: str, the file to write
+            size: int, the number of squares along one side of the board
+            records: list[tuple[int, int, int, int]], the position hash of
+                the canonical form, move on the canonical form, score and
+                count of each record
+        Returns:
+            None
+        """
+        with open(path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, size, len(records)))
+            for position_hash, move, score, count in sorted(records):
+                f.write(cls.RECORD.pack(position_hash, move, score,
+                                        min(count, cls.MAX_COUNT)))
+
+    @classmethod
+    def build(cls, path, size=8, plies=6, depth=6):
+        """
+        Function -- build
+            Builds a book covering the first plies moves of the game: every
+            position reachable from the start position in fewer moves is
+            expanded, once per canonical form, and each of its legal moves
+            is scored by a search of depth plies. The count of a move is the
+            number of move orders that reach its position, in any
+            orientation of the board.
+        Parameters:
+            path: str, the file to write
+            size: int, the number of squares along one side of the board
+            plies: int, the number of moves of the game the book covers
+            depth: int, the depth each book move is searched to
+        Returns:
+            num_records: int, the number of records written
+        """
+        engine = SearchEngine(size, max_depth=depth)
+        zobrist = Zobrist(size)
+        start = Position(size).bitboard
+
+        level = {cls.canonicalize(size, start.black, start.white)[:2] +
+                 ("black",): 1}
+        records = []
+        for _ in range(plies):
+            next_level = {}
+            for (black, white, color), count in sorted(level.items()):
+                bitboard = Bitboard(size, black, white)
+                position_hash = zobrist.calculate_hash(black, white, color)
+                opponent = "white" if color == "black" else "black"
+                for index, flips in bitboard.calculate_legal_moves(color):
+                    score = engine.search(bitboard, color, depth,
+                                          root_moves=[index])[1]
+                    records.append((position_hash, index, score, count))
+
+                    child = Bitboard(size, black, white)
+                    child.make_move(color, index, flips)
+                    child_key = cls.canonicalize(
+                        size, child.black, child.white)[:2] + (opponent,)
+                    next_level[child_key] = (next_level.get(child_key, 0) +
+                                             count)
+            level = next_level
+
+        cls.write(path, size, records)
+        return len(records)
+
+
+def main(argv=None):
+    """
+    Function -- main
+        Command-line entry point: builds an opening book file
+    Parameters:
+        argv: Optional[list[str]], the command-line arguments
+    Returns:
+        status: int, 0 on success
+    """
+    parser = argparse.ArgumentParser(
+        description="Build an Othello opening book")
+    parser.add_argument("--output", default="opening_book.bin")
+    parser.add_argument("--size", type=int, default=8)
+    parser.add_argument("--plies", type=int, default=6)
+    parser.add_argument("--depth", type=int, default=6)
+    args = parser.parse_args(argv)
+
+    num_records = OpeningBook.build(args.output, args.size, args.plies,
+                                    args.depth)
+    print("Wrote " + str(num_records) + " records to " + args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+from bitboard import Bitboard
+from opening_book import OpeningBook, main
+from position import Position
+from zobrist import Zobrist
+
+import opening_book
+import pytest
+import random
+
+
+def write_start_book(path, scores, counts):
+    # A book of the start position's moves with the given scores and counts
+    position: Position = Position(8)
+    black, white, _ = OpeningBook.canonicalize(8, position.bitboard.black,
+                                               position.bitboard.white)
+    position_hash = Zobrist(8).calculate_hash(black, white, "black")
+    moves = sorted(Bitboard.yield_indices(
+        Bitboard(8, black, white).calculate_move_mask("black")))
+    OpeningBook.write(path, 8, [(position_hash, move, score, count)
+                                for move, score, count in zip(moves, scores,
+                                                              counts)])
+    return position
+
+
+def test_constructor(tmp_path):
+    path = str(tmp_path / "book.bin")
+    OpeningBook.write(path, 8, [])
+    book: OpeningBook = OpeningBook(path, randomness=3)
+    assert book.path == path
+    assert book.size == 8
+    assert book.num_records == 0
+    assert book.randomness == 3
+    assert book.probe(Position(8).bitboard, "black") == []
+    book.close()
+
+    with open(path, "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError):
+        OpeningBook(path)
+
+
+def test_canonicalize():
+    position: Position = Position(8)
+    position.apply_move(position.legal_moves()[0])
+    position.apply_move(position.legal_moves()[0])
+    black, white = position.bitboard.black, position.bitboard.white
+
+    canonical = OpeningBook.canonicalize(8, black, white)
+    symmetries = OpeningBook._generate_symmetries(8)
+    mapping, inverse = symmetries[canonical[2]]
+    assert OpeningBook._transform(black, mapping) == canonical[0]
+    assert OpeningBook._transform(canonical[0], inverse) == black
+    # Every rotation and reflection has the same canonical form
+    for mapping, _ in symmetries:
+        assert OpeningBook.canonicalize(
+            8, OpeningBook._transform(black, mapping),
+            OpeningBook._transform(white, mapping))[:2] == canonical[:2]
+
+
+def test_probe(tmp_path):
+    path = str(tmp_path / "book.bin")
+    position = write_start_book(path, [5, 3, 5, 1], [1, 2, 3, 4])
+    book: OpeningBook = OpeningBook(path)
+    moves = book.probe(position.bitboard, "black")
+    assert sorted(score for _, score, _ in moves) == [1, 3, 5, 5]
+    assert sorted(index for index, _, _ in moves) == sorted(
+        Bitboard.yield_indices(position.bitboard.calculate_move_mask(
+            "black")))
+    # The position with the other side to move is not in the book
+    assert book.probe(position.bitboard, "white") == []
+    assert book.probe(Position(4).bitboard, "black") == []
+    book.close()
+
+
+def test_without_mmap(tmp_path, monkeypatch):
+    path = str(tmp_path / "book.bin")
+    position = write_start_book(path, [5, 3, 5, 1], [1, 2, 3, 4])
+    # Without mmap, as on Jython, the book is read into memory
+    monkeypatch.setattr(opening_book, "mmap", None)
+    book: OpeningBook = OpeningBook(path)
+    assert book.num_records == 4
+    assert len(book.probe(position.bitboard, "black")) == 4
+    book.close()
+
+
+def test_select_move(tmp_path):
+    path = str(tmp_path / "book.bin")
+    position = write_start_book(path, [5, 3, 5, 1], [1, 2, 3, 4])
+    book: OpeningBook = OpeningBook(path)
+    moves = {(score, count): index for index, score, count in book.probe(
+        position.bitboard, "black")}
+    # Without randomness, the best score with the highest count is played
+    assert book.select_move(position.bitboard, "black") == moves[(5, 3)]
+
+    book.randomness = 2
+    random.seed(7)
+    selected = {book.select_move(position.bitboard, "black")
+                for _ in range(100)}
+    assert selected == {moves[(5, 1)], moves[(5, 3)], moves[(3, 2)]}
+    assert book.select_move(Position(8).bitboard, "white") is None
+    book.close()
+
+
+def test_build(tmp_path):
+    path = str(tmp_path / "book.bin")
+    # The start position's 4 moves, then the 3 replies to the only
+    # canonical position after them
+    assert OpeningBook.build(path, size=8, plies=2, depth=1) == 7
+    book: OpeningBook = OpeningBook(path)
+    assert book.num_records == 7
+
+    start: Position = Position(8)
+    for move in start.legal_moves():
+        position = start.copy()
+        position.apply_move(move)
+        moves = book.probe(position.bitboard, "white")
+        assert sorted(index for index, _, _ in moves) == sorted(
+            Bitboard.yield_indices(position.bitboard.calculate_move_mask(
+                "white")))
+        assert all(count == 4 for _, _, count in moves)
+    book.close()
+
+
+def test_main(tmp_path, capsys):
+    path = str(tmp_path / "book.bin")
+    assert main(["--output", path, "--plies", "1", "--depth", "1"]) == 0
+    assert "Wrote 4 records" in capsys.readouterr().out
+    assert OpeningBook(path).num_records == 4
@@ -0,0 +1,236 @@
+from bitboard import Bitboard
+from search_engine import SearchEngine
+from search_stats import SearchStats
+
+import time
+
+
+# Search engines kept by each worker process between tasks, by board size, so
+# that a worker's transposition table survives from one move to the next, and
+# the event that stops the worker's searches, if the pool was given one
+_WORKER_STATE = {"engines": {}, "stop_event": None}
+
+
+def _attach_stop_event(stop_event):
+    """
+    Function -- _attach_stop_event
+        Runs once in each worker process: keeps the event that stops the
+        worker's searches once set
+    Parameters:
+        stop_event: Optional[Event], the shared stop event
+    Returns:
+        None
+    """
+    _WORKER_STATE["stop_event"] = stop_event
+
+
+def _search_root_moves(position, root_moves, depth, time_budget_ms,
+                       table_size_mb):
+    """
+    Function -- _search_root_moves
+        Runs in a worker process: searches a share of the root legal moves of
+        a position with the worker's own SearchEngine
+    Parameters:
+        position: tuple[int, int, int, str], the board size, black bitmask,
+            white bitmask and color of the player to move
+        root_moves: list[int], bit indices of the root moves to search
+        depth: Optional[int], the maximum number of plies to search
+        time_budget_ms: Optional[int], the wall-clock time (ms) the search
+            may use
+        table_size_mb: float, the size of the worker's transposition table
+    Returns:
+        worker_result: tuple[list[tuple[int, int, int]], SearchStats], the
+            depth, best move and score of every depth the worker completed,
+            and the stats of the worker's search
+    """
+    size, black, white, color = position
+
+    engine = _WORKER_STATE["engines"].get(size)
+    if engine is None:
+        engine = SearchEngine(size, table_size_mb=table_size_mb)
+        _WORKER_STATE["engines"][size] = engine
+    engine.stop_event = _WORKER_STATE["stop_event"]
+
+    engine.search(Bitboard(size, black, white), color, depth, time_budget_ms,
+                  root_moves)
+    return engine.iteration_results, engine.stats
+
+
+class ParallelSearch:
+    """
+    Purpose:
+    The ParallelSearch class spreads the hard AI's search across several
+    processes by splitting the root legal moves between them. Each worker
+    runs the same iterative deepening search as SearchEngine on its share of
+    the moves, and the best move is taken from the deepest depth that every
+    worker completed. Positions are sent to workers as a tuple of the board
+    size, the two tile bitmasks and the side to move rather than as pickled
+    GameBoard objects. A stop event set before the first search is handed to
+    every worker, whose searches stop once it is set.
+
+    Methods:
+    search: returns the best move and its score for a given position
+    _split_moves: deals the root legal moves out between the workers
+    shutdown: stops the worker processes
+
+    Attributes:
+    _size: int, the number of squares along one side of the board
+    _workers: int, the number of worker processes
+    _max_depth: int, the default number of plies searched
+    _table_size_mb: float, the size of each worker's transposition table
+    _bitboard: Bitboard, move generator for boards of the given size
+    _executor: Optional[ProcessPoolExecutor], the pool of worker processes,
+        started by the first search
+    _stop_event: Optional[Event], stops the workers' searches once set,
+        such as when another process cancels the search
+    _depth_reached: int, the deepest depth every worker completed in the
+        last search
+    _stats: Optional[SearchStats], the combined stats of the workers in the
+        last search
+    """
+
+    def __init__(self, size, workers=4, max_depth=6, table_size_mb=4):
+        self._size = size
+        self._workers = workers
+        self._max_depth = max_depth
+        self._table_size_mb = table_size_mb
+        self._bitboard = Bitboard(size)
+        self._executor = None
+        self._stop_event = None
+        self._depth_reached = 0
+        self._stats = None
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    @property
+    def workers(self):
+        """getter method for self._workers"""
+        return self._workers
+
+    @property
+    def max_depth(self):
+        """getter method for self._max_depth"""
+        return self._max_depth
+
+    @property
+    def stop_event(self):
+        """getter method for self._stop_event"""
+        return self._stop_event
+
+    @stop_event.setter
+    def stop_event(self, stop_event):
+        """setter method for self._stop_event, handed to the workers when
+        the first search starts them"""
+        self._stop_event = stop_event
+
+    @property
+    def depth_reached(self):
+        """getter method for self._depth_reached"""
+        return self._depth_reached
+
+    @property
+    def stats(self):
+        """getter method for self._stats"""
+        return self._stats
+
+    def search(self, bitboard, color, depth=None, time_budget_ms=None):
+        """
+        Function -- search
+            Searches the position on the given bitboard for the player of the
+            given color by searching a share of the root legal moves in each
+            worker process. Scores from different depths are not comparable,
+            so the best move is chosen among the workers' results for the
+            deepest depth all of them completed. A search stopped before
+            every worker completed a depth returns the first legal move,
+            without a score.
+        Parameters:
+            bitboard: Bitboard, the tiles of the position to search
+            color: str, the color of the player to move
+            depth: Optional[int], the maximum number of plies to search,
+                defaults to max_depth without a time budget
+            time_budget_ms: Optional[int], the wall-clock time (ms) the search
+                may use
+        Returns:
+            best_move: tuple[Optional[int], Optional[int]], the bit index of
+                the best move and its score, or (None, None) if the player has
+                no legal move
+        """
+        start_time = time.time()
+        if depth is None and time_budget_ms is None:
+            depth = self._max_depth
+
+        own = bitboard.tiles(color)
+        opponent = bitboard.black if color == "white" else bitboard.white
+        moves = list(Bitboard.yield_indices(
+            self._bitboard.generate_moves(own, opponent)))
+        self._depth_reached = 0
+        self._stats = SearchStats(nodes=1)
+        if not moves:
+            return None, None
+
+        if self._executor is None:
+            # Imported here so the module loads where there are no processes
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                initializer=_attach_stop_event,
+                initargs=(self._stop_event,))
+
+        position = (self._size, bitboard.black, bitboard.white, color)
+        futures = [
+            self._executor.submit(_search_root_moves,
+                                  position,
+                                  root_moves,
+                                  depth,
+                                  time_budget_ms,
+                                  self._table_size_mb)
+            for root_moves in self._split_moves(moves)
+        ]
+        worker_results = [future.result() for future in futures]
+
+        self._depth_reached = min(results[-1][0] if results else 0
+                                  for results, stats in worker_results)
+        self._stats = SearchStats.combine(
+            [stats for results, stats in worker_results],
+            self._depth_reached,
+            time.time() - start_time)
+        best_index, best_score = None, None
+        for results, stats in worker_results:
+            for result_depth, index, score in results:
+                if result_depth == self._depth_reached and (
+                        best_score is None or score > best_score):
+                    best_index, best_score = index, score
+
+        if best_index is None:
+            return moves[0], None
+        return best_index, best_score
+
+    def _split_moves(self, moves):
+        """
+        Function -- _split_moves
+            Deals the root legal moves out between the workers round-robin so
+            that each worker gets a similar number of moves
+        Parameters:
+            moves: list[int], bit indices of the root legal moves
+        Returns:
+            shares: list[list[int]], one non-empty list of moves per worker
+        """
+        shares = [moves[worker::self._workers]
+                  for worker in range(self._workers)]
+        return [share for share in shares if share]
+
+    def shutdown(self):
+        """
+        Function -- shutdown
+            Stops the worker processes. The next search starts a new pool.
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
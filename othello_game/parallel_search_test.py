@@ -0,0 +1,85 @@
+from bitboard import Bitboard
+from game_board import GameBoard
+from parallel_search import ParallelSearch, _search_root_moves
+from search_engine import SearchEngine
+
+import multiprocessing
+import random
+
+
+def midgame_position(seed, plies):
+    random.seed(seed)
+    bb: Bitboard = GameBoard(board_size=800).bitboard
+    color = "black"
+    for _ in range(plies):
+        moves = bb.calculate_legal_moves(color)
+        if moves:
+            index, flips = random.choice(moves)
+            bb.make_move(color, index, flips)
+        color = "white" if color == "black" else "black"
+    return bb, color
+
+
+def test_constructor():
+    ps: ParallelSearch = ParallelSearch(8, workers=3)
+    assert isinstance(ps, ParallelSearch)
+    assert ps.size == 8
+    assert ps.workers == 3
+    assert ps.max_depth == 6
+    assert ps.depth_reached == 0
+
+
+def test__split_moves():
+    ps: ParallelSearch = ParallelSearch(8, workers=3)
+    assert ps._split_moves([1, 2, 3, 4, 5]) == [[1, 4], [2, 5], [3]]
+    # Workers without a move are left out
+    assert ps._split_moves([1]) == [[1]]
+
+
+def test__search_root_moves():
+    bb, color = midgame_position(3, 16)
+    moves = list(Bitboard.yield_indices(bb.calculate_move_mask(color)))
+    results, stats = _search_root_moves((8, bb.black, bb.white, color),
+                                        moves[:2], 3, None, 0)
+    assert [result[0] for result in results] == [1, 2, 3]
+    assert results[-1][1] in moves[:2]
+    assert stats.depth_reached == 3
+    assert stats.nodes > 1
+
+
+def test_search():
+    bb, color = midgame_position(4, 18)
+    ps: ParallelSearch = ParallelSearch(8, workers=2, table_size_mb=0)
+    try:
+        index, score = ps.search(bb, color, depth=3)
+    finally:
+        ps.shutdown()
+    assert ps.depth_reached == 3
+    assert ps.stats.depth_reached == 3
+    assert ps.stats.nodes > 1
+
+    # Splitting the root moves finds the same score as a single process
+    se: SearchEngine = SearchEngine(8, table_size_mb=0)
+    serial_index, serial_score = se.search(bb, color, 3)
+    assert score == serial_score
+
+    # A player without legal moves has no best move
+    bb: Bitboard = Bitboard(8)
+    bb.place("black", 0, 0)
+    assert ps.search(bb, "white", depth=3) == (None, None)
+
+
+def test_stop_event():
+    bb, color = midgame_position(4, 18)
+    stop_event = multiprocessing.Event()
+    stop_event.set()
+    ps: ParallelSearch = ParallelSearch(8, workers=2, table_size_mb=0)
+    ps.stop_event = stop_event
+    assert ps.stop_event is stop_event
+    try:
+        # The workers stop at their first time check
+        index, score = ps.search(bb, color, depth=8)
+    finally:
+        ps.shutdown()
+    assert index in Bitboard.yield_indices(bb.calculate_move_mask(color))
+    assert ps.depth_reached < 8
@@ -0,0 +1,340 @@
+from game_board import GameBoard
+from position import Position
+
+import argparse
+import time
+
+
+class Perft:
+    """
+    Purpose:
+    The Perft class counts the leaf nodes of the game tree to a fixed depth
+    (perft), to check and benchmark the move generators. A player with no
+    legal move passes, which counts as one ply; a position where neither
+    player can move is a leaf whatever the depth left. The counts are
+    compared with reference counts from the start position and from a set
+    of stored positions, and timed in nodes per second.
+
+    The differential mode walks the game tree on a GameBoard and, at every
+    node, runs two or more of its move generators side by side: the grid
+    scan of the BoardSquare object graph, the bitboard generator and the
+    incremental generator. It reports the first position where their moves
+    or flips differ, so that a faster generator can be landed safely.
+
+    Methods:
+    play_moves: replays a sequence of moves from the start position
+    count_nodes: counts the leaf nodes below a Position
+    count_board_nodes: counts the leaf nodes below a GameBoard with one of
+        its move generators
+    _generate_moves: runs one of the GameBoard's move generators
+    find_divergence: finds the first position where move generators differ
+    run: runs perft from the stored positions and checks the counts
+
+    Attributes:
+    _size: int, the number of squares along one side of the board
+    """
+
+    GRID = "grid"
+    BITBOARD = "bitboard"
+    INCREMENTAL = "incremental"
+    GENERATORS = (GRID, BITBOARD, INCREMENTAL)
+
+    # Stored positions as the moves played from the start position (None for
+    # a pass), with their reference leaf counts from depth 0 upward
+    STORED_POSITIONS = {
+        "start": (),
+        "diagonal": (19, 18, 17),
+        "parallel": (19, 20, 21),
+        "midgame": (44, 45, 46, 43, 42, 54, 62, 41, 26, 63, 53, 20),
+        # 10 empty squares; white passes 2 plies from here
+        "endgame": (26, 18, 10, 29, 45, 43, 51, 54, 21, 9, 8, 0, 44, 25, 17,
+                    2, 3, 34, 1, 37, 16, 33, 30, 13, 42, 31, 40, 19, 14, 12,
+                    20, 52, 63, 46, 5, 32, 53, 24, 38, 39, 41, 22, 15, 23,
+                    47, 58, 50, 61, 60, 55),
+    }
+    REFERENCE_COUNTS = {
+        "start": (1, 4, 12, 56, 244, 1396, 8200, 55092, 390216, 3005288),
+        "diagonal": (1, 6, 28, 163, 978, 6651, 47145),
+        "parallel": (1, 3, 16, 92, 638, 4505, 35024),
+        "midgame": (1, 9, 80, 696, 6590, 60251, 613502),
+        "endgame": (1, 2, 16, 43, 258, 730, 3069, 7350, 19057, 28916,
+                    33708),
+    }
+
+    def __init__(self, size=8):
+        self._size = size
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    def play_moves(self, moves, gb=None):
+        """
+        Function -- play_moves
+            Replays a sequence of moves from the start position, on a new
+            Position or on the given GameBoard
+        Parameters:
+            moves: tuple[Optional[int], ...], the bit index of each move, None
+                for a pass
+            gb: Optional[GameBoard], the game board to play the moves on
+        Returns:
+            position: Position or GameBoard, the position reached
+        """
+        if gb is not None:
+            color = "black"
+            for index in moves:
+                if index is not None:
+                    gb.apply_move([legal_move for legal_move
+                                   in gb._calculate_bitboard_moves(color)
+                                   if legal_move.square_index == index][0])
+                color = "white" if color == "black" else "black"
+            gb.side_to_move = color
+            return gb
+
+        position = Position(self._size)
+        for index in moves:
+            if index is None:
+                position.pass_turn()
+            else:
+                position.apply_move([move for move in position.legal_moves()
+                                     if move.index == index][0])
+        return position
+
+    def count_nodes(self, position, depth):
+        """
+        Function -- count_nodes
+            Counts the leaf nodes of the game tree below a Position to the
+            given depth, making and unmaking moves on the position
+        Parameters:
+            position: Position, the position to count from; it is left
+                unchanged
+            depth: int, the number of plies to count to
+        Returns:
+            nodes: int, the number of leaf nodes
+        """
+        if depth == 0:
+            return 1
+
+        legal_moves = position.legal_moves()
+        if not legal_moves:
+            opponent = ("white" if position.side_to_move == "black"
+                        else "black")
+            if not position.has_legal_move(opponent):
+                return 1
+            position.pass_turn()
+            nodes = self.count_nodes(position, depth - 1)
+            position.undo_move()
+            return nodes
+
+        if depth == 1:
+            return len(legal_moves)
+
+        nodes = 0
+        for move in legal_moves:
+            position.apply_move(move)
+            nodes += self.count_nodes(position, depth - 1)
+            position.undo_move()
+        return nodes
+
+    def _generate_moves(self, gb, color, generator):
+        """
+        Function -- _generate_moves
+            Runs one of the GameBoard's move generators for a player
+        Parameters:
+            gb: GameBoard, the game board to generate moves on
+            color: str, the color of the player to move
+            generator: str, GRID, BITBOARD or INCREMENTAL
+        Returns:
+            legal_moves: list[LegalMove], the legal moves of the player
+        """
+        if generator == self.GRID:
+            return gb._calculate_tile_flips(color)
+        elif generator == self.BITBOARD:
+            return gb._calculate_bitboard_moves(color)
+        elif generator == self.INCREMENTAL:
+            return gb._update_legal_moves(color)
+        raise ValueError("Unknown move generator: " + str(generator))
+
+    def count_board_nodes(self, gb, color, depth, generator=BITBOARD):
+        """
+        Function -- count_board_nodes
+            Counts the leaf nodes of the game tree below a GameBoard to the
+            given depth, generating moves with one of the GameBoard's move
+            generators and making and unmaking them with apply_move and
+            undo_move
+        Parameters:
+            gb: GameBoard, the game board to count from; it is left unchanged
+            color: str, the color of the player to move
+            depth: int, the number of plies to count to
+            generator: str, GRID, BITBOARD or INCREMENTAL
+        Returns:
+            nodes: int, the number of leaf nodes
+        """
+        if depth == 0:
+            return 1
+
+        opponent = "white" if color == "black" else "black"
+        legal_moves = self._generate_moves(gb, color, generator)
+        if not legal_moves:
+            if not self._generate_moves(gb, opponent, generator):
+                return 1
+            return self.count_board_nodes(gb, opponent, depth - 1,
+                                          generator)
+
+        if depth == 1:
+            return len(legal_moves)
+
+        nodes = 0
+        for legal_move in legal_moves:
+            gb.apply_move(legal_move, color)
+            nodes += self.count_board_nodes(gb, opponent, depth - 1,
+                                            generator)
+            gb.undo_move()
+        return nodes
+
+    def find_divergence(self, gb, color, depth, generators=GENERATORS,
+                        moves=()):
+        """
+        Function -- find_divergence
+            Walks the game tree below a GameBoard to the given depth and, at
+            every node, compares the moves and flips produced by each of the
+            given move generators with those of the first one
+        Parameters:
+            gb: GameBoard, the game board to walk from; it is left unchanged
+            color: str, the color of the player to move
+            depth: int, the number of plies to walk
+            generators: tuple[str, ...], the move generators to compare
+            moves: tuple[Optional[int], ...], the moves that led to this
+                node, reported with a divergence
+        Returns:
+            divergence: Optional[dict], the first diverging position: the
+                moves leading to it, its black and white bitmasks, the color
+                to move and the (index, flip mask) pairs of each generator;
+                or None if every generator agreed everywhere
+        """
+        results = {}
+        for generator in generators:
+            results[generator] = sorted(
+                (legal_move.square_index, legal_move.flip_mask)
+                for legal_move in self._generate_moves(gb, color, generator))
+
+        expected = results[generators[0]]
+        if any(results[generator] != expected for generator in generators):
+            return {
+                "moves": moves,
+                "black": gb.bitboard.black,
+                "white": gb.bitboard.white,
+                "color": color,
+                "generators": results,
+            }
+
+        if depth == 0:
+            return None
+
+        opponent = "white" if color == "black" else "black"
+        legal_moves = self._generate_moves(gb, color, self.BITBOARD)
+        if not legal_moves:
+            if not self._generate_moves(gb, opponent, self.BITBOARD):
+                return None
+            return self.find_divergence(gb, opponent, depth - 1, generators,
+                                        moves + (None,))
+
+        for legal_move in legal_moves:
+            gb.apply_move(legal_move, color)
+            divergence = self.find_divergence(
+                gb, opponent, depth - 1, generators,
+                moves + (legal_move.square_index,))
+            gb.undo_move()
+            if divergence is not None:
+                return divergence
+        return None
+
+    def run(self, depth, names=None):
+        """
+        Function -- run
+            Runs perft from each stored position to the given depth, timing
+            it and checking the count against the reference count where one
+            is stored for that depth
+        Parameters:
+            depth: int, the number of plies to count to
+            names: Optional[list[str]], the stored positions to run,
+                defaults to all of them
+        Returns:
+            results: list[dict], for each position its name, depth, leaf
+                nodes, time (s), nodes per second, reference count (None if
+                not stored) and whether the count matches it
+        """
+        results = []
+        for name in names or sorted(self.STORED_POSITIONS):
+            position = self.play_moves(self.STORED_POSITIONS[name])
+
+            start_time = time.time()
+            nodes = self.count_nodes(position, depth)
+            seconds = time.time() - start_time
+
+            reference_counts = self.REFERENCE_COUNTS.get(name, ())
+            expected = (reference_counts[depth]
+                        if depth < len(reference_counts) else None)
+            results.append({
+                "name": name,
+                "depth": depth,
+                "nodes": nodes,
+                "seconds": seconds,
+                "nodes_per_second": nodes / seconds if seconds else 0.0,
+                "expected": expected,
+                "matches": expected is None or nodes == expected,
+            })
+        return results
+
+
+def main(argv=None):
+    """
+    Function -- main
+        Command-line entry point: runs perft from the stored positions, or
+        compares the GameBoard move generators with --diff
+    Parameters:
+        argv: Optional[list[str]], the command-line arguments
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(
+        description="Count and verify Othello move generation (perft)")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--position", action="append",
+                        choices=sorted(Perft.STORED_POSITIONS))
+    parser.add_argument("--diff", action="store_true",
+                        help="compare the GameBoard move generators")
+    parser.add_argument("--generators", default=",".join(Perft.GENERATORS))
+    args = parser.parse_args(argv)
+
+    perft = Perft()
+    if not args.diff:
+        for result in perft.run(args.depth, args.position):
+            print(result["name"] + " depth " + str(result["depth"]) + ": " +
+                  str(result["nodes"]) + " nodes in " +
+                  str(round(result["seconds"], 3)) + " s (" +
+                  str(int(result["nodes_per_second"])) + " nodes/s)" +
+                  ("" if result["matches"] else
+                   " MISMATCH, expected " + str(result["expected"])))
+        return
+
+    generators = tuple(args.generators.split(","))
+    for name in args.position or sorted(Perft.STORED_POSITIONS):
+        moves = Perft.STORED_POSITIONS[name]
+        gb = perft.play_moves(moves, GameBoard(board_size=800))
+        divergence = perft.find_divergence(gb, gb.side_to_move, args.depth,
+                                           generators, tuple(moves))
+        if divergence is None:
+            print(name + ": generators agree to depth " + str(args.depth))
+        else:
+            print(name + ": generators diverge after moves " +
+                  str(list(divergence["moves"])) + " (" +
+                  divergence["color"] + " to move)")
+            for generator in generators:
+                print("  " + generator + ": " +
+                      str(divergence["generators"][generator]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from game_board import GameBoard
+from perft import Perft, main
+from position import Position
+
+import pytest
+
+
+def test_constructor():
+    perft: Perft = Perft()
+    assert perft.size == 8
+    assert set(Perft.REFERENCE_COUNTS) == set(Perft.STORED_POSITIONS)
+
+
+def test_play_moves():
+    perft: Perft = Perft()
+    position: Position = perft.play_moves((19, 18, 17))
+    assert position.side_to_move == "white"
+    assert len(position.undo_stack) == 3
+
+    gb: GameBoard = perft.play_moves((19, 18, 17), GameBoard(board_size=800))
+    assert gb.side_to_move == "white"
+    assert gb.bitboard.black == position.bitboard.black
+    assert gb.bitboard.white == position.bitboard.white
+    assert gb.board[2][1].tile.color == "black"
+
+
+def test_count_nodes():
+    perft: Perft = Perft()
+    position: Position = Position()
+    for depth in range(6):
+        assert perft.count_nodes(position, depth) == (
+            Perft.REFERENCE_COUNTS["start"][depth])
+    # Counting leaves the position unchanged
+    assert position.undo_stack == []
+    assert position.side_to_move == "black"
+
+    # Passes count as a ply and finished games are leaves
+    position = perft.play_moves(Perft.STORED_POSITIONS["endgame"])
+    for depth in range(8):
+        assert perft.count_nodes(position, depth) == (
+            Perft.REFERENCE_COUNTS["endgame"][depth])
+
+
+def test_count_board_nodes():
+    perft: Perft = Perft()
+    moves = Perft.STORED_POSITIONS["endgame"]
+    for generator in Perft.GENERATORS:
+        gb: GameBoard = perft.play_moves(moves, GameBoard(board_size=800))
+        black_mask = gb.bitboard.black
+        assert perft.count_board_nodes(gb, "black", 5, generator) == (
+            Perft.REFERENCE_COUNTS["endgame"][5])
+        # Counting leaves the game board unchanged
+        assert len(gb.undo_stack) == len(moves)
+        assert gb.bitboard.black == black_mask
+
+    with pytest.raises(ValueError):
+        perft.count_board_nodes(GameBoard(board_size=800), "black", 1, "x")
+
+
+def test_find_divergence():
+    perft: Perft = Perft()
+    gb: GameBoard = GameBoard(board_size=800)
+    assert perft.find_divergence(gb, "black", 3) is None
+    assert gb.undo_stack == []
+
+    gb = perft.play_moves(Perft.STORED_POSITIONS["endgame"],
+                          GameBoard(board_size=800))
+    assert perft.find_divergence(gb, "black", 4) is None
+
+    # A tile missing from the BoardSquare grid makes the grid scan diverge
+    gb = GameBoard(board_size=800)
+    gb.board[3][3].tile = None
+    divergence = perft.find_divergence(gb, "black", 3)
+    assert divergence["moves"] == ()
+    assert divergence["color"] == "black"
+    assert divergence["black"] == gb.bitboard.black
+    assert divergence["generators"][Perft.GRID] != (
+        divergence["generators"][Perft.BITBOARD])
+
+
+def test_run():
+    perft: Perft = Perft()
+    results = perft.run(3)
+    assert [result["name"] for result in results] == sorted(
+        Perft.STORED_POSITIONS)
+    assert all(result["matches"] for result in results)
+    assert results[-1]["nodes"] == 56
+    assert results[-1]["expected"] == 56
+
+    # Depths without a reference count are reported without one
+    result = perft.run(7, ["diagonal"])[0]
+    assert result["expected"] is None
+    assert result["matches"] is True
+
+
+def test_main(capsys):
+    main(["--depth", "3", "--position", "start"])
+    assert "start depth 3: 56 nodes" in capsys.readouterr().out
+
+    main(["--diff", "--depth", "2", "--position", "parallel"])
+    assert "agree to depth 2" in capsys.readouterr().out
@@ -1,6 +1,12 @@
+from endgame_solver import EndgameSolver
+from lazy_smp_search import LazySMPSearch
+from parallel_search import ParallelSearch
+from search_engine import SearchEngine, SearchResult, SearchTimeout
+from search_engine import run_steps
+from search_stats import SearchStats
 from tile import Tile
 import random
-import copy
+import time
 
 
 class Player:
@@ -8,68 +14,104 @@ class Player:
     Purpose:
     The Player class executes legal moves on the game board and also faciliates
     AI decision-making for the computer player on easy, medium, and hard modes.
+    The AIs choose their moves from a rendering-free Position, so a Player
+    can also play headless on a Position without any GameBoard.
 
     Methods:
     take_turn: allows player to place tile on board in specified location
     _place_tile: creates Tile object and adjusts tile counts on game board
     _flip_tiles: flips the color of the tile objects associated with a legal
         move's flippable tiles
-    calculate_next_move_easy: AI algorithm that determines the computer's
-        next move by randomly selecting a move from the legal moves available
-    calculate_next_move_med: AI algorithm that determines the computer's
-        next move by selecting the move that flips the most tiles
-    calculate_next_move_hard: AI algorithm that determines the computer's
-        next move by identifying the most favorable move according to the
-        legal move objects' move_value attributes
-    _process_legal_moves: Iterates through all legal moves available to the AI
-        and returns the most favorable move
-    _computer_move_calculator: Applies the MOVE_VALUE_DICT weights to the
-        various considerations associated with a legal move for the legal moves
-        available to the Computer AI at a given board recursion depth
-    _player_move_calculator: Applies the MOVE_VALUE_DICT weights to the
-        various considerations associated with a legal move for the legal moves
-        available to the Player at a given board recursion depth
-    _execute_legal_move: executes a given legal move to determine the legal
-        moves available / tiles flipped  on the next recursively defined game
-        board.
+    select_move_easy: AI algorithm that randomly selects a move from the
+        legal moves of the position
+    select_move_med: AI algorithm that selects the move of the position that
+        flips the most tiles
+    select_move_hard: AI algorithm that selects a move with an alpha-beta
+        negamax search of the position
+    select_move_hard_steps: the hard AI as a generator that can be paused
+        between slices of its search
+    calculate_next_move_easy: returns the screen coordinates of the easy AI's
+        next move
+    calculate_next_move_med: returns the screen coordinates of the medium
+        AI's next move
+    calculate_next_move_hard: returns the screen coordinates of the hard AI's
+        next move
+    ponder_steps: runs the hard AI on a position the game may reach, ahead
+        of the player's turn
+    _solve_endgame_steps: plays the end of the game with the endgame solver
+    shutdown_search: stops any worker processes used by the hard AI
 
     Attributes:
-    _gb: GameBoard, the Othello game board
+    _gb: Optional[GameBoard], the Othello game board, or None for a player
+        playing headless on a Position
+    _position: Position, the state of the game the AIs choose moves from,
+        the game board's position unless given
     _name: str, the name of the player ("Player" or "Computer")
     _color: str, the color of the player tile
     _turn_complete: bool, represents whether the player has completed their
         turn or not
+    _search_engine: Optional[SearchEngine], the negamax search used by the
+        hard AI, created the first time the hard AI moves
+    _endgame_solver: Optional[EndgameSolver], the perfect-play endgame search
+        used by the hard AI, created the first time it is needed
+    _search_workers: int, the number of processes the hard AI searches with
+    _parallel_mode: str, how the search is spread across processes,
+        ROOT_SPLIT or LAZY_SMP
+    _parallel_search: Optional[ParallelSearch or LazySMPSearch], the
+        multi-process search used by the hard AI when it has more than one
+        search worker
+    _search_stats: Optional[SearchStats], the stats of the hard AI's last
+        move
+    _on_search_stats: Optional[function], called with the SearchStats of
+        every move of the hard AI
+    _opening_book: Optional[OpeningBook], the book the hard AI plays its
+        opening moves from before searching
     """
 
-    MOVE_VALUE_DICT = {
-        # COMPUTER TURN WEIGHTS
-        "CORNER_SQUARE_COMPUTER": 0.7,
-        "EDGE_SQUARE_COMPUTER": 0.15,
-        "X_SQUARE_COMPUTER": 0.7,
-        "FLIPPED_TILE_COMPUTER": 0.1,
-        "X_SQUARE_BLACK_TILE_FLIP": 0.2,
-        "DIAGONAL_BLACK_TILE_FLIP": 0.15,
-
-        # PLAYER TURN WEIGHTS
-        "CORNER_SQUARE_PLAYER": 0.2,
-        "EDGE_SQUARE_PLAYER": 0.1,
-        "X_SQUARE_PLAYER": 0.4,
-        "FLIPPED_TILE_PLAYER": 0.05,
-    }
-
-    MAX_RECURSION_DEPTH = 3
-
-    def __init__(self, gb, name, color):
+    MAX_RECURSION_DEPTH = 6
+    TRANSPOSITION_TABLE_MB = 4
+    ENDGAME_EXACT_EMPTIES = 10
+    ENDGAME_WLD_EMPTIES = 12
+    # Share of a time budget the endgame solver may use; the rest is kept
+    # for the search if the solve runs out of time
+    ENDGAME_BUDGET_FRACTION = 0.5
+
+    ROOT_SPLIT = "root_split"
+    LAZY_SMP = "lazy_smp"
+    SHARED_TABLE_MB = 16
+
+    def __init__(self, gb, name, color, search_workers=1,
+                 parallel_mode=ROOT_SPLIT, position=None,
+                 on_search_stats=None, opening_book=None):
         self._gb = gb
+        self._position = position if position is not None else gb.position
         self._name = name
         self._color = color
         self._turn_complete = False
+        self._search_engine = None
+        self._endgame_solver = None
+        self._search_workers = search_workers
+        self._parallel_mode = parallel_mode
+        self._parallel_search = None
+        self._search_stats = None
+        self._on_search_stats = on_search_stats
+        self._opening_book = opening_book
 
     @property
     def gb(self):
         """getter method for self._gb"""
         return self._gb
 
+    @property
+    def position(self):
+        """getter method for self._position"""
+        return self._position
+
+    @position.setter
+    def position(self, position):
+        """setter method for self._position"""
+        self._position = position
+
     @property
     def name(self):
         """getter method for self._name"""
@@ -80,6 +122,77 @@ class Player:
         """getter method for self._color"""
         return self._color
 
+    @property
+    def search_engine(self):
+        """getter method for self._search_engine, created on first use"""
+        if self._search_engine is None:
+            self._search_engine = SearchEngine(
+                self.position.size,
+                table_size_mb=self.TRANSPOSITION_TABLE_MB,
+                board_corners=(self.gb.BOARD_CORNERS if self.gb is not None
+                               else None))
+        return self._search_engine
+
+    @property
+    def search_stats(self):
+        """getter method for self._search_stats"""
+        return self._search_stats
+
+    @property
+    def on_search_stats(self):
+        """getter method for self._on_search_stats"""
+        return self._on_search_stats
+
+    @on_search_stats.setter
+    def on_search_stats(self, on_search_stats):
+        """setter method for self._on_search_stats"""
+        self._on_search_stats = on_search_stats
+
+    @property
+    def opening_book(self):
+        """getter method for self._opening_book"""
+        return self._opening_book
+
+    @opening_book.setter
+    def opening_book(self, opening_book):
+        """setter method for self._opening_book"""
+        self._opening_book = opening_book
+
+    @property
+    def endgame_solver(self):
+        """getter method for self._endgame_solver, created on first use"""
+        if self._endgame_solver is None:
+            self._endgame_solver = EndgameSolver(self.position.size)
+        return self._endgame_solver
+
+    @property
+    def search_workers(self):
+        """getter method for self._search_workers"""
+        return self._search_workers
+
+    @property
+    def parallel_mode(self):
+        """getter method for self._parallel_mode"""
+        return self._parallel_mode
+
+    @property
+    def parallel_search(self):
+        """getter method for self._parallel_search, created on first use"""
+        if self._parallel_search is None:
+            if self.parallel_mode == self.LAZY_SMP:
+                self._parallel_search = LazySMPSearch(
+                    self.position.size,
+                    workers=self.search_workers,
+                    max_depth=self.MAX_RECURSION_DEPTH,
+                    table_size_mb=self.SHARED_TABLE_MB)
+            else:
+                self._parallel_search = ParallelSearch(
+                    self.position.size,
+                    workers=self.search_workers,
+                    max_depth=self.MAX_RECURSION_DEPTH,
+                    table_size_mb=self.TRANSPOSITION_TABLE_MB)
+        return self._parallel_search
+
     @property
     def turn_complete(self):
         """getter method for self._turn_complete"""
@@ -121,12 +234,11 @@ class Player:
 
     def _place_tile(self, legal_move):
         """
-        Function -- calculate_next_move
-            Creates a tile object on the player square and adjusts tile counts
-            on the game board
+        Function -- _place_tile
+            Plays the legal move on the position, creates a tile object on
+            the player square and adjusts tile counts on the game board
         Parameters:
-            player_square: BoardSquare, the square on which the player placed
-                a tile
+            legal_move: LegalMove, the legal move the player made
         Returns:
             None
         """
@@ -137,6 +249,7 @@ class Player:
             player_square.y + self.gb.PIXEL_DISPLACEMENT,
             self.color,
         )
+        self.position.apply_move(legal_move.move, self.color)
 
         self.gb.empty_tiles -= 1
 
@@ -151,7 +264,9 @@ class Player:
     def _flip_tiles(self, flippable_squares):
         """
         Function -- _flip_tiles
-            Changes the color of all tiles within the flippable_squares list
+            Changes the color of all tiles within the flippable_squares list.
+            The flips themselves are already on the position (see
+            _place_tile); this updates the tiles drawn on the screen.
         Parameters:
             flippable_squares: list[BoardSquare], all board squares with
                 flippable tiles inside them
@@ -167,298 +282,327 @@ class Player:
                 adjacent_square.tile.color = "white"
 
     # EASY DIFFICULTY COMPUTER AI
+    def select_move_easy(self):
+        """
+        Function -- select_move_easy
+            Selects the computer's next move according to the easy computer
+            selection algorithm, which choses a random move from the legal
+            moves of the position.
+        Parameters:
+            None
+        Returns:
+            index: Optional[int], the bit index of the selected move, or None
+                if the player has no legal move
+        """
+        legal_moves = self.position.legal_moves(self.color)
+        if legal_moves:
+            move = random.randint(0, len(legal_moves) - 1)
+            return legal_moves[move].index
+        else:
+            return None
+
     def calculate_next_move_easy(self):
         """
         Function -- calculate_next_move_easy
-            Calculates the computer's next move according to the list of legal
-            moves for that turn and the easy computer selection algorithm. The
-            easy algorithm choses a random LegalMove from the list of legal
-            moves and executest that move.
+            Calculates the computer's next move according to the easy computer
+            selection algorithm (see select_move_easy)
         Parameters:
             None
         Returns:
-            None
+            next_move: Optional[tuple(int, int)], the coordinates of the next
+                move, or None if the player has no legal move
         """
-        if self.gb.legal_moves:
-            move = random.randint(0, len(self.gb.legal_moves) - 1)
-            return (
-                (
-                    self.gb.legal_moves[move].player_square.x
-                    + self.gb.PIXEL_DISPLACEMENT
-                ),
-                (
-                    self.gb.legal_moves[move].player_square.y
-                    + self.gb.PIXEL_DISPLACEMENT
-                ),
-            )
-        else:
+        index = self.select_move_easy()
+        if index is None:
             return None
+        return self.gb.project_square(index)
 
     # MEDIUM DIFFICULTY COMPUTER AI
-    def calculate_next_move_med(self):
+    def select_move_med(self):
         """
-        Function -- calculate_next_move_med
-            Calculates the computer's next move according to the list of legal
-            moves for that turn and the medium computer selection algorithm.
-            The medium algorithm choses the LegalMove instance that flips the
-            highest number of tiles possible for the given turn.
+        Function -- select_move_med
+            Selects the computer's next move according to the medium computer
+            selection algorithm, which choses the move that flips the highest
+            number of tiles possible for the given turn.
         Parameters:
             None
         Returns:
-            None
+            index: Optional[int], the bit index of the selected move, or None
+                if the player has no legal move
         """
         best_move = None
 
-        for legal_move_sim in self.gb.legal_moves:
+        for legal_move_sim in self.position.legal_moves(self.color):
 
             if best_move is None:
                 best_move = legal_move_sim
 
-            elif len(best_move.flippable_squares) < len(
-                legal_move_sim.flippable_squares
-            ):
+            elif best_move.total_flips < legal_move_sim.total_flips:
                 best_move = legal_move_sim
 
         if best_move:
-            return (
-                best_move.player_square.x + self.gb.PIXEL_DISPLACEMENT,
-                best_move.player_square.y + self.gb.PIXEL_DISPLACEMENT,
-            )
+            return best_move.index
         else:
             return None
 
-    # HARD DIFFICULTY COMPUTER AI
-    def calculate_next_move_hard(self):
+    def calculate_next_move_med(self):
         """
-        Function -- calculate_next_move_hard
-            Calculates the computer's next move according to the list of legal
-            moves for that turn and the hard computer selection algorithm. The
-            hard algorithm uses mutual recursion to recurse to the turn-depth
-            specified by MAX_RECURSION_DEPTH, generating all possible game
-            boards on the way down. As the recursion returns to top-level, all
-            legal moves are examined and weighted based on a strategy that
-            prioritizes corner and edge moves, avoids moves in the Othello
-            X-squares, and maximizes tile flips. The move that best exemplifies
-            that strategy is returned to inform the comparison of the next
-            recursion level's legal moves. Once a final move is determined to
-            be the best_move, it is returned an executed by the computer AI.
+        Function -- calculate_next_move_med
+            Calculates the computer's next move according to the medium
+            computer selection algorithm (see select_move_med)
         Parameters:
             None
         Returns:
-            next_move: tuple(int, int), the coordinates of the next move
+            next_move: Optional[tuple(int, int)], the coordinates of the next
+                move, or None if the player has no legal move
         """
-        game_board = copy.deepcopy(self.gb)
-        computer_player = Player(game_board, "Computer", "white")
-        recursion_depth = 0
-
-        next_move = self._process_legal_moves(
-            game_board, computer_player, recursion_depth
-        )
-        if next_move:
-            return (
-                next_move.player_square.x + self.gb.PIXEL_DISPLACEMENT,
-                next_move.player_square.y + self.gb.PIXEL_DISPLACEMENT,
-            )
-        else:
+        index = self.select_move_med()
+        if index is None:
             return None
+        return self.gb.project_square(index)
 
-    # HARD DIFFICULTY COMPUTER AI - Mutually Recursive Function
-    def _process_legal_moves(self, game_board, current_turn, recursion_depth):
+    # HARD DIFFICULTY COMPUTER AI
+    def select_move_hard(self, time_budget_ms=None, start_depth=1):
         """
-        Function -- _process_legal_moves
-            Runs a for-loop through the list of all legal moves for a given
-            game board state and recursion depth. For each turn, the
-            function checks for any prioritized/deprioritized moves and if
-            found, adjust the respective legal move's move_value attribute
-            based on pre-determined floating point values. The function then
-            determines which legal move has the highest move value and returns
-            it as the best move for the given recursion depth.
+        Function -- select_move_hard
+            Selects the computer's next move according to the hard computer
+            selection algorithm. The hard algorithm runs a negamax search with
+            alpha-beta pruning on the position's bitboard. Without a time
+            budget, the search runs to the turn-depth specified by
+            MAX_RECURSION_DEPTH; with one, the search is deepened one turn at
+            a time until the budget is used up and the best move of the
+            deepest completed search is kept. Positions at the bottom of the
+            search are scored by a static evaluation that prioritizes corner
+            and edge tiles and mobility and avoids the Othello X-squares. The
+            search returns the move with the best score. With more than one
+            search worker, the search is spread across worker processes,
+            either by splitting the root moves between them (ROOT_SPLIT) or
+            by having them all search the root with a shared transposition
+            table (LAZY_SMP). A position in the opening book is not searched
+            at all: the book's move is played. Once few enough squares are
+            empty, the endgame solver plays the move instead (see
+            _solve_endgame_steps), using at most ENDGAME_BUDGET_FRACTION of
+            the time budget so that the search keeps the rest if the solve
+            runs out of time. The stats of the search are kept in
+            search_stats and passed to the on_search_stats callback, if one
+            is set.
         Parameters:
-            game_board: GameBoard, the current state of the Othello game board
-            current_turn: Player, the player/computer whose turn it is
-            recursion_depth: the depth level of the game board that is being
-                processed from the current, active game board
+            time_budget_ms: Optional[int], the wall-clock time (ms) the search
+                may use
+            start_depth: int, the first depth of a single-process search,
+                for a position already searched to that depth (for example
+                while pondering) whose results are in the transposition table
         Returns:
-            best_move: LegalMove, the determined best move for the current_turn
-                player based on the algorithmic priorities
+            index: Optional[int], the bit index of the selected move, or None
+                if the player has no legal move
         """
-        legal_moves = game_board.legal_moves
-
-        recursion_depth += 1
-
-        for legal_move in legal_moves:
-
-            game_board_copy = copy.deepcopy(self.gb)
-            player_1 = Player(game_board_copy, "Player", "black")
-            player_2 = Player(game_board_copy, "Computer", "white")
-
-            # Retrieves best move value and max tiles flipped for the move
-            self._execute_legal_move(
-                game_board_copy,
-                legal_move,
-                player_1,
-                player_2,
-                player_2,
-                recursion_depth,
-            )
+        return run_steps(self.select_move_hard_steps(time_budget_ms,
+                                                     sliced=False,
+                                                     start_depth=start_depth))
 
-            # Assign move values to legal moves
-            if current_turn.name == "Computer":
-                self._computer_move_calculator(legal_move, recursion_depth)
+    def select_move_hard_steps(self, time_budget_ms=None, sliced=True,
+                               start_depth=1):
+        """
+        Function -- select_move_hard_steps
+            Runs the hard AI (see select_move_hard) as a generator, so that a
+            single-threaded caller can run its search a slice at a time, for
+            example between frames. Each step searches a bounded subtree (see
+            SearchEngine.search_steps and EndgameSolver.solve_steps). A
+            multi-process search runs in a single step.
+        Parameters:
+            time_budget_ms: Optional[int], the wall-clock time (ms) the search
+                may use, including any pauses between steps
+            sliced: bool, True to pause between small subtrees, False to
+                pause only between root moves
+            start_depth: int, the first depth of a single-process search
+                (see select_move_hard)
+        Returns:
+            steps: generator, yields the number of nodes the running solver
+                or search has visited so far after each step, then a
+                SearchResult of the bit index of the selected move, or None if
+                the player has no legal move
+        """
+        start_time = time.time()
+        self._search_stats = None
+        index = None
+        if self._opening_book is not None:
+            index = self._opening_book.select_move(self.position.bitboard,
+                                                   self.color)
+            if index is not None:
+                # A book move visits no positions
+                self._search_stats = SearchStats(
+                    elapsed_s=time.time() - start_time)
+
+        if index is None:
+            solver_budget_ms = None
+            if time_budget_ms is not None:
+                solver_budget_ms = (time_budget_ms *
+                                    self.ENDGAME_BUDGET_FRACTION)
+            for step in self._solve_endgame_steps(solver_budget_ms, sliced):
+                if isinstance(step, SearchResult):
+                    index = step.value
+                else:
+                    yield step
+
+        if index is None:
+            if time_budget_ms is not None:
+                # Search with whatever budget the endgame solver left over,
+                # and never less than the share kept for the search
+                time_budget_ms = max(
+                    time_budget_ms * (1 - self.ENDGAME_BUDGET_FRACTION),
+                    time_budget_ms - (time.time() - start_time) * 1000)
+                depth = None
             else:
-                self._player_move_calculator(legal_move, recursion_depth)
-
-        if legal_moves:
-            # Find the legal move with the highest move_value attribute
-            best_move = max(legal_moves)
-        else:
-            best_move = None
-
-        return best_move
-
-    def _computer_move_calculator(self, legal_move, recursion_depth):
+                depth = self.MAX_RECURSION_DEPTH
+
+            if self.search_workers > 1:
+                search = self.parallel_search
+                index, _ = search.search(self.position.bitboard,
+                                         self.color,
+                                         depth,
+                                         time_budget_ms)
+            else:
+                search = self.search_engine
+                # Only the stats callback reads the time spent per phase
+                search.time_phases = self._on_search_stats is not None
+                for step in search.search_steps(
+                        self.position.bitboard, self.color, depth,
+                        time_budget_ms, start_depth=start_depth,
+                        slice_depth=search.SLICE_DEPTH if sliced else None):
+                    if isinstance(step, SearchResult):
+                        index, _ = step.value
+                    else:
+                        yield step
+
+            # Count any endgame solve that failed before the search
+            stats = [search.stats]
+            if self._search_stats is not None:
+                stats.append(self._search_stats)
+            self._search_stats = SearchStats.combine(
+                stats, search.stats.depth_reached, time.time() - start_time)
+
+        if self._on_search_stats is not None:
+            self._on_search_stats(self._search_stats)
+        yield SearchResult(index)
+
+    def calculate_next_move_hard(self, time_budget_ms=None):
         """
-        Function -- _computer_move_calculator
-            Adjusts the legal move's move_value attribute to a final value
-            based on the existence of pre-determined move conditions for the
-            computer's turn
+        Function -- calculate_next_move_hard
+            Calculates the computer's next move according to the hard computer
+            selection algorithm (see select_move_hard)
         Parameters:
-            legal_move: LegalMove, a LegalMove object and associated attributes
-            recursion_depth: the depth level of the game board that is being
-                processed from the current, active game board
+            time_budget_ms: Optional[int], the wall-clock time (ms) the search
+                may use
         Returns:
-            None - only adjusts LegalMove move_value attribute
+            next_move: Optional[tuple(int, int)], the coordinates of the next
+                move, or None if the player has no legal move
         """
-        legal_move.move_value += (
-            legal_move.max_tiles * (
-                self.MOVE_VALUE_DICT["FLIPPED_TILE_COMPUTER"]) / (
-                    recursion_depth))
-
-        # Prioritizes moves in the corners of the board
-        if legal_move.is_corner_move:
-            legal_move.move_value += (
-                self.MOVE_VALUE_DICT["CORNER_SQUARE_COMPUTER"] / (
-                    recursion_depth))
-
-        # Deprioritizes moves in the 3 squares around corner square
-        elif legal_move.board_corner and (
-            legal_move.board_corner.corner_square.is_empty
-        ):
-            legal_move.move_value -= (
-                self.MOVE_VALUE_DICT["X_SQUARE_COMPUTER"] / recursion_depth)
-
-        # Prioritizes moves on edge of board
-        elif legal_move.is_edge_move:
-            legal_move.move_value += (
-                self.MOVE_VALUE_DICT["EDGE_SQUARE_COMPUTER"] / recursion_depth)
-
-        for flippable_square in legal_move.flippable_squares:
-
-            # Deprioritizes moves that flip black tiles when corner is empty
-            for board_corner in self.gb.BOARD_CORNERS:
-                if (
-                    (flippable_square.x_index, flippable_square.y_index)
-                    in board_corner.x_squares
-                ) and (board_corner.corner_square.is_empty):
-                    legal_move.move_value -= (
-                        self.MOVE_VALUE_DICT["X_SQUARE_BLACK_TILE_FLIP"] / (
-                            recursion_depth))
-
-            # Prioritizes moves that flip black tiles on diagonals to corners
-            if flippable_square in self.gb.BOARD_DIAGONALS:
-                legal_move.move_value += (
-                    self.MOVE_VALUE_DICT["DIAGONAL_BLACK_TILE_FLIP"] / (
-                        recursion_depth))
-
-    def _player_move_calculator(self, legal_move, recursion_depth):
+        index = self.select_move_hard(time_budget_ms)
+        if index is None:
+            return None
+        return self.gb.project_square(index)
+
+    def ponder_steps(self, position, time_budget_ms=None):
         """
-        Function -- _player_move_calculator
-            Adjusts the legal move's move_value attribute to a final value
-            based on the existence of pre-determined move conditions for the
-            players's turn.
+        Function -- ponder_steps
+            Runs the hard AI (see select_move_hard_steps) on a position the
+            game may reach, such as the position after one of the opponent's
+            possible moves, to fill the search's transposition table ahead
+            of the player's turn. Until the generator finishes or is closed,
+            the player searches that position instead of its own, and the
+            stats of the search are not passed to on_search_stats or kept in
+            search_stats.
         Parameters:
-            legal_move: LegalMove, a LegalMove object and associated attributes
-            recursion_depth: the depth level of the game board that is being
-                processed from the current, active game board
+            position: Position, the position to search, with the player to
+                move
+            time_budget_ms: Optional[int], the wall-clock time (ms) the search
+                may use, including any pauses between steps
         Returns:
-            None - only adjusts LegalMove move_value attribute
+            steps: generator, yields the number of nodes visited so far
+                after each step, then a SearchResult of the bit index of the
+                selected move (None if the player has no legal move) and the
+                SearchStats of the search
         """
-        legal_move.move_value -= legal_move.max_tiles * (
-            self.MOVE_VALUE_DICT["FLIPPED_TILE_PLAYER"] / recursion_depth)
-
-        # Deprioritizes player move in the corners of the board
-        if legal_move.is_corner_move:
-            legal_move.move_value -= (
-                self.MOVE_VALUE_DICT["CORNER_SQUARE_PLAYER"] / recursion_depth)
-
-        # Prioritizes player moves in the 3 squares around corner square
-        elif legal_move.board_corner and (
-            legal_move.board_corner.corner_square.is_empty
-        ):
-            legal_move.move_value += (
-                self.MOVE_VALUE_DICT["X_SQUARE_PLAYER"] / recursion_depth)
-
-        # Deprioritizes player moves on the edge of the board
-        elif legal_move.is_edge_move:
-            legal_move.move_value -= (
-                self.MOVE_VALUE_DICT["EDGE_SQUARE_PLAYER"] / recursion_depth)
-
-    # HARD DIFFICULTY COMPUTER AI - Mutually Recursive Function
-    def _execute_legal_move(self,
-                            game_board,
-                            legal_move,
-                            player_1,
-                            player_2,
-                            current_turn,
-                            recursion_depth):
+        own_position = self._position
+        search_stats = self._search_stats
+        on_search_stats = self._on_search_stats
+        self._position = position
+        self._on_search_stats = None
+        try:
+            for step in self.select_move_hard_steps(time_budget_ms):
+                if isinstance(step, SearchResult):
+                    result = (step.value, self._search_stats)
+                else:
+                    yield step
+        finally:
+            self._position = own_position
+            self._search_stats = search_stats
+            self._on_search_stats = on_search_stats
+        yield SearchResult(result)
+
+    def _solve_endgame_steps(self, time_budget_ms=None, sliced=True):
         """
-        Function -- _execute_legal_move
-            Accepts the given game board state and a legal move and if it is
-            not at the MAX RECURSION DEPTH, executes that legal move through
-            the player whose current turn it is. After the move is executed,
-            the function calculates the new legal moves for the game board and
-            then calls _process_legal_moves with the new game board state and
-            the next player turn. If it is at the MAX RECURSION DEPTH, it
-            returns the total flips for the specified legal move.
+        Function -- _solve_endgame_steps
+            Runs the endgame solver, a step at a time, once the number of
+            empty squares falls to ENDGAME_WLD_EMPTIES. At or below
+            ENDGAME_EXACT_EMPTIES the solver finds the move with the best
+            final tile difference; above it, the solver only proves a win or
+            draw. A proven loss, or running out of time, leaves the move to
+            the hard AI's search. The thresholds are set so that a solve
+            without a time budget still finishes in well under a second.
         Parameters:
-            game_board: GameBoard, the current state of the Othello game board
-            legal_move: LegalMove, the given legal move for processing
-            player_1: Player, the non-computer Player instance tied to the
-                given game board
-            player_2: Player, the computer Player instance tied to the given
-                game board
-            current_turn: Player, the player/computer whose turn it is
-            recursion_depth: the depth level of the game board that is being
-                processed from the current, active game board
+            time_budget_ms: Optional[int], the wall-clock time (ms) the solver
+                may use
+            sliced: bool, True to pause between small subtrees, False to
+                pause only between root moves
         Returns:
-            None, instead the function adjusts the max_tiles attribute of the
-                given LegalMove instance for future decision-making
+            steps: generator, yields the number of nodes the solver has
+                visited so far, then a SearchResult of the bit index of the
+                solved move, or None
         """
-        if recursion_depth == self.MAX_RECURSION_DEPTH:
-            legal_move.max_tiles += legal_move.total_flips
-
+        start_time = time.time()
+        empty_squares = self.position.empty_tiles
+        if empty_squares > self.ENDGAME_WLD_EMPTIES:
+            yield SearchResult(None)
+            return
+
+        if empty_squares <= self.ENDGAME_EXACT_EMPTIES:
+            mode = EndgameSolver.EXACT
         else:
-
-            if current_turn == player_1:
-                player_1.take_turn(
-                    legal_move.player_square.x, legal_move.player_square.y
-                )
-
-                current_turn = player_2
-
-            else:
-                player_2.take_turn(
-                    legal_move.player_square.x, legal_move.player_square.y
-                )
-
-                current_turn = player_1
-
-            game_board.calculate_legal_moves(current_turn)
-
-            best_move = self._process_legal_moves(
-                game_board, current_turn, recursion_depth
-            )
-
-            if best_move:
-                legal_move.max_tiles = best_move.max_tiles
-                legal_move.move_value = best_move.move_value
+            mode = EndgameSolver.WIN_LOSS_DRAW
+
+        index, score = None, None
+        try:
+            for step in self.endgame_solver.solve_steps(
+                    self.position.bitboard, self.color, mode, time_budget_ms,
+                    EndgameSolver.SLICE_EMPTIES if sliced else None):
+                if isinstance(step, SearchResult):
+                    index, score = step.value
+                else:
+                    yield step
+        except SearchTimeout:
+            # Out of time: the search plays the move instead
+            pass
+        finally:
+            solved = score is not None and (
+                mode == EndgameSolver.EXACT or score >= 0)
+            self._search_stats = SearchStats(
+                nodes=self.endgame_solver.nodes,
+                depth_reached=empty_squares,
+                elapsed_s=time.time() - start_time,
+                solved=solved)
+
+        yield SearchResult(index if solved else None)
+
+    def shutdown_search(self):
+        """
+        Function -- shutdown_search
+            Stops the worker processes of the multi-process search and frees
+            any shared transposition table, if they were started
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        if self._parallel_search is not None:
+            self._parallel_search.shutdown()
@@ -1,5 +1,12 @@
+from bitboard import Bitboard
+from lazy_smp_search import LazySMPSearch
 from legal_move import LegalMove
+from move import Move
+from opening_book import OpeningBook
+from parallel_search import ParallelSearch
 from player import Player
+from position import Position
+from search_engine import run_steps
 from game_board import GameBoard
 
 
@@ -14,17 +21,19 @@ def test_constructor():
     assert p.gb == gb
     assert p.name == "Computer"
     assert p.color == "white"
+    assert p.parallel_mode == Player.ROOT_SPLIT
+    assert isinstance(p.parallel_search, ParallelSearch)
+
+    p: Player = Player(gb, "Computer", "white", search_workers=2,
+                       parallel_mode=Player.LAZY_SMP)
+    assert isinstance(p.parallel_search, LazySMPSearch)
+    assert p.parallel_search.workers == 2
 
 
 def test_take_turn():
     gb: GameBoard = GameBoard(board_size=800)
     board_square = gb.board[5][4]
-    lm: LegalMove = LegalMove(gb.board[2][3],
-                              set(),
-                              1,
-                              None,
-                              False,
-                              False)
+    lm: LegalMove = LegalMove(gb, Move(19, 1 << 27, "black"))
     gb.legal_moves = [lm]
     p: Player = Player(gb, "Player", "black")
 
@@ -48,12 +57,7 @@ def test_take_turn():
 
     # Confirm a player cannot place a tile once they have placed one that turn
     gb: GameBoard = GameBoard(board_size=800)
-    lm: LegalMove = LegalMove(gb.board[2][3],
-                              set(),
-                              1,
-                              None,
-                              False,
-                              False)
+    lm: LegalMove = LegalMove(gb, Move(19, 1 << 27, "black"))
     gb.legal_moves = [lm]
     p: Player = Player(gb, "Player", "black")
 
@@ -72,12 +76,7 @@ def test_take_turn():
 
 def test__place_tile():
     gb: GameBoard = GameBoard(board_size=800)
-    lm: LegalMove = LegalMove(gb.board[2][3],
-                              [gb.board[3][3]],
-                              1,
-                              None,
-                              False,
-                              False)
+    lm: LegalMove = LegalMove(gb, Move(19, 1 << 27, "black"))
     gb.legal_moves = [lm]
     p: Player = Player(gb, "Player", "black")
     # Player will place tile in top left board square
@@ -92,12 +91,7 @@ def test__place_tile():
     assert gb.white_tiles == 1
 
     gb: GameBoard = GameBoard(board_size=800)
-    lm: LegalMove = LegalMove(gb.board[2][4],
-                              [gb.board[3][4]],
-                              1,
-                              None,
-                              False,
-                              False)
+    lm: LegalMove = LegalMove(gb, Move(20, 1 << 28, "white"))
     gb.legal_moves = [lm]
     p: Player = Player(gb, "Player", "white")
     # Player will place tile in top left board square
@@ -110,3 +104,166 @@ def test__place_tile():
     assert gb.empty_tiles == 59
     assert gb.black_tiles == 1
     assert gb.white_tiles == 4
+
+
+def test_select_move_headless():
+    # Players can choose moves on a Position without any GameBoard
+    position: Position = Position()
+    p: Player = Player(None, "Computer", "black", position=position)
+    assert p.gb is None
+    assert p.position is position
+    legal_indices = [move.index for move in position.legal_moves("black")]
+
+    assert p.select_move_easy() in legal_indices
+    # All opening moves flip one tile, so the first one is kept
+    assert p.select_move_med() == 19
+    assert p.select_move_hard() in legal_indices
+    assert position.undo_stack == []
+
+    # No move is selected for a player who cannot move
+    p = Player(None, "Computer", "white",
+               position=Position(8, black=0, white=1))
+    assert p.select_move_easy() is None
+    assert p.select_move_med() is None
+    assert p.select_move_hard() is None
+
+
+def test_calculate_next_move_hard():
+    gb: GameBoard = GameBoard(board_size=800)
+    p_1: Player = Player(gb, "Player", "black")
+    p_2: Player = Player(gb, "Computer", "white")
+    gb.calculate_legal_moves(p_1.color)
+    p_1.take_turn(350, 350)
+    gb.calculate_legal_moves(p_2.color)
+    legal_moves = gb.legal_moves
+    black_mask = gb.bitboard.black
+    white_mask = gb.bitboard.white
+
+    next_move = p_2.calculate_next_move_hard()
+    assert next_move in [(move.player_square.x + gb.PIXEL_DISPLACEMENT,
+                          move.player_square.y + gb.PIXEL_DISPLACEMENT)
+                         for move in legal_moves]
+
+    # The search applies and undoes moves, leaving the game board unchanged
+    assert gb.legal_moves is legal_moves
+    assert gb.undo_stack == []
+    assert gb.bitboard.black == black_mask
+    assert gb.bitboard.white == white_mask
+    assert gb.black_tiles == 4
+    assert gb.white_tiles == 1
+    assert gb.empty_tiles == 59
+
+
+def test_calculate_next_move_hard_time_budget():
+    gb: GameBoard = GameBoard(board_size=800)
+    p: Player = Player(gb, "Player", "black")
+    gb.calculate_legal_moves(p.color)
+    next_move = p.calculate_next_move_hard(time_budget_ms=100)
+    assert next_move in [(move.player_square.x + gb.PIXEL_DISPLACEMENT,
+                          move.player_square.y + gb.PIXEL_DISPLACEMENT)
+                         for move in gb.legal_moves]
+    assert p.search_engine.depth_reached >= 2
+
+
+def test__solve_endgame():
+    position: Position = Position(4)
+    position.apply_move(position.legal_moves()[0])
+    position.apply_move(position.legal_moves()[0])
+    p: Player = Player(None, "Computer", "black", position=position)
+    # The 10 empty squares left on a 4x4 board are solved exactly
+    index = run_steps(p._solve_endgame_steps())
+    assert index in position.bitboard.yield_indices(
+        position.bitboard.calculate_move_mask("black"))
+    assert p.endgame_solver.nodes > 0
+    assert p.search_stats.solved
+
+    # The win-loss-draw solve leaves a lost position to the search
+    p: Player = Player(None, "Computer", "black", position=Position(4))
+    assert run_steps(p._solve_endgame_steps()) is None
+    assert p.endgame_solver.nodes > 0
+    assert not p.search_stats.solved
+
+    # The solver is skipped while too many squares are empty
+    gb: GameBoard = GameBoard(board_size=800)
+    p: Player = Player(gb, "Computer", "black")
+    assert run_steps(p._solve_endgame_steps()) is None
+
+
+def test_search_stats():
+    logged = []
+    p: Player = Player(None, "Computer", "black", position=Position(8),
+                       on_search_stats=logged.append)
+    assert p.search_stats is None
+    p.select_move_hard()
+    assert logged == [p.search_stats]
+    assert p.search_stats.depth_reached == p.MAX_RECURSION_DEPTH
+    # The phases are timed only for the callback
+    assert p.search_engine.time_phases
+    assert p.search_stats.evaluation_s > 0
+    p.on_search_stats = None
+    p.select_move_hard()
+    assert not p.search_engine.time_phases
+    assert p.search_stats.evaluation_s == 0
+    p.on_search_stats = logged.append
+    assert p.search_stats.nodes >= p.search_engine.nodes
+
+    # An endgame solve reports the solver's nodes
+    position: Position = Position(4)
+    position.apply_move(position.legal_moves()[0])
+    position.apply_move(position.legal_moves()[0])
+    p: Player = Player(None, "Computer", "black", position=position)
+    p.on_search_stats = logged.append
+    p.select_move_hard()
+    assert logged[-1] is p.search_stats
+    assert p.search_stats.nodes == p.endgame_solver.nodes
+    assert p.search_stats.depth_reached == 10
+
+
+def test_ponder_steps():
+    logged = []
+    position: Position = Position(8)
+    p: Player = Player(None, "Computer", "white", position=position,
+                       on_search_stats=logged.append)
+    reply_position: Position = position.copy()
+    reply_position.apply_move(reply_position.legal_moves()[0])
+
+    index, stats = run_steps(p.ponder_steps(reply_position))
+    assert index in Bitboard.yield_indices(
+        reply_position.bitboard.calculate_move_mask("white"))
+    assert stats.depth_reached == p.MAX_RECURSION_DEPTH
+    # The player keeps its own position and reports nothing
+    assert p.position is position
+    assert p.search_stats is None
+    assert logged == []
+
+    # The search resumes at the pondered depth
+    p.position = reply_position
+    assert p.select_move_hard(
+        start_depth=p.MAX_RECURSION_DEPTH) in Bitboard.yield_indices(
+            reply_position.bitboard.calculate_move_mask("white"))
+    assert p.search_stats.nodes < stats.nodes
+    assert logged == [p.search_stats]
+
+
+def test_opening_book(tmp_path):
+    path = str(tmp_path / "book.bin")
+    OpeningBook.build(path, size=8, plies=1, depth=1)
+    book: OpeningBook = OpeningBook(path)
+    position: Position = Position(8)
+    p: Player = Player(None, "Computer", "black", position=position,
+                       opening_book=book)
+    assert p.opening_book is book
+
+    # A book position is played without creating the search
+    index = p.select_move_hard()
+    assert index == book.select_move(position.bitboard, "black")
+    assert p.search_stats.nodes == 0
+    assert p._search_engine is None
+
+    # Out of the book, the player searches
+    position.apply_move(position.legal_moves()[0])
+    p: Player = Player(None, "Computer", "white", position=position,
+                       opening_book=book)
+    assert p.select_move_hard() is not None
+    assert p.search_stats.nodes > 0
+    book.close()
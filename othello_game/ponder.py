@@ -0,0 +1,256 @@
+from search_engine import SearchEngine
+from sliced_search import SlicedSearch
+
+
+class Ponder:
+    """
+    Purpose:
+    The Ponder class lets the hard AI think on the human player's time.
+    During the human's turn it searches the positions the human's legal
+    moves lead to, one after another and the most likely move first, and
+    caches the computer's reply to each by the resulting position. The
+    human's moves are ranked by the static evaluation of the positions they
+    lead to: the move that leaves the computer the worst position is the
+    most likely. Once the human has moved, lookup finds the depth pondering
+    reached for the position on the board, and the computer's own search
+    starts at that depth on a transposition table already filled by the
+    pondering search, so its time budget is spent beyond what pondering
+    found.
+
+    The searches run in the worker process of a BackgroundSearch, whose
+    players keep their transposition tables for the computer's own search,
+    or, without one, a slice per call to advance on the computer player
+    itself (see Player.ponder_steps).
+
+    Methods:
+    _key: returns the cache key of a position
+    _rank_moves: returns the positions after the human's legal moves, most
+        likely first
+    start: starts pondering the human's moves from a position
+    advance: collects a finished search and starts the next one
+    stop: stops pondering, keeping the replies found so far
+    lookup: returns the cached reply to a position
+
+    Attributes:
+    _player: Player, the computer player
+    _time_budget_ms: Optional[int], the wall-clock time (ms) the search of
+        each reply may use
+    _max_replies: Optional[int], the number of the human's most likely moves
+        to ponder, or None for all of them
+    _background_search: Optional[BackgroundSearch], runs the searches in a
+        worker process, or None to search a slice per call to advance
+    _slice_ms: Optional[float], the time (ms) each slice may use
+    _slice_nodes: Optional[int], the number of nodes each slice may visit
+    _evaluator: Optional[SearchEngine], scores positions to rank the human's
+        moves, created on first use
+    _queue: list[Position], the positions still to search, next first
+    _searching: Optional[Position], the position being searched
+    _sliced_search: Optional[SlicedSearch], the running sliced search
+    _cache: dict[tuple, tuple[Optional[int], int]], the bit index of the
+        computer's reply and the depth its iterative deepening search
+        reached, 0 for a book move or an endgame solve, by position (see
+        _key)
+    """
+
+    def __init__(self, player, time_budget_ms=None, max_replies=None,
+                 background_search=None, slice_ms=None, slice_nodes=None):
+        if background_search is None and (slice_ms is None and
+                                          slice_nodes is None):
+            raise ValueError("Pondering needs a background search or a "
+                             "slice budget")
+        self._player = player
+        self._time_budget_ms = time_budget_ms
+        self._max_replies = max_replies
+        self._background_search = background_search
+        self._slice_ms = slice_ms
+        self._slice_nodes = slice_nodes
+        self._evaluator = None
+        self._queue = []
+        self._searching = None
+        self._sliced_search = None
+        self._cache = {}
+
+    @property
+    def player(self):
+        """getter method for self._player"""
+        return self._player
+
+    @property
+    def time_budget_ms(self):
+        """getter method for self._time_budget_ms"""
+        return self._time_budget_ms
+
+    @time_budget_ms.setter
+    def time_budget_ms(self, time_budget_ms):
+        """setter method for self._time_budget_ms"""
+        self._time_budget_ms = time_budget_ms
+
+    @property
+    def max_replies(self):
+        """getter method for self._max_replies"""
+        return self._max_replies
+
+    @property
+    def queue(self):
+        """getter method for self._queue"""
+        return self._queue
+
+    @property
+    def cache(self):
+        """getter method for self._cache"""
+        return self._cache
+
+    @property
+    def running(self):
+        """getter method for whether a reply is being searched"""
+        return self._searching is not None
+
+    @property
+    def evaluator(self):
+        """getter method for self._evaluator, created on first use"""
+        if self._evaluator is None:
+            gb = self._player.gb
+            self._evaluator = SearchEngine(
+                self._player.position.size,
+                table_size_mb=0,
+                use_move_ordering=False,
+                board_corners=gb.BOARD_CORNERS if gb is not None else None)
+        return self._evaluator
+
+    @staticmethod
+    def _key(position, color):
+        """
+        Function -- _key
+            Returns the cache key of a position with the player of the given
+            color to move
+        Parameters:
+            position: Position, the position
+            color: str, the color of the player to move
+        Returns:
+            key: tuple[int, int, int, str], the board size, the black and
+                white bitmasks and the color
+        """
+        return (position.size, position.bitboard.black,
+                position.bitboard.white, color)
+
+    def _rank_moves(self, position, color):
+        """
+        Function -- _rank_moves
+            Plays each legal move of the human player on a copy of the
+            position and ranks the resulting positions by their static
+            evaluation for the computer, lowest first: the human is most
+            likely to play the move that is best for the human
+        Parameters:
+            position: Position, the position with the human to move
+            color: str, the color of the human player
+        Returns:
+            positions: list[Position], the position after each legal move of
+                the human, most likely first
+        """
+        ranked = []
+        for move in position.legal_moves(color):
+            reply_position = position.copy()
+            reply_position.apply_move(move, color)
+            computer_tiles = reply_position.tiles(self._player.color)
+            score = self.evaluator.evaluate(computer_tiles,
+                                            reply_position.tiles(color))
+            ranked.append((score, move.index, reply_position))
+        ranked.sort(key=lambda entry: entry[:2])
+        return [reply_position for _, _, reply_position in ranked]
+
+    def start(self, position, color):
+        """
+        Function -- start
+            Starts pondering the legal moves of the human player from a
+            position, dropping any earlier pondering and its replies. The
+            searches run on the following calls to advance.
+        Parameters:
+            position: Position, the position with the human to move; the
+                positions after the human's moves are copies of it
+            color: str, the color of the human player
+        Returns:
+            None
+        """
+        self.stop()
+        self._cache = {}
+        self._queue = self._rank_moves(position, color)[:self._max_replies]
+
+    def advance(self):
+        """
+        Function -- advance
+            Called once per frame during the human's turn. Collects the
+            running search into the cache once it has finished, or, when
+            searching a slice at a time, runs the next slice first, then
+            starts searching the next position in the queue.
+        Parameters:
+            None
+        Returns:
+            done: bool, True once every queued position has been searched
+        """
+        if self._searching is not None:
+            if self._background_search is not None:
+                if not self._background_search.done:
+                    return False
+                index, stats = self._background_search.result()
+            else:
+                if not self._sliced_search.advance():
+                    return False
+                index, stats = self._sliced_search.result
+                self._sliced_search = None
+            # Only a depth of iterative deepening can be resumed; a book
+            # move or an endgame solve leaves nothing to start from
+            depth = 0 if stats.solved else stats.depth_reached
+            self._cache[self._key(self._searching, self._player.color)] = (
+                index, depth)
+            self._searching = None
+
+        if not self._queue:
+            return True
+
+        self._searching = self._queue.pop(0)
+        if self._background_search is not None:
+            self._background_search.start(self._searching,
+                                          self._player.color,
+                                          self._time_budget_ms)
+        else:
+            self._sliced_search = SlicedSearch(
+                self._player.ponder_steps(self._searching,
+                                          self._time_budget_ms),
+                self._slice_ms,
+                self._slice_nodes)
+        return False
+
+    def stop(self):
+        """
+        Function -- stop
+            Stops the running search, without waiting for it, and empties the
+            queue. The replies found so far stay in the cache.
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        if self._searching is not None:
+            if self._background_search is not None:
+                self._background_search.cancel()
+            else:
+                self._sliced_search.cancel()
+                self._sliced_search = None
+            self._searching = None
+        self._queue = []
+
+    def lookup(self, position, color):
+        """
+        Function -- lookup
+            Returns the computer's reply found while pondering a position
+        Parameters:
+            position: Position, the position on the board
+            color: str, the color of the computer player, to move
+        Returns:
+            reply: Optional[tuple[Optional[int], int]], the bit index of the
+                reply (None if the computer has no legal move) and the depth
+                its iterative deepening search reached (0 if the book or the
+                endgame solver chose it), or None if the position was not
+                pondered
+        """
+        return self._cache.get(self._key(position, color))
@@ -0,0 +1,117 @@
+from background_search import BackgroundSearch
+from bitboard import Bitboard
+from player import Player
+from ponder import Ponder
+from position import Position
+
+import pytest
+import time
+
+
+def test_constructor():
+    p: Player = Player(None, "Computer", "white", position=Position(8))
+    pd: Ponder = Ponder(p, time_budget_ms=50, max_replies=2, slice_ms=8)
+    assert pd.player is p
+    assert pd.time_budget_ms == 50
+    assert pd.max_replies == 2
+    assert pd.queue == []
+    assert pd.cache == {}
+    assert not pd.running
+    with pytest.raises(ValueError):
+        Ponder(p)
+
+
+def test_start():
+    position: Position = Position(8)
+    p: Player = Player(None, "Computer", "white", position=position)
+    pd: Ponder = Ponder(p, slice_nodes=500)
+    pd.start(position, "black")
+    # Every legal move of black is queued, most likely first
+    assert len(pd.queue) == 4
+    scores = [pd.evaluator.evaluate(reply.tiles("white"),
+                                    reply.tiles("black"))
+              for reply in pd.queue]
+    assert scores == sorted(scores)
+    assert position.black_tiles == 2
+
+    pd: Ponder = Ponder(p, max_replies=2, slice_nodes=500)
+    pd.start(position, "black")
+    assert len(pd.queue) == 2
+
+
+def test_advance():
+    position: Position = Position(8)
+    p: Player = Player(None, "Computer", "white", position=position)
+    pd: Ponder = Ponder(p, max_replies=2, slice_nodes=500)
+    pd.start(position, "black")
+    replies = list(pd.queue)
+
+    assert not pd.advance()
+    assert pd.running
+    while not pd.advance():
+        pass
+    assert not pd.running
+    assert len(pd.cache) == 2
+    for reply in replies:
+        index, depth = pd.lookup(reply, "white")
+        assert index in Bitboard.yield_indices(
+            reply.bitboard.calculate_move_mask("white"))
+        assert depth == p.MAX_RECURSION_DEPTH
+    assert pd.lookup(position, "white") is None
+    # The player is left on its own position
+    assert p.position is position
+
+
+def test_advance_solved():
+    position: Position = Position(4)
+    position.apply_move(position.legal_moves()[0])
+    position.apply_move(position.legal_moves()[0])
+    p: Player = Player(None, "Computer", "white", position=position)
+    pd: Ponder = Ponder(p, slice_nodes=500)
+    pd.start(position, "black")
+    while not pd.advance():
+        pass
+    # The endgame solver plays every reply with 9 empty squares left, so
+    # no depth of the search is cached to resume from
+    assert len(pd.cache) == 3
+    for index, depth in pd.cache.values():
+        assert index is not None
+        assert depth == 0
+
+
+def test_stop():
+    position: Position = Position(8)
+    p: Player = Player(None, "Computer", "white", position=position)
+    pd: Ponder = Ponder(p, slice_nodes=500)
+    pd.start(position, "black")
+    while not pd.cache:
+        pd.advance()
+    pd.stop()
+    assert not pd.running
+    assert pd.queue == []
+    # The replies found before the stop are kept until the next start
+    assert len(pd.cache) == 1
+    assert p.position is position
+    pd.start(position, "black")
+    assert pd.cache == {}
+
+
+def test_background_search():
+    position: Position = Position(8)
+    p: Player = Player(None, "Computer", "white", position=position)
+    bs: BackgroundSearch = BackgroundSearch()
+    pd: Ponder = Ponder(p, time_budget_ms=50, max_replies=1,
+                        background_search=bs)
+    try:
+        pd.start(position, "black")
+        reply = pd.queue[0]
+        deadline = time.time() + 30
+        while not pd.advance() and time.time() < deadline:
+            time.sleep(0.01)
+        index, depth = pd.lookup(reply, "white")
+        assert index in Bitboard.yield_indices(
+            reply.bitboard.calculate_move_mask("white"))
+        assert depth >= 1
+        assert not bs.running
+    finally:
+        bs.shutdown()
@@ -0,0 +1,377 @@
+from bitboard import Bitboard
+from move import Move
+from zobrist import Zobrist
+
+
+# Derives from object so that its setters and copy also work on Python 2.7
+# (Jython)
+class Position(object):
+    """
+    Purpose:
+    The Position class holds the state of an Othello game and applies its
+    rules without any rendering data: the tiles as a Bitboard, the color of
+    the player to move, the Zobrist hash of the position and the frontier of
+    empty squares next to a tile. It needs no Processing runtime, so the AIs,
+    tests and headless tools run on it directly. GameBoard wraps a Position
+    and projects it onto BoardSquares and Tiles drawn on the screen.
+
+    Methods:
+    _generate_neighbor_masks: creates the bitmasks of the squares adjacent to
+        each square of a board
+    _set_starting_tiles: places the black and white starting tiles
+    tiles: returns the bitmask of tiles for a given color
+    update_frontier: adds the empty neighbors of a newly placed tile to the
+        frontier
+    potential_mobility: counts the frontier squares next to a player's
+        opponent
+    legal_moves: returns the legal moves of a player
+    has_legal_move: returns whether a player has a legal move
+    apply_move: places a move's tile, flips its tiles and records the change
+        on the undo stack
+    pass_turn: gives the turn to the other player without a move
+    undo_move: reverts the most recent move or pass on the undo stack
+    is_game_over: returns whether neither player can move
+    winner: returns the color of the player with the most tiles
+    copy: returns an independent copy of the position
+
+    Attributes:
+    _size: int, the number of squares along one side of the board
+    _bitboard: Bitboard, bitmask representation of the tiles on the board
+    _zobrist: Zobrist, the keys used to hash the positions
+    _side_to_move: str, the color of the player whose turn it is
+    _position_hash: int, 64-bit Zobrist hash of the tiles and side to move,
+        updated incrementally as tiles are placed and flipped
+    _NEIGHBOR_MASKS: list[int], for each square index, the bitmask of the
+        squares adjacent to it
+    _frontier: int, bitmask of the empty squares adjacent to at least one
+        tile; only these squares can be legal moves
+    _undo_stack: list[tuple], one record per applied move or pass holding the
+        bitboard masks, side to move, hash and frontier from before it
+    """
+
+    # Neighbor masks depend only on the number of squares per side, so they
+    # are shared by all Position instances of the same size
+    _NEIGHBOR_MASK_CACHE = {}
+
+    def __init__(self, size=8, black=None, white=None, side_to_move="black"):
+        self._size = size
+        self._bitboard = Bitboard(size)
+        if black is None and white is None:
+            self._set_starting_tiles()
+        else:
+            self._bitboard.black = black or 0
+            self._bitboard.white = white or 0
+        self._zobrist = Zobrist(size)
+        self._side_to_move = side_to_move
+        self._position_hash = self._zobrist.calculate_hash(
+            self._bitboard.black, self._bitboard.white, side_to_move)
+        self._NEIGHBOR_MASKS = self._generate_neighbor_masks(size)
+        self._frontier = (self._bitboard.empty &
+                          self._bitboard.generate_neighbors(
+                              self._bitboard.black | self._bitboard.white))
+        self._undo_stack = []
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    @property
+    def bitboard(self):
+        """getter method for self._bitboard"""
+        return self._bitboard
+
+    @property
+    def zobrist(self):
+        """getter method for self._zobrist"""
+        return self._zobrist
+
+    @property
+    def side_to_move(self):
+        """getter method for self._side_to_move"""
+        return self._side_to_move
+
+    @side_to_move.setter
+    def side_to_move(self, color):
+        """setter method for self._side_to_move, updating the hash"""
+        if color != self._side_to_move:
+            self._position_hash ^= self._zobrist.SIDE_KEY
+            self._side_to_move = color
+
+    @property
+    def position_hash(self):
+        """getter method for self._position_hash"""
+        return self._position_hash
+
+    @position_hash.setter
+    def position_hash(self, position_hash):
+        """setter method for self._position_hash"""
+        self._position_hash = position_hash
+
+    @property
+    def frontier(self):
+        """getter method for self._frontier"""
+        return self._frontier
+
+    @property
+    def undo_stack(self):
+        """getter method for self._undo_stack"""
+        return self._undo_stack
+
+    @property
+    def black_tiles(self):
+        """getter method for the number of black tiles on the board"""
+        return Bitboard.popcount(self._bitboard.black)
+
+    @property
+    def white_tiles(self):
+        """getter method for the number of white tiles on the board"""
+        return Bitboard.popcount(self._bitboard.white)
+
+    @property
+    def empty_tiles(self):
+        """getter method for the number of empty squares on the board"""
+        return Bitboard.popcount(self._bitboard.empty)
+
+    @classmethod
+    def _generate_neighbor_masks(cls, size):
+        """
+        Function -- _generate_neighbor_masks
+            Creates, for each square of a board with the given number of
+            squares per side, the bitmask of the squares adjacent to it.
+            Neighbor masks are computed once per board size.
+        Parameters:
+            size: int, the number of squares along one side of the board
+        Returns:
+            neighbor_masks: list[int], the neighbor mask of each square index
+        """
+        if size in cls._NEIGHBOR_MASK_CACHE:
+            return cls._NEIGHBOR_MASK_CACHE[size]
+
+        bitboard = Bitboard(size)
+        neighbor_masks = [bitboard.generate_neighbors(1 << index)
+                          for index in range(size * size)]
+
+        cls._NEIGHBOR_MASK_CACHE[size] = neighbor_masks
+        return neighbor_masks
+
+    def _set_starting_tiles(self):
+        """
+        Function -- _set_starting_tiles
+            Places the 2 black and 2 white starting tiles diagonally across
+            the middle of the board. Boards with fewer than 2 squares per
+            side start empty.
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        if self._size < 2:
+            return
+
+        # For 8 squares per side, the starting tiles cover rows/columns 3-4
+        middle = self._size // 2
+        self._bitboard.place("white", middle - 1, middle - 1)
+        self._bitboard.place("black", middle, middle - 1)
+        self._bitboard.place("black", middle - 1, middle)
+        self._bitboard.place("white", middle, middle)
+
+    def tiles(self, color):
+        """
+        Function -- tiles
+            Returns the bitmask of all tiles of the given color
+        Parameters:
+            color: str, the color of the tiles ("black" or "white")
+        Returns:
+            tiles: int, bitmask of the squares holding tiles of that color
+        """
+        return self._bitboard.tiles(color)
+
+    def update_frontier(self, square_index):
+        """
+        Function -- update_frontier
+            Updates the frontier after a tile is placed on a square: the
+            square leaves the frontier and its empty neighbors join it
+        Parameters:
+            square_index: int, the bit index of the square the tile was
+                placed on
+        Returns:
+            None
+        """
+        self._frontier = ((self._frontier |
+                           self._NEIGHBOR_MASKS[square_index]) &
+                          self._bitboard.empty)
+
+    def potential_mobility(self, color):
+        """
+        Function -- potential_mobility
+            Counts the frontier squares adjacent to at least one tile of the
+            player's opponent. These are the squares the player may be able
+            to move to later in the game, which evaluation functions can use
+            alongside the number of legal moves.
+        Parameters:
+            color: str, the color of the player
+        Returns:
+            potential_mobility: int, the number of such frontier squares
+        """
+        opponent = (self._bitboard.white if color == "black"
+                    else self._bitboard.black)
+        return Bitboard.popcount(
+            self._frontier & self._bitboard.generate_neighbors(opponent))
+
+    def legal_moves(self, color=None):
+        """
+        Function -- legal_moves
+            Calculates every legal move of a player, in row-major order of the
+            board
+        Parameters:
+            color: Optional[str], the color of the player, defaults to the
+                player to move
+        Returns:
+            legal_moves: list[Move], all legal moves of the player
+        """
+        if color is None:
+            color = self._side_to_move
+        return [Move(index, flip_mask, color)
+                for index, flip_mask in self._bitboard.calculate_legal_moves(
+                    color)]
+
+    def has_legal_move(self, color=None):
+        """
+        Function -- has_legal_move
+            Checks whether a player has at least one legal move
+        Parameters:
+            color: Optional[str], the color of the player, defaults to the
+                player to move
+        Returns:
+            has_legal_move: bool, True if the player can move
+        """
+        if color is None:
+            color = self._side_to_move
+        return bool(self._bitboard.calculate_move_mask(color))
+
+    def apply_move(self, move, color=None):
+        """
+        Function -- apply_move
+            Places a tile on the move's square, flips the move's tiles and
+            gives the turn to the other player. A compact record of the
+            change is pushed onto the undo stack so that the move can be
+            reverted with undo_move instead of copying the position.
+        Parameters:
+            move: Move, the legal move to execute
+            color: Optional[str], the color of the player making the move,
+                defaults to the color the move was generated for, or the
+                player to move
+        Returns:
+            None
+        """
+        if color is None:
+            color = move.color or self._side_to_move
+
+        index = move.index
+        flip_mask = move.flip_mask
+
+        self._undo_stack.append((self._bitboard.black,
+                                 self._bitboard.white,
+                                 self._side_to_move,
+                                 self._position_hash,
+                                 self._frontier))
+
+        self._bitboard.make_move(color, index, flip_mask)
+        self.update_frontier(index)
+
+        self._position_hash ^= self._zobrist.tile_key(color, index)
+        for flip_index in Bitboard.yield_indices(flip_mask):
+            self._position_hash ^= self._zobrist.flip_key(flip_index)
+        self.side_to_move = "white" if color == "black" else "black"
+
+    def pass_turn(self):
+        """
+        Function -- pass_turn
+            Gives the turn to the other player without placing a tile, for a
+            player with no legal move. The pass is recorded on the undo stack
+            like a move.
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        self._undo_stack.append((self._bitboard.black,
+                                 self._bitboard.white,
+                                 self._side_to_move,
+                                 self._position_hash,
+                                 self._frontier))
+        self.side_to_move = ("white" if self._side_to_move == "black"
+                             else "black")
+
+    def undo_move(self):
+        """
+        Function -- undo_move
+            Reverts the most recent move or pass made with apply_move or
+            pass_turn by restoring the bitboard masks, side to move, position
+            hash and frontier
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        (self._bitboard.black,
+         self._bitboard.white,
+         self._side_to_move,
+         self._position_hash,
+         self._frontier) = self._undo_stack.pop()
+
+    def is_game_over(self):
+        """
+        Function -- is_game_over
+            Checks whether the game has ended: the board is full or neither
+            player has a legal move
+        Parameters:
+            None
+        Returns:
+            is_game_over: bool, True if neither player can move
+        """
+        return not (self._bitboard.calculate_move_mask("black") or
+                    self._bitboard.calculate_move_mask("white"))
+
+    def winner(self):
+        """
+        Function -- winner
+            Compares the black and white tile counts of the position
+        Parameters:
+            None
+        Returns:
+            winner: Optional[str], the color with the most tiles, or None on
+                a tie
+        """
+        black_tiles = self.black_tiles
+        white_tiles = self.white_tiles
+        if black_tiles > white_tiles:
+            return "black"
+        elif white_tiles > black_tiles:
+            return "white"
+        return None
+
+    def copy(self):
+        """
+        Function -- copy
+            Creates an independent copy of the position with an empty undo
+            stack. Only the integers describing the position are copied;
+            the Zobrist keys and neighbor masks are shared per board size.
+        Parameters:
+            None
+        Returns:
+            position: Position, the copy of the position
+        """
+        position = Position.__new__(Position)
+        position._size = self._size
+        position._bitboard = Bitboard(self._size,
+                                      self._bitboard.black,
+                                      self._bitboard.white)
+        position._zobrist = self._zobrist
+        position._side_to_move = self._side_to_move
+        position._position_hash = self._position_hash
+        position._NEIGHBOR_MASKS = self._NEIGHBOR_MASKS
+        position._frontier = self._frontier
+        position._undo_stack = []
+        return position
@@ -0,0 +1,141 @@
+from move import Move
+from position import Position
+
+
+def test_constructor():
+    p: Position = Position()
+    assert isinstance(p, Position)
+    assert p.size == 8
+    assert p.side_to_move == "black"
+    assert p.bitboard.black == (1 << 28) | (1 << 35)
+    assert p.bitboard.white == (1 << 27) | (1 << 36)
+    assert p.black_tiles == 2
+    assert p.white_tiles == 2
+    assert p.empty_tiles == 60
+    assert p.position_hash == p.zobrist.calculate_hash(
+        p.bitboard.black, p.bitboard.white, "black")
+    assert p.undo_stack == []
+
+    # Positions can start from given tiles and side to move
+    p = Position(4, black=1, white=2, side_to_move="white")
+    assert p.bitboard.black == 1
+    assert p.bitboard.white == 2
+    assert p.position_hash == p.zobrist.calculate_hash(1, 2, "white")
+
+    # Boards too small for the starting tiles start empty
+    p = Position(0)
+    assert p.bitboard.black == 0
+    assert p.bitboard.white == 0
+
+
+def test__generate_neighbor_masks():
+    assert Position._generate_neighbor_masks(8)[0] == (
+        (1 << 1) | (1 << 8) | (1 << 9))
+    assert Position._generate_neighbor_masks(8) is (
+        Position._generate_neighbor_masks(8))
+
+
+def test_frontier():
+    p: Position = Position()
+    # The 12 empty squares around the 4 starting tiles
+    block = 0
+    for y_index in range(2, 6):
+        for x_index in range(2, 6):
+            block |= 1 << (y_index * 8 + x_index)
+    assert p.frontier == block & p.bitboard.empty
+    assert p.potential_mobility("black") == 10
+
+
+def test_legal_moves():
+    p: Position = Position()
+    assert p.legal_moves() == [Move(19, 1 << 27, "black"),
+                               Move(26, 1 << 27, "black"),
+                               Move(37, 1 << 36, "black"),
+                               Move(44, 1 << 36, "black")]
+    assert [move.index for move in p.legal_moves("white")] == (
+        [20, 29, 34, 43])
+    assert p.has_legal_move() is True
+
+    # Neither player can move on an empty board
+    p = Position(8, black=0, white=0)
+    assert p.legal_moves() == []
+    assert p.has_legal_move("white") is False
+    assert p.is_game_over() is True
+
+
+def test_apply_move():
+    p: Position = Position()
+    start_hash = p.position_hash
+    start_frontier = p.frontier
+
+    p.apply_move(p.legal_moves()[0])
+    assert p.side_to_move == "white"
+    assert p.black_tiles == 4
+    assert p.white_tiles == 1
+    assert p.empty_tiles == 59
+    assert not p.frontier & (1 << 19)
+    assert p.position_hash == p.zobrist.calculate_hash(
+        p.bitboard.black, p.bitboard.white, "white")
+    assert len(p.undo_stack) == 1
+
+    p.undo_move()
+    assert p.side_to_move == "black"
+    assert p.black_tiles == 2
+    assert p.position_hash == start_hash
+    assert p.frontier == start_frontier
+    assert p.undo_stack == []
+
+
+def test_pass_turn():
+    p: Position = Position()
+    start_hash = p.position_hash
+
+    p.pass_turn()
+    assert p.side_to_move == "white"
+    assert p.position_hash == start_hash ^ p.zobrist.SIDE_KEY
+    assert len(p.undo_stack) == 1
+
+    p.undo_move()
+    assert p.side_to_move == "black"
+    assert p.position_hash == start_hash
+
+
+def test_is_game_over():
+    p: Position = Position()
+    assert p.is_game_over() is False
+
+    # Play out a game choosing the first legal move, passing when stuck
+    passes = 0
+    while passes < 2:
+        legal_moves = p.legal_moves()
+        if legal_moves:
+            p.apply_move(legal_moves[0])
+            passes = 0
+        else:
+            p.pass_turn()
+            passes += 1
+    assert p.is_game_over() is True
+
+
+def test_winner():
+    assert Position().winner() is None
+    assert Position(4, black=3, white=4).winner() == "black"
+    assert Position(4, black=1, white=6).winner() == "white"
+
+
+def test_copy():
+    p: Position = Position()
+    p.apply_move(p.legal_moves()[0])
+
+    copy: Position = p.copy()
+    assert copy.bitboard.black == p.bitboard.black
+    assert copy.bitboard.white == p.bitboard.white
+    assert copy.side_to_move == p.side_to_move
+    assert copy.position_hash == p.position_hash
+    assert copy.frontier == p.frontier
+    assert copy.undo_stack == []
+
+    # Moves made on the copy leave the original untouched
+    copy.apply_move(copy.legal_moves()[0])
+    assert copy.bitboard.white != p.bitboard.white
+    assert p.side_to_move == "white"
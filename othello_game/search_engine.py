@@ -0,0 +1,893 @@
+from bitboard import Bitboard
+from move_ordering import MoveOrdering
+from search_stats import SearchStats
+from transposition_table import TranspositionTable
+from zobrist import Zobrist
+
+import time
+
+# Clock for timing the phases of a search; Python 2.7 has no perf_counter
+_phase_clock = getattr(time, "perf_counter", time.time)
+
+
+class SearchTimeout(Exception):
+    """Raised inside a search once its time budget has been used up or it
+    has been stopped"""
+    pass
+
+
+class SearchResult:
+    """
+    Purpose:
+    The SearchResult class carries the result of a search generator, such
+    as SearchEngine.search_steps. Generators cannot return a value on Python
+    2.7, which the Processing sketch runs on, so a search generator yields
+    the node counts of its steps and then its result in a SearchResult as
+    its last step.
+
+    Attributes:
+    _value: the result of the search
+    """
+
+    def __init__(self, value):
+        self._value = value
+
+    @property
+    def value(self):
+        """getter method for self._value"""
+        return self._value
+
+
+def run_steps(steps):
+    """
+    Function -- run_steps
+        Runs a search generator, such as SearchEngine.search_steps, to the end
+        without pausing
+    Parameters:
+        steps: generator, the steps of the search
+    Returns:
+        result: the value of the SearchResult the generator yields last
+    """
+    for step in steps:
+        if isinstance(step, SearchResult):
+            steps.close()
+            return step.value
+
+
+class SearchEngine:
+    """
+    Purpose:
+    The SearchEngine class runs the computer's hard AI search. It performs a
+    negamax search with alpha-beta pruning directly on bitboard tile masks,
+    so positions are never copied: each node derives its children's masks
+    from its own. Leaf positions are scored by a static evaluation that
+    rewards corners, edges, mobility and tiles and penalizes the squares
+    surrounding an empty corner (the BoardCorner x_squares). Moves are
+    searched in the order given by a MoveOrdering, so that cutoffs happen as
+    early as possible.
+
+    The search is written as a generator (search_steps) so that it can run
+    in slices, for example one slice per frame on a single-threaded
+    runtime. The upper plies yield after searching each child, and any
+    child with slice_depth plies or fewer left is searched in one go by the
+    plain recursive _negamax, which bounds the work between two yields. Both
+    share the work done at a position before and after its children are
+    searched (_expand, _make_child and _store).
+    search runs the generator to the end, only pausing between root moves
+    so that the whole tree below them runs at full speed. Every search
+    records a SearchStats of the nodes it visited and the transposition
+    table's hit rate. The time spent in move generation, evaluation and
+    making moves is only measured with time_phases set, since reading the
+    clock at every node slows the search down.
+
+    Methods:
+    _generate_evaluation_masks: creates the corner, edge and x-square masks
+        used by the static evaluation
+    search: returns the best move and its score for a given position,
+        deepening the search iteratively until a time budget is used up
+    search_steps: the search as a generator that can be paused between
+        slices of work
+    _search_root_steps: searches every legal move of the root position to
+        a given depth
+    _child_hash: updates a position hash for a move
+    _expand: counts a position and settles it, or orders its moves
+    _make_child: derives the tile masks and hash of the position after a
+        move
+    _store: records the result of a position's search
+    _negamax_steps: scores a position of the upper plies, pausing between
+        its children
+    _negamax: recursively scores a position with alpha-beta pruning
+    evaluate: statically scores a position for the player to move
+    _final_score: scores a position in which neither player can move
+    _out_of_time: checks whether the running search must stop
+    _create_stats: builds the SearchStats of the last search
+
+    Attributes:
+    _size: int, the number of squares along one side of the board
+    _bitboard: Bitboard, move generator for boards of the given size
+    _max_depth: int, the default number of plies searched
+    _nodes: int, the number of positions visited during the last search
+    _depth_reached: int, the deepest fully completed depth of the last search
+    _leaf_evaluations: int, the number of leaf positions scored during the
+        last search
+    _interior_nodes: int, the number of positions whose moves were searched
+        during the last search
+    _moves_generated: int, the number of legal moves found at those
+        positions
+    _table_cutoffs: int, the number of transposition table hits that ended
+        the search of a position during the last search
+    _move_generation_time: float, the time (s) the last search spent
+        generating legal moves
+    _evaluation_time: float, the time (s) the last search spent scoring
+        leaf positions
+    _make_move_time: float, the time (s) the last search spent deriving the
+        tile masks and hash of child positions
+    _time_phases: bool, whether searches measure the time spent in move
+        generation, evaluation and making moves
+    _stats: Optional[SearchStats], the stats of the last search
+    _iteration_results: list[tuple[int, int, int]], the depth, best move and
+        score of every completed depth of the last search
+    _deadline: Optional[float], the time (s) at which the running search
+        must stop, if it has a time budget
+    _slice_depth: Optional[int], the plies left at or below which the
+        running search stops pausing, or None to pause only at the root
+    _stop_event: Optional[Event], stops the running search once set, such
+        as when another process cancels it
+    _zobrist: Zobrist, the keys used to hash positions during the search
+    _transposition_table: Optional[TranspositionTable], cache of search
+        results kept between searches, if enabled
+    _move_ordering: Optional[MoveOrdering], the killer moves, history and
+        square priorities used to order moves, if enabled
+    _CORNER_MASK: int, bitmask of the 4 corner squares
+    _EDGE_MASK: int, bitmask of all non-corner squares on the board edges
+    _X_SQUARE_MASKS: list[tuple[int, int]], (corner bit, x-square mask) pairs
+        for each of the 4 corners
+    """
+
+    EVALUATION_WEIGHTS = {
+        "CORNER_SQUARE": 100,
+        "EDGE_SQUARE": 10,
+        "X_SQUARE": 40,
+        "MOBILITY": 8,
+        "TILE": 1,
+    }
+
+    WIN_SCORE = 10000
+    TIME_CHECK_INTERVAL = 1024  # nodes visited between clock reads
+    SLICE_DEPTH = 1  # plies left below which a subtree is searched in one go
+
+    def __init__(self, size, max_depth=6, table_size_mb=4,
+                 use_move_ordering=True, board_corners=None,
+                 time_phases=False):
+        self._size = size
+        self._bitboard = Bitboard(size)
+        self._max_depth = max_depth
+        self._nodes = 0
+        self._depth_reached = 0
+        self._leaf_evaluations = 0
+        self._interior_nodes = 0
+        self._moves_generated = 0
+        self._table_cutoffs = 0
+        self._move_generation_time = 0.0
+        self._evaluation_time = 0.0
+        self._make_move_time = 0.0
+        self._time_phases = time_phases
+        self._stats = None
+        self._iteration_results = []
+        self._deadline = None
+        self._slice_depth = None
+        self._stop_event = None
+        self._zobrist = Zobrist(size)
+        self._transposition_table = (TranspositionTable(table_size_mb)
+                                     if table_size_mb else None)
+        self._move_ordering = (MoveOrdering(size, board_corners)
+                               if use_move_ordering else None)
+        self._generate_evaluation_masks()
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    @property
+    def max_depth(self):
+        """getter method for self._max_depth"""
+        return self._max_depth
+
+    @max_depth.setter
+    def max_depth(self, max_depth):
+        """setter method for self._max_depth"""
+        self._max_depth = max_depth
+
+    @property
+    def nodes(self):
+        """getter method for self._nodes"""
+        return self._nodes
+
+    @property
+    def depth_reached(self):
+        """getter method for self._depth_reached"""
+        return self._depth_reached
+
+    @property
+    def stop_event(self):
+        """getter method for self._stop_event"""
+        return self._stop_event
+
+    @stop_event.setter
+    def stop_event(self, stop_event):
+        """setter method for self._stop_event"""
+        self._stop_event = stop_event
+
+    @property
+    def time_phases(self):
+        """getter method for self._time_phases"""
+        return self._time_phases
+
+    @time_phases.setter
+    def time_phases(self, time_phases):
+        """setter method for self._time_phases"""
+        self._time_phases = time_phases
+
+    @property
+    def stats(self):
+        """getter method for self._stats"""
+        return self._stats
+
+    @property
+    def iteration_results(self):
+        """getter method for self._iteration_results"""
+        return self._iteration_results
+
+    @property
+    def transposition_table(self):
+        """getter method for self._transposition_table"""
+        return self._transposition_table
+
+    @property
+    def move_ordering(self):
+        """getter method for self._move_ordering"""
+        return self._move_ordering
+
+    @transposition_table.setter
+    def transposition_table(self, transposition_table):
+        """setter method for self._transposition_table"""
+        self._transposition_table = transposition_table
+
+    def _generate_evaluation_masks(self):
+        """
+        Function -- _generate_evaluation_masks
+            Creates the corner, edge and x-square bitmasks for the board size.
+            The x-squares of each corner are the 3 squares surrounding it,
+            matching the squares tracked by the GameBoard's BoardCorners.
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        max_index = self._size - 1
+        index = self._bitboard.index
+        corners = ((0, 0, 1, 1),
+                   (max_index, 0, -1, 1),
+                   (0, max_index, 1, -1),
+                   (max_index, max_index, -1, -1))
+
+        self._CORNER_MASK = 0
+        self._EDGE_MASK = 0
+        self._X_SQUARE_MASKS = []
+
+        if self._size < 2:
+            return
+
+        for x_index, y_index, x_dir, y_dir in corners:
+            corner_bit = 1 << index(x_index, y_index)
+            x_square_mask = (
+                (1 << index(x_index + x_dir, y_index)) |
+                (1 << index(x_index + x_dir, y_index + y_dir)) |
+                (1 << index(x_index, y_index + y_dir))
+            )
+            self._CORNER_MASK |= corner_bit
+            self._X_SQUARE_MASKS.append((corner_bit, x_square_mask))
+
+        for coordinate in range(self._size):
+            self._EDGE_MASK |= (
+                (1 << index(coordinate, 0)) |
+                (1 << index(coordinate, max_index)) |
+                (1 << index(0, coordinate)) |
+                (1 << index(max_index, coordinate))
+            )
+        self._EDGE_MASK &= ~self._CORNER_MASK
+
+    def search(self, bitboard, color, depth=None, time_budget_ms=None,
+               root_moves=None, start_depth=1):
+        """
+        Function -- search
+            Searches the position on the given bitboard for the player of the
+            given color and returns the best move found along with its score.
+            The search is deepened one ply at a time, starting each depth
+            from the best move of the previous one. With a time budget, the
+            search deepens until the budget is used up (or the whole game has
+            been searched) and the best move of the last completed depth is
+            returned. The budget holds from the first depth on, whatever the
+            start depth: if it runs out before any depth completes, the first
+            legal move is returned with no score.
+        Parameters:
+            bitboard: Bitboard, the tiles of the position to search
+            color: str, the color of the player to move
+            depth: Optional[int], the maximum number of plies to search,
+                defaults to the engine's max_depth without a time budget and
+                to the number of empty squares with one
+            time_budget_ms: Optional[int], the wall-clock time (ms) the search
+                may use
+            root_moves: Optional[list[int]], restricts the search to these
+                bit indices of the root legal moves, searched in this order
+            start_depth: int, the first depth searched
+        Returns:
+            best_move: tuple[Optional[int], Optional[int]], the bit index of
+                the best move (None if the player has no legal move) and its
+                score from the player's point of view (None if no depth
+                completed); the search's SearchStats are kept in stats
+        """
+        return run_steps(self.search_steps(bitboard, color, depth,
+                                           time_budget_ms, root_moves,
+                                           start_depth, slice_depth=None))
+
+    def search_steps(self, bitboard, color, depth=None, time_budget_ms=None,
+                     root_moves=None, start_depth=1, slice_depth=SLICE_DEPTH):
+        """
+        Function -- search_steps
+            Runs the search (see search) as a generator. Each step searches
+            at most one subtree of slice_depth plies, then yields, so the
+            caller can pause the search between steps and resume it later by
+            asking for the next step. A time budget is measured in wall-clock
+            time, including any pauses.
+        Parameters:
+            bitboard: Bitboard, the tiles of the position to search
+            color: str, the color of the player to move
+            depth: Optional[int], the maximum number of plies to search
+            time_budget_ms: Optional[int], the wall-clock time (ms) the search
+                may use
+            root_moves: Optional[list[int]], restricts the search to these
+                bit indices of the root legal moves, searched in this order
+            start_depth: int, the first depth searched
+            slice_depth: Optional[int], the plies left at or below which a
+                subtree is searched in one step, or None to yield only
+                between root moves
+        Returns:
+            steps: generator, yields the number of nodes visited so far after
+                each step, then a SearchResult of the best move and its score
+                (see search)
+        """
+        start_time = time.time()
+        own = bitboard.tiles(color)
+        opponent = bitboard.black if color == "white" else bitboard.white
+        empty_squares = Bitboard.popcount(bitboard.empty)
+        position_hash = self._zobrist.calculate_hash(bitboard.black,
+                                                     bitboard.white,
+                                                     color)
+
+        if depth is None:
+            depth = (self._max_depth if time_budget_ms is None
+                     else empty_squares)
+
+        self._nodes = 1
+        self._depth_reached = 0
+        self._leaf_evaluations = 0
+        self._interior_nodes = 0
+        self._moves_generated = 0
+        self._table_cutoffs = 0
+        self._move_generation_time = 0.0
+        self._evaluation_time = 0.0
+        self._make_move_time = 0.0
+        self._deadline = None
+        self._slice_depth = slice_depth
+        self._iteration_results = []
+        table = self._transposition_table
+        table_counts = ((table.hits, table.misses) if table is not None
+                        else (0, 0))
+        if self._move_ordering is not None:
+            self._move_ordering.new_search()
+
+        moves = list(Bitboard.yield_indices(
+            self._bitboard.generate_moves(own, opponent)))
+        if root_moves is not None:
+            moves = [index for index in root_moves if index in moves]
+        if not moves:
+            self._leaf_evaluations = 1
+            self._create_stats(start_time, table_counts)
+            yield SearchResult((None, self.evaluate(own, opponent)))
+            return
+
+        self._interior_nodes = 1
+        self._moves_generated = len(moves)
+        best_index, best_score = moves[0], None
+        start_depth = max(1, min(start_depth, depth))
+        if time_budget_ms is not None:
+            # A search resumed at a pondered depth must not run past the
+            # budget on its first depth either
+            self._deadline = start_time + time_budget_ms / 1000.0
+        for iteration_depth in range(start_depth, max(depth, 1) + 1):
+            try:
+                for step in self._search_root_steps(own, opponent, moves,
+                                                    iteration_depth,
+                                                    position_hash, color):
+                    if isinstance(step, SearchResult):
+                        best_index, best_score = step.value
+                    else:
+                        yield step
+            except SearchTimeout:
+                break
+
+            self._depth_reached = iteration_depth
+            self._iteration_results.append(
+                (iteration_depth, best_index, best_score))
+
+            # Search the previous best move first at the next depth
+            moves.remove(best_index)
+            moves.insert(0, best_index)
+
+            if iteration_depth >= empty_squares:
+                break
+
+        self._deadline = None
+        self._create_stats(start_time, table_counts)
+        yield SearchResult((best_index, best_score))
+
+    def _create_stats(self, start_time, table_counts):
+        """
+        Function -- _create_stats
+            Builds the SearchStats of the search that has just finished from
+            the engine's counters and the transposition table's counters
+        Parameters:
+            start_time: float, the time (s) the search started
+            table_counts: tuple[int, int], the table's hits and misses when
+                the search started
+        Returns:
+            None
+        """
+        table_hits, table_probes = 0, 0
+        if self._transposition_table is not None:
+            table_hits = self._transposition_table.hits - table_counts[0]
+            table_probes = table_hits + (self._transposition_table.misses -
+                                         table_counts[1])
+
+        self._stats = SearchStats(
+            nodes=self._nodes,
+            leaf_evaluations=self._leaf_evaluations,
+            interior_nodes=self._interior_nodes,
+            moves_generated=self._moves_generated,
+            depth_reached=self._depth_reached,
+            elapsed_s=time.time() - start_time,
+            table_probes=table_probes,
+            table_hits=table_hits,
+            table_cutoffs=self._table_cutoffs,
+            move_generation_s=self._move_generation_time,
+            evaluation_s=self._evaluation_time,
+            make_move_s=self._make_move_time)
+
+    def _search_root_steps(self, own, opponent, moves, depth, position_hash,
+                           color):
+        """
+        Function -- _search_root_steps
+            Searches every legal move of the root position in the given order
+            to the given depth, yielding the number of nodes visited after
+            each move
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+            moves: list[int], bit indices of the root legal moves
+            depth: int, the number of plies to search
+            position_hash: int, the Zobrist hash of the root position
+            color: str, the color of the player to move
+        Returns:
+            steps: generator, yields the number of nodes visited so far, then
+                a SearchResult of the bit index of the best move and its
+                score
+        """
+        alpha = -self.WIN_SCORE * 2
+        beta = self.WIN_SCORE * 2
+        best_index = None
+        opposing_color = "white" if color == "black" else "black"
+
+        for index in moves:
+            child_own, child_opponent, child_hash = self._make_child(
+                own, opponent, index, position_hash, color)
+            for step in self._negamax_steps(child_own, child_opponent,
+                                            depth - 1, -beta, -alpha,
+                                            child_hash, opposing_color, 1):
+                if isinstance(step, SearchResult):
+                    score = -step.value
+                else:
+                    yield step
+            yield self._nodes
+            if score > alpha:
+                alpha = score
+                best_index = index
+
+        yield SearchResult((best_index, alpha))
+
+    def _child_hash(self, position_hash, color, index, flips):
+        """
+        Function -- _child_hash
+            Updates a position hash for a move: the placed tile, every flipped
+            tile and the change of the side to move
+        Parameters:
+            position_hash: int, the Zobrist hash of the position
+            color: str, the color of the player making the move
+            index: int, the bit index of the move
+            flips: int, bitmask of the tiles flipped by the move
+        Returns:
+            position_hash: int, the Zobrist hash after the move
+        """
+        position_hash ^= (self._zobrist.tile_key(color, index) ^
+                          self._zobrist.SIDE_KEY)
+
+        flip_key = self._zobrist.flip_key
+        while flips:
+            flip = flips & -flips
+            flips ^= flip
+            position_hash ^= flip_key(flip.bit_length() - 1)
+
+        return position_hash
+
+    def _expand(self, own, opponent, depth, alpha, beta, position_hash,
+                color, ply):
+        """
+        Function -- _expand
+            Does the work of a position that comes before searching its
+            children, for both _negamax and _negamax_steps: counts the node,
+            scores a leaf or a finished game, looks the position up in the
+            transposition table and orders its legal moves. Raises
+            SearchTimeout once the search's deadline has passed or its stop
+            event is set.
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+            depth: int, the number of plies left to search
+            alpha: int, the score the player to move is already guaranteed
+            beta: int, the score the opposing player is already guaranteed
+            position_hash: int, the Zobrist hash of the position
+            color: str, the color of the player to move
+            ply: int, the number of moves from the root of the search
+        Returns:
+            node: tuple[Optional[int], Optional[list[int]]], the score of
+                the position if it needs no search, else None and the bit
+                indices of the legal moves in search order, an empty list if
+                the player to move must pass
+        """
+        self._nodes += 1
+        if (not self._nodes % self.TIME_CHECK_INTERVAL and
+                self._out_of_time()):
+            raise SearchTimeout()
+
+        time_phases = self._time_phases
+        if depth <= 0:
+            self._leaf_evaluations += 1
+            if not time_phases:
+                return self.evaluate(own, opponent), None
+            start_time = _phase_clock()
+            score = self.evaluate(own, opponent)
+            self._evaluation_time += _phase_clock() - start_time
+            return score, None
+
+        if time_phases:
+            start_time = _phase_clock()
+        moves = self._bitboard.generate_moves(own, opponent)
+        if not moves:
+            opponent_moves = self._bitboard.generate_moves(opponent, own)
+        if time_phases:
+            self._move_generation_time += _phase_clock() - start_time
+
+        if not moves:
+            if not opponent_moves:
+                self._leaf_evaluations += 1
+                return self._final_score(own, opponent), None
+            return None, []
+
+        table = self._transposition_table
+        table_move = TranspositionTable.NO_MOVE
+        if table is not None:
+            entry = table.probe(position_hash)
+            if entry is not None:
+                entry_depth, bound, score, table_move = entry
+                if entry_depth >= depth and (
+                    bound == TranspositionTable.EXACT or
+                    (bound == TranspositionTable.LOWER_BOUND and
+                     score >= beta) or
+                    (bound == TranspositionTable.UPPER_BOUND and
+                     score <= alpha)
+                ):
+                    self._table_cutoffs += 1
+                    return score, None
+
+        self._interior_nodes += 1
+        self._moves_generated += Bitboard.popcount(moves)
+
+        if self._move_ordering is not None:
+            return None, self._move_ordering.order_moves(moves, table_move,
+                                                         ply, color)
+
+        # Search the table's best move first, then the rest in board order
+        ordered_moves = []
+        if table_move != TranspositionTable.NO_MOVE and (
+                moves >> table_move) & 1:
+            ordered_moves.append(table_move)
+            moves ^= 1 << table_move
+        ordered_moves.extend(Bitboard.yield_indices(moves))
+        return None, ordered_moves
+
+    def _make_child(self, own, opponent, index, position_hash, color):
+        """
+        Function -- _make_child
+            Derives the tile masks and hash of the position after a move,
+            without copying the board
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+            index: int, the bit index of the move
+            position_hash: int, the Zobrist hash of the position
+            color: str, the color of the player to move
+        Returns:
+            child: tuple[int, int, int], the tiles of the player to move
+                after the move, those of their opponent and the hash
+        """
+        if self._time_phases:
+            start_time = _phase_clock()
+        flips = self._bitboard.generate_flips(own, opponent, index)
+        child = (opponent & ~flips,
+                 own | flips | (1 << index),
+                 self._child_hash(position_hash, color, index, flips))
+        if self._time_phases:
+            self._make_move_time += _phase_clock() - start_time
+        return child
+
+    def _store(self, position_hash, depth, alpha, beta, best_score,
+               best_move):
+        """
+        Function -- _store
+            Records the result of a position's search in the transposition
+            table, if there is one, as an exact score or as a bound
+        Parameters:
+            position_hash: int, the Zobrist hash of the position
+            depth: int, the number of plies searched
+            alpha: int, the alpha the position was searched with
+            beta: int, the beta the position was searched with
+            best_score: int, the best score found
+            best_move: int, the bit index of the best move
+        Returns:
+            None
+        """
+        if self._transposition_table is None:
+            return
+
+        if best_score <= alpha:
+            bound = TranspositionTable.UPPER_BOUND
+        elif best_score >= beta:
+            bound = TranspositionTable.LOWER_BOUND
+        else:
+            bound = TranspositionTable.EXACT
+        self._transposition_table.store(position_hash, depth, bound,
+                                        best_score, best_move)
+
+    def _negamax_steps(self, own, opponent, depth, alpha, beta,
+                       position_hash, color, ply):
+        """
+        Function -- _negamax_steps
+            Scores a position of the upper plies of the search exactly as
+            _negamax does, but as a generator that yields the number of nodes
+            visited after searching each child. A position with slice_depth
+            plies or fewer left, or any position below the root when the
+            search has no slice depth, is handed to _negamax, so no step
+            searches more than one such subtree.
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+            depth: int, the number of plies left to search
+            alpha: int, the score the player to move is already guaranteed
+            beta: int, the score the opposing player is already guaranteed
+            position_hash: int, the Zobrist hash of the position
+            color: str, the color of the player to move
+            ply: int, the number of moves from the root of the search
+        Returns:
+            steps: generator, yields the number of nodes visited so far, then
+                a SearchResult of the score of the position for the player to
+                move
+        """
+        if self._slice_depth is None or depth <= self._slice_depth:
+            yield SearchResult(self._negamax(own, opponent, depth, alpha,
+                                             beta, position_hash, color,
+                                             ply))
+            return
+
+        score, ordered_moves = self._expand(own, opponent, depth, alpha,
+                                            beta, position_hash, color, ply)
+        if score is not None:
+            yield SearchResult(score)
+            return
+
+        opposing_color = "white" if color == "black" else "black"
+        if not ordered_moves:
+            for step in self._negamax_steps(
+                    opponent, own, depth, -beta, -alpha,
+                    position_hash ^ self._zobrist.SIDE_KEY, opposing_color,
+                    ply):
+                if isinstance(step, SearchResult):
+                    score = -step.value
+                else:
+                    yield step
+            yield SearchResult(score)
+            return
+
+        original_alpha = alpha
+        best_score = -self.WIN_SCORE * 2
+        best_move = TranspositionTable.NO_MOVE
+
+        for move_number, index in enumerate(ordered_moves):
+            child_own, child_opponent, child_hash = self._make_child(
+                own, opponent, index, position_hash, color)
+            for step in self._negamax_steps(child_own, child_opponent,
+                                            depth - 1, -beta, -alpha,
+                                            child_hash, opposing_color,
+                                            ply + 1):
+                if isinstance(step, SearchResult):
+                    score = -step.value
+                else:
+                    yield step
+            yield self._nodes
+
+            if score > best_score:
+                best_score = score
+                best_move = index
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if self._move_ordering is not None:
+                            self._move_ordering.record_cutoff(
+                                index, ply, depth, color, move_number)
+                        break
+
+        self._store(position_hash, depth, original_alpha, beta, best_score,
+                    best_move)
+        yield SearchResult(best_score)
+
+    def _negamax(self, own, opponent, depth, alpha, beta, position_hash,
+                 color, ply):
+        """
+        Function -- _negamax
+            Scores the position for the player to move by searching all legal
+            moves to the given depth. Moves whose score cannot affect the
+            result at the parent node (score >= beta) cut off the search of
+            the remaining moves. A player without a legal move passes without
+            using up depth; if neither player can move the game is scored as
+            finished. Results are cached in the transposition table, whose
+            stored best move is searched first when the position is seen
+            again; the other moves are ordered by the MoveOrdering, which
+            learns from every cutoff. Raises SearchTimeout once the search's
+            deadline has passed or its stop event is set.
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+            depth: int, the number of plies left to search
+            alpha: int, the score the player to move is already guaranteed
+            beta: int, the score the opposing player is already guaranteed
+            position_hash: int, the Zobrist hash of the position
+            color: str, the color of the player to move
+            ply: int, the number of moves from the root of the search
+        Returns:
+            score: int, the score of the position for the player to move
+        """
+        score, ordered_moves = self._expand(own, opponent, depth, alpha,
+                                            beta, position_hash, color, ply)
+        if score is not None:
+            return score
+
+        opposing_color = "white" if color == "black" else "black"
+        if not ordered_moves:
+            return -self._negamax(opponent, own, depth, -beta, -alpha,
+                                  position_hash ^ self._zobrist.SIDE_KEY,
+                                  opposing_color,
+                                  ply)
+
+        original_alpha = alpha
+        best_score = -self.WIN_SCORE * 2
+        best_move = TranspositionTable.NO_MOVE
+
+        for move_number, index in enumerate(ordered_moves):
+            child_own, child_opponent, child_hash = self._make_child(
+                own, opponent, index, position_hash, color)
+            score = -self._negamax(child_own,
+                                   child_opponent,
+                                   depth - 1,
+                                   -beta,
+                                   -alpha,
+                                   child_hash,
+                                   opposing_color,
+                                   ply + 1)
+
+            if score > best_score:
+                best_score = score
+                best_move = index
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if self._move_ordering is not None:
+                            self._move_ordering.record_cutoff(
+                                index, ply, depth, color, move_number)
+                        break
+
+        self._store(position_hash, depth, original_alpha, beta, best_score,
+                    best_move)
+        return best_score
+
+    def evaluate(self, own, opponent):
+        """
+        Function -- evaluate
+            Statically scores a position for the player to move using the
+            EVALUATION_WEIGHTS: corner and edge tiles, tiles in the x-squares
+            of an empty corner, the difference in legal moves and the
+            difference in tiles
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+        Returns:
+            score: int, the score of the position for the player to move
+        """
+        weights = self.EVALUATION_WEIGHTS
+        popcount = Bitboard.popcount
+
+        score = weights["TILE"] * (popcount(own) - popcount(opponent))
+        score += weights["CORNER_SQUARE"] * (
+            popcount(own & self._CORNER_MASK) -
+            popcount(opponent & self._CORNER_MASK))
+        score += weights["EDGE_SQUARE"] * (
+            popcount(own & self._EDGE_MASK) -
+            popcount(opponent & self._EDGE_MASK))
+
+        occupied = own | opponent
+        for corner_bit, x_square_mask in self._X_SQUARE_MASKS:
+            if not occupied & corner_bit:
+                score -= weights["X_SQUARE"] * (
+                    popcount(own & x_square_mask) -
+                    popcount(opponent & x_square_mask))
+
+        score += weights["MOBILITY"] * (
+            popcount(self._bitboard.generate_moves(own, opponent)) -
+            popcount(self._bitboard.generate_moves(opponent, own)))
+
+        return score
+
+    def _out_of_time(self):
+        """
+        Function -- _out_of_time
+            Checks whether the running search must stop: its deadline has
+            passed or its stop event is set
+        Parameters:
+            None
+        Returns:
+            out_of_time: bool, True if the search must stop
+        """
+        return ((self._deadline is not None and
+                 time.time() > self._deadline) or
+                (self._stop_event is not None and
+                 self._stop_event.is_set()))
+
+    def _final_score(self, own, opponent):
+        """
+        Function -- _final_score
+            Scores a finished game for the player to move. Wins and losses
+            outrank every static evaluation and are separated by the final
+            tile difference.
+        Parameters:
+            own: int, bitmask of the tiles of the player to move
+            opponent: int, bitmask of the opposing player's tiles
+        Returns:
+            score: int, the score of the finished game
+        """
+        tile_difference = (Bitboard.popcount(own) -
+                           Bitboard.popcount(opponent))
+
+        if tile_difference > 0:
+            return self.WIN_SCORE + tile_difference
+        elif tile_difference < 0:
+            return -self.WIN_SCORE + tile_difference
+        return 0
@@ -0,0 +1,232 @@
+from bitboard import Bitboard
+from game_board import GameBoard
+from search_engine import SearchEngine, SearchResult
+
+import random
+import time
+
+
+def minimax(engine, bb, own, opponent, depth):
+    # Reference search without pruning to compare alpha-beta results against
+    if depth == 0:
+        return engine.evaluate(own, opponent)
+    moves = bb.generate_moves(own, opponent)
+    if not moves:
+        if not bb.generate_moves(opponent, own):
+            return engine._final_score(own, opponent)
+        return -minimax(engine, bb, opponent, own, depth)
+    best = None
+    for index in Bitboard.yield_indices(moves):
+        flips = bb.generate_flips(own, opponent, index)
+        score = -minimax(engine, bb, opponent & ~flips,
+                         own | flips | (1 << index), depth - 1)
+        if best is None or score > best:
+            best = score
+    return best
+
+
+def random_position(seed, plies):
+    random.seed(seed)
+    bb: Bitboard = GameBoard(board_size=800).bitboard
+    color = "black"
+    for _ in range(plies):
+        moves = bb.calculate_legal_moves(color)
+        if moves:
+            index, flips = random.choice(moves)
+            bb.make_move(color, index, flips)
+        color = "white" if color == "black" else "black"
+    return bb, color
+
+
+def test_constructor():
+    se: SearchEngine = SearchEngine(8)
+    assert isinstance(se, SearchEngine)
+    assert se.size == 8
+    assert se.max_depth == 6
+    assert se.nodes == 0
+    assert se._CORNER_MASK == (1 | 1 << 7 | 1 << 56 | 1 << 63)
+    assert se._X_SQUARE_MASKS[0] == (1, (1 << 1) | (1 << 9) | (1 << 8))
+
+
+def test_evaluate():
+    se: SearchEngine = SearchEngine(8)
+    bb, color = random_position(1, 20)
+    # Scores are symmetric between the two players
+    assert se.evaluate(bb.black, bb.white) == -se.evaluate(bb.white, bb.black)
+
+    # A corner tile outweighs a tile on an x-square of an empty corner
+    corner = Bitboard(8)
+    corner.place("black", 0, 0)
+    x_square = Bitboard(8)
+    x_square.place("black", 1, 1)
+    assert se.evaluate(corner.black, 0) > se.evaluate(x_square.black, 0)
+
+
+def test__final_score():
+    se: SearchEngine = SearchEngine(8)
+    assert se._final_score(0b111, 0b1000) == se.WIN_SCORE + 2
+    assert se._final_score(0b1, 0b110) == -se.WIN_SCORE - 1
+    assert se._final_score(0b1, 0b10) == 0
+
+
+def test_search():
+    se: SearchEngine = SearchEngine(8)
+    gb: GameBoard = GameBoard(board_size=800)
+    index, score = se.search(gb.bitboard, "black", 2)
+    assert index in Bitboard.yield_indices(
+        gb.bitboard.calculate_move_mask("black"))
+    assert se.nodes > 1
+
+    # A player without legal moves has no best move
+    bb: Bitboard = Bitboard(8)
+    bb.place("black", 0, 0)
+    index, score = se.search(bb, "white", 2)
+    assert index is None
+
+
+def test_search_matches_minimax():
+    # Alpha-beta pruning must never change the score of the search
+    se: SearchEngine = SearchEngine(8, table_size_mb=0)
+    assert se.transposition_table is None
+    for seed in range(4):
+        bb, color = random_position(seed, 24)
+        own = bb.tiles(color)
+        opponent = bb.white if color == "black" else bb.black
+        index, score = se.search(bb, color, 3)
+        if index is not None:
+            assert score == minimax(se, bb, own, opponent, 3)
+
+
+def test_search_time_budget():
+    se: SearchEngine = SearchEngine(8)
+    bb, color = random_position(5, 20)
+    start = time.time()
+    index, score = se.search(bb, color, time_budget_ms=200)
+    elapsed = time.time() - start
+    assert index in Bitboard.yield_indices(bb.calculate_move_mask(color))
+    assert se.depth_reached >= 2
+    assert elapsed < 1.0
+
+    # Depth 1 is always completed, even without any time to search
+    index, score = se.search(bb, color, time_budget_ms=0)
+    assert index is not None
+    assert se.depth_reached >= 1
+
+    # Deepening stops once the whole game has been searched
+    bb, color = random_position(6, 56)
+    empty_squares = Bitboard.popcount(bb.empty)
+    index, score = se.search(bb, color, time_budget_ms=5000)
+    assert se.depth_reached <= empty_squares
+
+
+def test_search_transposition_table():
+    se: SearchEngine = SearchEngine(8, table_size_mb=1)
+    bb, color = random_position(8, 20)
+    index, score = se.search(bb, color, 5)
+    table = se.transposition_table
+    assert table.stores > 0
+    assert table.hits > 0
+
+    # The table does not change the score of the search
+    plain: SearchEngine = SearchEngine(8, table_size_mb=0)
+    plain_index, plain_score = plain.search(bb, color, 5)
+    assert score == plain_score
+    # Results cached from the first search make the second one cheaper
+    nodes = se.nodes
+    se.search(bb, color, 5)
+    assert se.nodes < nodes
+
+
+def test_search_start_depth():
+    se: SearchEngine = SearchEngine(8)
+    bb, color = random_position(9, 20)
+    moves = list(Bitboard.yield_indices(bb.calculate_move_mask(color)))
+    index, score = se.search(bb, color, 4, root_moves=moves[::-1],
+                             start_depth=3)
+    assert [result[0] for result in se.iteration_results] == [3, 4]
+    assert index in moves
+
+    # The start depth never skips past the maximum depth
+    se.search(bb, color, 2, start_depth=5)
+    assert se.depth_reached == 2
+
+    # The time budget holds on the first depth too: a deep first depth
+    # that runs out of time falls back to the first legal move
+    se: SearchEngine = SearchEngine(8)
+    start = time.time()
+    index, score = se.search(bb, color, time_budget_ms=20, start_depth=12)
+    assert time.time() - start < 2
+    assert se.depth_reached == 0
+    assert (index, score) == (moves[0], None)
+
+
+def test_search_move_ordering():
+    se: SearchEngine = SearchEngine(8, table_size_mb=0)
+    plain: SearchEngine = SearchEngine(8, table_size_mb=0,
+                                       use_move_ordering=False)
+    assert plain.move_ordering is None
+    bb, color = random_position(10, 20)
+    index, score = se.search(bb, color, 5)
+    plain_index, plain_score = plain.search(bb, color, 5)
+
+    # Ordering never changes the score, only how much of the tree is pruned
+    assert score == plain_score
+    assert se.nodes < plain.nodes
+    assert se.move_ordering.cutoffs > 0
+    assert se.move_ordering.first_move_cutoff_rate > 0.5
+
+
+def test_search_stats():
+    se: SearchEngine = SearchEngine(8, table_size_mb=1, time_phases=True)
+    assert se.time_phases
+    bb, color = random_position(11, 20)
+    se.search(bb, color, 4)
+    stats = se.stats
+    assert stats.nodes == se.nodes
+    assert stats.depth_reached == se.depth_reached == 4
+    # A node is scored as a leaf, expanded, cut off by the table or passed
+    assert (stats.leaf_evaluations + stats.interior_nodes +
+            stats.table_cutoffs) <= stats.nodes
+    assert stats.leaf_evaluations > 0
+    assert stats.branching_factor > 1
+    assert 0 < stats.table_hit_rate <= 1
+    assert stats.table_cutoffs <= stats.table_hits
+    assert stats.move_generation_s > 0
+    assert stats.evaluation_s > 0
+    assert stats.make_move_s > 0
+    assert (stats.move_generation_s + stats.evaluation_s +
+            stats.make_move_s) <= stats.elapsed_s
+
+    # Without time_phases the counters are kept but the phases not timed
+    se.time_phases = False
+    se.search(bb, color, 4)
+    assert se.stats.nodes > 0
+    assert se.stats.move_generation_s == 0
+    assert se.stats.evaluation_s == 0
+    assert se.stats.make_move_s == 0
+
+    # Table counts cover the last search only
+    se.search(bb, color, 1)
+    assert se.stats.depth_reached == 1
+    assert se.stats.table_probes < stats.table_probes
+
+
+def test_search_steps():
+    se: SearchEngine = SearchEngine(8, table_size_mb=0)
+    bb, color = random_position(12, 20)
+    steps = se.search_steps(bb, color, 5)
+    counts = []
+    for step in steps:
+        if isinstance(step, SearchResult):
+            index, score = step.value
+        else:
+            counts.append(step)
+
+    # Steps report a growing node count, each step searching a small subtree
+    assert len(counts) > 10
+    assert counts == sorted(counts)
+    assert counts[-1] <= se.nodes
+
+    plain: SearchEngine = SearchEngine(8, table_size_mb=0)
+    assert plain.search(bb, color, 5) == (index, score)
+    assert plain.nodes == se.nodes
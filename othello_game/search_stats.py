@@ -0,0 +1,207 @@
+class SearchStats:
+    """
+    Purpose:
+    The SearchStats class records what one search of the hard AI did: how
+    many positions it visited and scored, how deep and how wide the tree
+    was, how well the transposition table served it and where the time
+    went. The search never copies a board; each node derives its children's
+    tile masks and hash from its own, so that time is reported as making
+    moves (make_move_s), next to move generation and evaluation.
+
+    Methods:
+    combine: merges the stats of several searches of the same position
+    to_dict: returns the stats as a dict of plain values
+
+    Attributes:
+    _nodes: int, the number of positions visited
+    _leaf_evaluations: int, the number of positions scored by the static
+        evaluation or as a finished game
+    _interior_nodes: int, the number of positions whose legal moves were
+        generated and searched
+    _moves_generated: int, the number of legal moves found at those
+        positions
+    _depth_reached: int, the deepest fully completed depth
+    _elapsed_s: float, the wall-clock time the search took (s)
+    _table_probes: int, the number of transposition table lookups
+    _table_hits: int, the number of lookups that found their position
+    _table_cutoffs: int, the number of hits whose stored result ended the
+        search of the position
+    _move_generation_s: float, the time spent generating legal moves (s)
+    _evaluation_s: float, the time spent scoring leaf positions (s)
+    _make_move_s: float, the time spent deriving the tile masks and hash of
+        child positions (s)
+    _solved: bool, whether the endgame solver settled the move, in which
+        case depth_reached is the number of empty squares it solved rather
+        than a depth of the iterative deepening search
+    """
+
+    def __init__(self, nodes=0, leaf_evaluations=0, interior_nodes=0,
+                 moves_generated=0, depth_reached=0, elapsed_s=0.0,
+                 table_probes=0, table_hits=0, table_cutoffs=0,
+                 move_generation_s=0.0, evaluation_s=0.0, make_move_s=0.0,
+                 solved=False):
+        self._nodes = nodes
+        self._leaf_evaluations = leaf_evaluations
+        self._interior_nodes = interior_nodes
+        self._moves_generated = moves_generated
+        self._depth_reached = depth_reached
+        self._elapsed_s = elapsed_s
+        self._table_probes = table_probes
+        self._table_hits = table_hits
+        self._table_cutoffs = table_cutoffs
+        self._move_generation_s = move_generation_s
+        self._evaluation_s = evaluation_s
+        self._make_move_s = make_move_s
+        self._solved = solved
+
+    @property
+    def nodes(self):
+        """getter method for self._nodes"""
+        return self._nodes
+
+    @property
+    def leaf_evaluations(self):
+        """getter method for self._leaf_evaluations"""
+        return self._leaf_evaluations
+
+    @property
+    def interior_nodes(self):
+        """getter method for self._interior_nodes"""
+        return self._interior_nodes
+
+    @property
+    def moves_generated(self):
+        """getter method for self._moves_generated"""
+        return self._moves_generated
+
+    @property
+    def depth_reached(self):
+        """getter method for self._depth_reached"""
+        return self._depth_reached
+
+    @property
+    def elapsed_s(self):
+        """getter method for self._elapsed_s"""
+        return self._elapsed_s
+
+    @property
+    def table_probes(self):
+        """getter method for self._table_probes"""
+        return self._table_probes
+
+    @property
+    def table_hits(self):
+        """getter method for self._table_hits"""
+        return self._table_hits
+
+    @property
+    def table_cutoffs(self):
+        """getter method for self._table_cutoffs"""
+        return self._table_cutoffs
+
+    @property
+    def move_generation_s(self):
+        """getter method for self._move_generation_s"""
+        return self._move_generation_s
+
+    @property
+    def evaluation_s(self):
+        """getter method for self._evaluation_s"""
+        return self._evaluation_s
+
+    @property
+    def make_move_s(self):
+        """getter method for self._make_move_s"""
+        return self._make_move_s
+
+    @property
+    def solved(self):
+        """getter method for self._solved"""
+        return self._solved
+
+    @property
+    def branching_factor(self):
+        """getter method for the average number of legal moves searched"""
+        if not self._interior_nodes:
+            return 0.0
+        return self._moves_generated / float(self._interior_nodes)
+
+    @property
+    def nodes_per_second(self):
+        """getter method for the number of positions visited per second"""
+        return self._nodes / self._elapsed_s if self._elapsed_s else 0.0
+
+    @property
+    def table_hit_rate(self):
+        """getter method for the fraction of table lookups that were hits"""
+        if not self._table_probes:
+            return 0.0
+        return self._table_hits / float(self._table_probes)
+
+    @property
+    def table_cutoff_rate(self):
+        """getter method for the fraction of table lookups that cut off"""
+        if not self._table_probes:
+            return 0.0
+        return self._table_cutoffs / float(self._table_probes)
+
+    @classmethod
+    def combine(cls, stats, depth_reached, elapsed_s):
+        """
+        Function -- combine
+            Merges the stats of several searches of the same position, such
+            as those of the worker processes of a parallel search or of an
+            endgame solve followed by a search. Counters and phase times are
+            summed, so the phase times may add up to more than the elapsed
+            time when the searches ran at the same time. The combined stats
+            are those of a search, not of a solve.
+        Parameters:
+            stats: list[SearchStats], the stats of each search
+            depth_reached: int, the depth reached by the combined search
+            elapsed_s: float, the wall-clock time of the combined search (s)
+        Returns:
+            stats: SearchStats, the combined stats
+        """
+        return cls(
+            nodes=sum(stat.nodes for stat in stats),
+            leaf_evaluations=sum(stat.leaf_evaluations for stat in stats),
+            interior_nodes=sum(stat.interior_nodes for stat in stats),
+            moves_generated=sum(stat.moves_generated for stat in stats),
+            depth_reached=depth_reached,
+            elapsed_s=elapsed_s,
+            table_probes=sum(stat.table_probes for stat in stats),
+            table_hits=sum(stat.table_hits for stat in stats),
+            table_cutoffs=sum(stat.table_cutoffs for stat in stats),
+            move_generation_s=sum(stat.move_generation_s for stat in stats),
+            evaluation_s=sum(stat.evaluation_s for stat in stats),
+            make_move_s=sum(stat.make_move_s for stat in stats))
+
+    def to_dict(self):
+        """
+        Function -- to_dict
+            Returns the stats, including the derived rates, as a dict of
+            plain values, ready to be logged or written as JSON
+        Parameters:
+            None
+        Returns:
+            stats: dict, the fields of the stats
+        """
+        return {
+            "nodes": self._nodes,
+            "leaf_evaluations": self._leaf_evaluations,
+            "interior_nodes": self._interior_nodes,
+            "moves_generated": self._moves_generated,
+            "depth_reached": self._depth_reached,
+            "branching_factor": self.branching_factor,
+            "elapsed_s": self._elapsed_s,
+            "nodes_per_second": self.nodes_per_second,
+            "table_probes": self._table_probes,
+            "table_hits": self._table_hits,
+            "table_cutoffs": self._table_cutoffs,
+            "table_hit_rate": self.table_hit_rate,
+            "table_cutoff_rate": self.table_cutoff_rate,
+            "move_generation_s": self._move_generation_s,
+            "evaluation_s": self._evaluation_s,
+            "make_move_s": self._make_move_s,
+            "solved": self._solved,
+        }
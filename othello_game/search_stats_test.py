@@ -0,0 +1,58 @@
+from search_stats import SearchStats
+
+import pytest
+
+
+def test_constructor():
+    stats: SearchStats = SearchStats()
+    assert stats.nodes == 0
+    assert stats.depth_reached == 0
+    assert stats.branching_factor == 0.0
+    assert stats.nodes_per_second == 0.0
+    assert stats.table_hit_rate == 0.0
+    assert stats.table_cutoff_rate == 0.0
+    assert not stats.solved
+
+
+def test_derived_rates():
+    stats: SearchStats = SearchStats(nodes=1000, interior_nodes=100,
+                                     moves_generated=850, elapsed_s=0.5,
+                                     table_probes=200, table_hits=50,
+                                     table_cutoffs=20)
+    assert stats.branching_factor == pytest.approx(8.5)
+    assert stats.nodes_per_second == pytest.approx(2000)
+    assert stats.table_hit_rate == pytest.approx(0.25)
+    assert stats.table_cutoff_rate == pytest.approx(0.1)
+
+
+def test_combine():
+    first: SearchStats = SearchStats(nodes=10, leaf_evaluations=6,
+                                     table_probes=4, table_hits=1,
+                                     move_generation_s=0.1, depth_reached=3)
+    second: SearchStats = SearchStats(nodes=30, leaf_evaluations=20,
+                                      table_probes=6, table_hits=4,
+                                      evaluation_s=0.2, depth_reached=4)
+    stats: SearchStats = SearchStats.combine([first, second], 3, 0.25)
+    assert stats.nodes == 40
+    assert stats.leaf_evaluations == 26
+    assert stats.table_hit_rate == pytest.approx(0.5)
+    assert stats.move_generation_s == pytest.approx(0.1)
+    assert stats.evaluation_s == pytest.approx(0.2)
+    assert stats.depth_reached == 3
+    assert stats.elapsed_s == 0.25
+    # A solve followed by a search combines into the stats of a search
+    solve: SearchStats = SearchStats(nodes=5, depth_reached=10, solved=True)
+    assert not SearchStats.combine([first, solve], 3, 0.25).solved
+
+
+def test_to_dict():
+    stats: SearchStats = SearchStats(nodes=10, interior_nodes=2,
+                                     moves_generated=9, elapsed_s=2.0)
+    result = stats.to_dict()
+    assert result["nodes"] == 10
+    assert result["branching_factor"] == pytest.approx(4.5)
+    assert result["nodes_per_second"] == pytest.approx(5.0)
+    assert set(result) >= {"leaf_evaluations", "depth_reached",
+                           "table_hit_rate", "table_cutoff_rate",
+                           "move_generation_s", "evaluation_s",
+                           "make_move_s", "solved"}
@@ -0,0 +1,128 @@
+from search_engine import SearchResult
+
+import time
+
+
+class SlicedSearch:
+    """
+    Purpose:
+    The SlicedSearch class runs a generator-based search, such as
+    Player.select_move_hard_steps, a slice at a time on the caller's thread.
+    Each call to advance resumes the search where the last one paused and
+    runs it until the slice's time or node budget is used up, so a
+    single-threaded runtime can search between draw() calls and keep a
+    steady frame rate. A slice always runs at least one step, and a step
+    never searches more than one small subtree, so a slice overruns its
+    budget by at most one step.
+
+    Methods:
+    advance: runs the search for one slice
+    cancel: stops the search
+
+    Attributes:
+    _steps: generator, the steps of the search
+    _slice_ms: Optional[float], the time (ms) each slice may use
+    _slice_nodes: Optional[int], the number of nodes each slice may visit
+    _nodes: int, the number of nodes visited so far
+    _last_count: int, the node count yielded by the last step
+    _slices: int, the number of slices run so far
+    _done: bool, whether the search has finished
+    _result: the value of the search's SearchResult, once it has finished
+    """
+
+    def __init__(self, steps, slice_ms=None, slice_nodes=None):
+        if slice_ms is None and slice_nodes is None:
+            raise ValueError("A slice needs a time or node budget")
+        self._steps = steps
+        self._slice_ms = slice_ms
+        self._slice_nodes = slice_nodes
+        self._nodes = 0
+        self._last_count = 0
+        self._slices = 0
+        self._done = False
+        self._result = None
+
+    @property
+    def slice_ms(self):
+        """getter method for self._slice_ms"""
+        return self._slice_ms
+
+    @property
+    def slice_nodes(self):
+        """getter method for self._slice_nodes"""
+        return self._slice_nodes
+
+    @property
+    def nodes(self):
+        """getter method for self._nodes"""
+        return self._nodes
+
+    @property
+    def slices(self):
+        """getter method for self._slices"""
+        return self._slices
+
+    @property
+    def done(self):
+        """getter method for self._done"""
+        return self._done
+
+    @property
+    def result(self):
+        """getter method for self._result"""
+        if not self._done:
+            raise ValueError("The search has not finished")
+        return self._result
+
+    def advance(self):
+        """
+        Function -- advance
+            Resumes the search and runs it until the slice's time or node
+            budget is used up or the search finishes. The node count of a
+            step restarts when the search hands over from one engine to
+            another (for example from the endgame solver to the search), so
+            a smaller count than the last one is counted from zero.
+        Parameters:
+            None
+        Returns:
+            done: bool, True once the search has finished
+        """
+        if self._done:
+            return True
+
+        self._slices += 1
+        deadline = (time.time() + self._slice_ms / 1000.0
+                    if self._slice_ms is not None else None)
+        slice_nodes = 0
+
+        while True:
+            count = next(self._steps)
+            if isinstance(count, SearchResult):
+                self._steps.close()
+                self._done = True
+                self._result = count.value
+                return True
+
+            step_nodes = (count - self._last_count
+                          if count >= self._last_count else count)
+            self._last_count = count
+            self._nodes += step_nodes
+            slice_nodes += step_nodes
+
+            if deadline is not None and time.time() >= deadline:
+                return False
+            if (self._slice_nodes is not None and
+                    slice_nodes >= self._slice_nodes):
+                return False
+
+    def cancel(self):
+        """
+        Function -- cancel
+            Stops the search, running any cleanup of the generator. A
+            cancelled search has no result.
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        self._steps.close()
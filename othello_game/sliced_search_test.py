@@ -0,0 +1,80 @@
+from player import Player
+from position import Position
+from search_engine import SearchResult, run_steps
+from sliced_search import SlicedSearch
+
+import pytest
+
+
+def count_steps(counts, result):
+    # A search whose steps visit a known number of nodes
+    for count in counts:
+        yield count
+    yield SearchResult(result)
+
+
+def test_constructor():
+    ss: SlicedSearch = SlicedSearch(count_steps([], None), slice_nodes=10)
+    assert ss.slice_nodes == 10
+    assert ss.slice_ms is None
+    assert ss.nodes == 0
+    assert ss.slices == 0
+    assert not ss.done
+    with pytest.raises(ValueError):
+        ss.result
+    with pytest.raises(ValueError):
+        SlicedSearch(count_steps([], None))
+
+
+def test_advance_node_budget():
+    # The node count restarts at 5 when the search changes engine
+    ss: SlicedSearch = SlicedSearch(count_steps([4, 8, 12, 5, 20], 42),
+                                    slice_nodes=8)
+    assert ss.advance() is False
+    assert ss.nodes == 8
+    assert ss.advance() is False
+    assert ss.nodes == 17
+    assert ss.advance() is False
+    assert ss.nodes == 32
+    assert ss.advance() is True
+    assert ss.done
+    assert ss.result == 42
+    assert ss.slices == 4
+    # A finished search stays finished
+    assert ss.advance() is True
+    assert ss.slices == 4
+
+
+def test_advance_time_budget():
+    p: Player = Player(None, "Computer", "black", position=Position(8))
+    ss: SlicedSearch = SlicedSearch(p.select_move_hard_steps(), slice_ms=1)
+    while not ss.advance():
+        pass
+    assert ss.slices > 1
+    assert ss.nodes == p.search_stats.nodes
+
+    # Slicing the search does not change the move it selects
+    serial: Player = Player(None, "Computer", "black", position=Position(8))
+    assert ss.result == serial.select_move_hard()
+    assert ss.result == run_steps(
+        Player(None, "Computer", "black",
+               position=Position(8)).select_move_hard_steps())
+
+
+def test_cancel():
+    cleaned_up = []
+
+    def steps():
+        count = 0
+        try:
+            while True:
+                count += 1
+                yield count
+        finally:
+            cleaned_up.append(True)
+
+    ss: SlicedSearch = SlicedSearch(steps(), slice_nodes=3)
+    assert ss.advance() is False
+    ss.cancel()
+    assert cleaned_up == [True]
+    assert not ss.done
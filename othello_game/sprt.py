@@ -0,0 +1,126 @@
+import math
+
+
+class SPRT:
+    """
+    Purpose:
+    The SPRT class runs a sequential probability ratio test on the results
+    of a self-play match, so that the match can stop as soon as the results
+    show which of two hypotheses is true: H0, that strategy A is elo0 Elo
+    stronger than B, or H1, that it is elo1 Elo stronger. After every game
+    the log-likelihood ratio (LLR) of H1 against H0 is compared with bounds
+    set by the accepted false positive rate (alpha) and false negative rate
+    (beta). The LLR uses the normal approximation of the game scores
+    (win 1, draw 0.5, loss 0).
+
+    Methods:
+    expected_score: converts an Elo difference into an expected game score
+    calculate_llr: returns the log-likelihood ratio of a list of game scores
+    decide: returns the hypothesis accepted by a list of game scores, if any
+
+    Attributes:
+    _elo0: float, the Elo difference of the null hypothesis H0
+    _elo1: float, the Elo difference of the alternative hypothesis H1
+    _alpha: float, the probability of accepting H1 when H0 is true
+    _beta: float, the probability of accepting H0 when H1 is true
+    _LOWER_BOUND: float, the LLR at or below which H0 is accepted
+    _UPPER_BOUND: float, the LLR at or above which H1 is accepted
+    """
+
+    H0 = "H0"
+    H1 = "H1"
+
+    def __init__(self, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05):
+        if elo1 <= elo0:
+            raise ValueError("elo1 must be greater than elo0")
+        self._elo0 = elo0
+        self._elo1 = elo1
+        self._alpha = alpha
+        self._beta = beta
+        self._LOWER_BOUND = math.log(beta / (1.0 - alpha))
+        self._UPPER_BOUND = math.log((1.0 - beta) / alpha)
+
+    @property
+    def elo0(self):
+        """getter method for self._elo0"""
+        return self._elo0
+
+    @property
+    def elo1(self):
+        """getter method for self._elo1"""
+        return self._elo1
+
+    @property
+    def alpha(self):
+        """getter method for self._alpha"""
+        return self._alpha
+
+    @property
+    def beta(self):
+        """getter method for self._beta"""
+        return self._beta
+
+    @property
+    def LOWER_BOUND(self):
+        """getter method for self._LOWER_BOUND"""
+        return self._LOWER_BOUND
+
+    @property
+    def UPPER_BOUND(self):
+        """getter method for self._UPPER_BOUND"""
+        return self._UPPER_BOUND
+
+    @staticmethod
+    def expected_score(elo_difference):
+        """
+        Function -- expected_score
+            Converts an Elo difference into the expected score per game of
+            the stronger side
+        Parameters:
+            elo_difference: float, the Elo difference
+        Returns:
+            score: float, the expected score per game, between 0 and 1
+        """
+        return 1.0 / (1.0 + 10.0 ** (-elo_difference / 400.0))
+
+    def calculate_llr(self, scores):
+        """
+        Function -- calculate_llr
+            Calculates the log-likelihood ratio of H1 against H0 for the
+            scores of the games played so far. The LLR is 0 until the scores
+            vary, since their variance is unknown before then.
+        Parameters:
+            scores: list[float], the score of A in each game (1, 0.5 or 0)
+        Returns:
+            llr: float, the log-likelihood ratio
+        """
+        num_games = len(scores)
+        if not num_games:
+            return 0.0
+
+        mean = sum(scores) / float(num_games)
+        variance = sum((score - mean) ** 2 for score in scores) / num_games
+        if variance <= 0.0:
+            return 0.0
+
+        score0 = self.expected_score(self._elo0)
+        score1 = self.expected_score(self._elo1)
+        return (num_games * (score1 - score0) *
+                (2.0 * mean - score0 - score1) / (2.0 * variance))
+
+    def decide(self, scores):
+        """
+        Function -- decide
+            Compares the log-likelihood ratio of the scores with the bounds
+        Parameters:
+            scores: list[float], the score of A in each game (1, 0.5 or 0)
+        Returns:
+            hypothesis: Optional[str], H1 if the upper bound is reached, H0
+                if the lower bound is reached, or None while the test goes on
+        """
+        llr = self.calculate_llr(scores)
+        if llr >= self._UPPER_BOUND:
+            return self.H1
+        if llr <= self._LOWER_BOUND:
+            return self.H0
+        return None
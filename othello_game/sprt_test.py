@@ -0,0 +1,49 @@
+from sprt import SPRT
+
+import math
+import pytest
+
+
+def test_constructor():
+    sprt: SPRT = SPRT()
+    assert sprt.elo0 == 0.0
+    assert sprt.elo1 == 10.0
+    assert sprt.alpha == 0.05
+    assert sprt.beta == 0.05
+    assert sprt.LOWER_BOUND == pytest.approx(math.log(0.05 / 0.95))
+    assert sprt.UPPER_BOUND == pytest.approx(math.log(0.95 / 0.05))
+
+    with pytest.raises(ValueError):
+        SPRT(elo0=10, elo1=0)
+
+
+def test_expected_score():
+    assert SPRT.expected_score(0) == 0.5
+    assert SPRT.expected_score(400) == pytest.approx(10 / 11.0)
+    assert SPRT.expected_score(-400) == pytest.approx(1 / 11.0)
+
+
+def test_calculate_llr():
+    sprt: SPRT = SPRT(0, 50)
+    # Without variance in the scores there is no evidence yet
+    assert sprt.calculate_llr([]) == 0.0
+    assert sprt.calculate_llr([1.0, 1.0]) == 0.0
+
+    # A score halfway between the hypotheses gives no evidence either way
+    halfway = (SPRT.expected_score(0) + SPRT.expected_score(50)) / 2
+    assert sprt.calculate_llr([1.0, 0.0] * 10) < 0
+    assert sprt.calculate_llr([1.0, 1.0, 0.0] * 10) > 0
+    assert abs(sprt.calculate_llr(
+        [1.0] * int(halfway * 1000) + [0.0] * int(
+            (1 - halfway) * 1000))) < 0.5
+
+    # Evidence grows with the number of games
+    assert sprt.calculate_llr([1.0, 1.0, 0.0] * 20) > sprt.calculate_llr(
+        [1.0, 1.0, 0.0] * 10)
+
+
+def test_decide():
+    sprt: SPRT = SPRT(0, 50)
+    assert sprt.decide([1.0, 0.0]) is None
+    assert sprt.decide([1.0, 1.0, 0.0] * 30) == SPRT.H1
+    assert sprt.decide([1.0, 0.0, 0.0] * 30) == SPRT.H0
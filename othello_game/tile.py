@@ -47,7 +47,6 @@ class Tile:
     @color.setter
     def color(self, color):
         """setter method for self._color"""
-        print("here")
         self._color = color
 
     @property
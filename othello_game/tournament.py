@@ -0,0 +1,499 @@
+from headless_runner import HeadlessRunner
+from position import Position
+from sprt import SPRT
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import json
+import math
+import os
+import random
+
+
+# Headless runners kept by each worker process between games, by black and
+# white strategy, board size and time budget, so that the hard AI's search
+# engines survive from one game to the next
+_WORKER_RUNNERS = {}
+
+
+def _play_tournament_game(game_number, black_strategy, white_strategy,
+                          opening, size, time_budget_ms, seed):
+    """
+    Function -- _play_tournament_game
+        Runs in a worker process (or in the main process with one worker):
+        plays one game of a tournament from its opening
+    Parameters:
+        game_number: int, the number of the game in the tournament
+        black_strategy: str or function, the strategy playing black
+        white_strategy: str or function, the strategy playing white
+        opening: list[Optional[int]], the bit indices of the opening moves
+            played before the strategies take over, None for a pass
+        size: int, the number of squares along one side of the board
+        time_budget_ms: Optional[int], the time (ms) the hard AI may spend
+            searching for each move
+        seed: int, the random seed of the tournament
+    Returns:
+        game: tuple[int, dict], the game number and its GameResult as a dict
+    """
+    key = (black_strategy, white_strategy, size, time_budget_ms)
+    runner = _WORKER_RUNNERS.get(key)
+    if runner is None:
+        runner = HeadlessRunner(black_strategy, white_strategy, size,
+                                time_budget_ms)
+        _WORKER_RUNNERS[key] = runner
+
+    # Every game draws its own random numbers, whichever worker plays it
+    random.seed(seed * 1000003 + game_number)
+    result = runner.play_game(Tournament.play_opening(opening, size))
+    return game_number, result.to_dict()
+
+
+class Tournament:
+    """
+    Purpose:
+    The Tournament class plays a self-play match of many games between two
+    strategies, A and B, across a pool of worker processes, and reports how
+    much stronger A is than B. Games are played in pairs from the same
+    random opening with the colors swapped, so that neither the opening nor
+    the first move favors one side. Each finished game is streamed to an
+    optional callback and appended to an optional checkpoint file as a line
+    of JSON; a tournament started with the same checkpoint file skips the
+    games already in it, so long runs can be resumed. With an SPRT, the
+    tournament stops early as soon as the test accepts one of its
+    hypotheses, and num_games is only the most games played.
+
+    Methods:
+    play_opening: replays an opening from the standard start position
+    calculate_elo_difference: converts a match score into an Elo difference
+    calculate_confidence_interval: returns the Elo confidence interval of a
+        list of game scores
+    _generate_openings: creates the random openings of the tournament
+    _load_checkpoint: reads the games already played from the checkpoint
+    _schedule_game: returns the strategies and opening of a game
+    _record_game: stores, streams and checkpoints a finished game
+    _scores: returns the score of A in each game played so far
+    decision: returns the hypothesis accepted by the SPRT, if any
+    run: plays every game that has not been played yet
+    report: summarizes the games played so far
+
+    Attributes:
+    _strategy_a: str or function, the strategy being measured
+    _strategy_b: str or function, the strategy it is measured against
+    _num_games: int, the number of games of the tournament
+    _workers: int, the number of worker processes
+    _size: int, the number of squares along one side of the board
+    _time_budget_ms: Optional[int], the time (ms) the hard AI may spend
+        searching for each move
+    _opening_plies: int, the number of random moves of each opening
+    _seed: int, the random seed of the openings and the games
+    _checkpoint_path: Optional[str], the file finished games are appended
+        to and resumed from
+    _on_result: Optional[function], called with the record of each game as
+        it finishes
+    _sprt: Optional[SPRT], the sequential test that stops the tournament
+        early
+    _openings: list[list[Optional[int]]], the opening of each game pair
+    _games: dict[int, dict], the record of each finished game by number
+    """
+
+    Z_SCORE_95 = 1.96
+    MAX_ELO = 1000.0
+
+    def __init__(self, strategy_a, strategy_b, num_games=100, workers=1,
+                 size=8, time_budget_ms=None, opening_plies=4, seed=0,
+                 checkpoint_path=None, on_result=None, sprt=None):
+        self._strategy_a = strategy_a
+        self._strategy_b = strategy_b
+        self._num_games = num_games
+        self._workers = workers
+        self._size = size
+        self._time_budget_ms = time_budget_ms
+        self._opening_plies = opening_plies
+        self._seed = seed
+        self._checkpoint_path = checkpoint_path
+        self._on_result = on_result
+        self._sprt = sprt
+        self._openings = self._generate_openings((num_games + 1) // 2)
+        self._games = self._load_checkpoint()
+
+    @property
+    def num_games(self):
+        """getter method for self._num_games"""
+        return self._num_games
+
+    @property
+    def workers(self):
+        """getter method for self._workers"""
+        return self._workers
+
+    @property
+    def openings(self):
+        """getter method for self._openings"""
+        return self._openings
+
+    @property
+    def games(self):
+        """getter method for self._games"""
+        return self._games
+
+    @property
+    def sprt(self):
+        """getter method for self._sprt"""
+        return self._sprt
+
+    @staticmethod
+    def play_opening(opening, size=8):
+        """
+        Function -- play_opening
+            Replays the moves of an opening from the standard start position
+        Parameters:
+            opening: list[Optional[int]], the bit indices of the opening
+                moves, None for a pass
+            size: int, the number of squares along one side of the board
+        Returns:
+            position: Position, the position reached after the opening
+        """
+        position = Position(size)
+        for index in opening:
+            if index is None:
+                position.pass_turn()
+            else:
+                position.apply_move(
+                    [move for move in position.legal_moves()
+                     if move.index == index][0])
+        return position
+
+    @classmethod
+    def calculate_elo_difference(cls, score):
+        """
+        Function -- calculate_elo_difference
+            Converts the fraction of points scored in a match into the Elo
+            rating difference that predicts it. Perfect or zero scores are
+            capped at +/- MAX_ELO.
+        Parameters:
+            score: float, the points scored divided by the games played
+        Returns:
+            elo_difference: float, the Elo difference
+        """
+        if score <= 0.0:
+            return -cls.MAX_ELO
+        if score >= 1.0:
+            return cls.MAX_ELO
+        return max(-cls.MAX_ELO,
+                   min(cls.MAX_ELO, -400.0 * math.log10(1.0 / score - 1.0)))
+
+    @classmethod
+    def calculate_confidence_interval(cls, scores, z_score=Z_SCORE_95):
+        """
+        Function -- calculate_confidence_interval
+            Calculates the confidence interval of the Elo difference from the
+            score of each game, using the normal approximation of the mean
+            game score
+        Parameters:
+            scores: list[float], the score of each game (1, 0.5 or 0)
+            z_score: float, the number of standard errors of the interval,
+                1.96 for 95%
+        Returns:
+            interval: tuple[float, float], the lower and upper Elo difference
+        """
+        if not scores:
+            return -cls.MAX_ELO, cls.MAX_ELO
+
+        num_games = len(scores)
+        mean = sum(scores) / float(num_games)
+        variance = sum((score - mean) ** 2 for score in scores) / num_games
+        margin = z_score * math.sqrt(variance / num_games)
+        return (cls.calculate_elo_difference(mean - margin),
+                cls.calculate_elo_difference(mean + margin))
+
+    def _generate_openings(self, num_openings):
+        """
+        Function -- _generate_openings
+            Creates the openings of the tournament by playing opening_plies
+            random legal moves from the start position, from the
+            tournament's seed
+        Parameters:
+            num_openings: int, the number of openings to create
+        Returns:
+            openings: list[list[Optional[int]]], the moves of each opening
+        """
+        rng = random.Random(self._seed)
+        openings = []
+
+        for _ in range(num_openings):
+            position = Position(self._size)
+            opening = []
+            for _ in range(self._opening_plies):
+                legal_moves = position.legal_moves()
+                if not legal_moves:
+                    break
+                move = legal_moves[rng.randint(0, len(legal_moves) - 1)]
+                position.apply_move(move)
+                opening.append(move.index)
+            openings.append(opening)
+
+        return openings
+
+    def _load_checkpoint(self):
+        """
+        Function -- _load_checkpoint
+            Reads the games already recorded in the checkpoint file. A line
+            cut short by an interrupted run is ignored, so that game is
+            played again.
+        Parameters:
+            None
+        Returns:
+            games: dict[int, dict], the record of each finished game
+        """
+        games = {}
+        if self._checkpoint_path is None or not os.path.exists(
+                self._checkpoint_path):
+            return games
+
+        with open(self._checkpoint_path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("game", self._num_games) < self._num_games:
+                    games[record["game"]] = record
+        return games
+
+    def _schedule_game(self, game_number):
+        """
+        Function -- _schedule_game
+            Returns who plays which color in a game and its opening. Both
+            games of a pair share an opening; A plays black in the first and
+            white in the second.
+        Parameters:
+            game_number: int, the number of the game
+        Returns:
+            schedule: tuple, the black strategy, the white strategy, the
+                opening and whether A plays black
+        """
+        a_is_black = game_number % 2 == 0
+        opening = self._openings[game_number // 2]
+        if a_is_black:
+            return self._strategy_a, self._strategy_b, opening, True
+        return self._strategy_b, self._strategy_a, opening, False
+
+    def _record_game(self, game_number, result):
+        """
+        Function -- _record_game
+            Stores a finished game along with the score of strategy A,
+            passes it to the on_result callback and appends it to the
+            checkpoint file
+        Parameters:
+            game_number: int, the number of the game
+            result: dict, the game's GameResult as a dict
+        Returns:
+            record: dict, the record of the game
+        """
+        a_is_black = self._schedule_game(game_number)[3]
+        a_color = "black" if a_is_black else "white"
+        if result["winner"] is None:
+            score = 0.5
+        else:
+            score = 1.0 if result["winner"] == a_color else 0.0
+
+        record = dict(result)
+        record["game"] = game_number
+        record["a_color"] = a_color
+        record["score"] = score
+        self._games[game_number] = record
+        if self._sprt is not None:
+            record["llr"] = self._sprt.calculate_llr(self._scores())
+
+        if self._checkpoint_path is not None:
+            with open(self._checkpoint_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        if self._on_result is not None:
+            self._on_result(record)
+        return record
+
+    def _scores(self):
+        """
+        Function -- _scores
+            Returns the score of strategy A in each game played so far, in
+            the order the games finished
+        Parameters:
+            None
+        Returns:
+            scores: list[float], the score of each game (1, 0.5 or 0)
+        """
+        return [record["score"] for record in self._games.values()]
+
+    def decision(self):
+        """
+        Function -- decision
+            Returns the hypothesis the SPRT accepts for the games played so
+            far
+        Parameters:
+            None
+        Returns:
+            hypothesis: Optional[str], SPRT.H0 or SPRT.H1, or None without
+                an SPRT or while the test goes on
+        """
+        if self._sprt is None:
+            return None
+        return self._sprt.decide(self._scores())
+
+    def run(self):
+        """
+        Function -- run
+            Plays every game of the tournament that has not been played yet,
+            across the worker processes, and records each one as it
+            finishes. With an SPRT, no more games are started once it
+            accepts a hypothesis, and games still being played are
+            discarded.
+        Parameters:
+            None
+        Returns:
+            report: dict, the summary of the tournament (see report)
+        """
+        if self.decision() is not None:
+            return self.report()
+
+        pending = [game_number for game_number in range(self._num_games)
+                   if game_number not in self._games]
+
+        tasks = []
+        for game_number in pending:
+            black, white, opening, _ = self._schedule_game(game_number)
+            tasks.append((game_number, black, white, opening, self._size,
+                          self._time_budget_ms, self._seed))
+
+        if self._workers <= 1:
+            for task in tasks:
+                self._record_game(*_play_tournament_game(*task))
+                if self.decision() is not None:
+                    break
+        else:
+            executor = ProcessPoolExecutor(max_workers=self._workers)
+            try:
+                futures = [executor.submit(_play_tournament_game, *task)
+                           for task in tasks]
+                for future in as_completed(futures):
+                    self._record_game(*future.result())
+                    if self.decision() is not None:
+                        break
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        return self.report()
+
+    def report(self):
+        """
+        Function -- report
+            Summarizes the games played so far from the point of view of
+            strategy A
+        Parameters:
+            None
+        Returns:
+            report: dict, the number of games, A's wins, losses and draws,
+                its score and win rate overall and with each color, the Elo
+                difference between A and B with its 95% confidence interval
+                and, with an SPRT, its LLR, bounds and decision
+        """
+        records = [self._games[game_number]
+                   for game_number in sorted(self._games)]
+        scores = [record["score"] for record in records]
+        num_games = len(scores)
+        score = sum(scores) / float(num_games) if num_games else 0.5
+
+        win_rates = {}
+        for color in ("black", "white"):
+            color_scores = [record["score"] for record in records
+                            if record["a_color"] == color]
+            win_rates[color] = (
+                sum(color_score == 1.0 for color_score in color_scores) /
+                float(len(color_scores)) if color_scores else 0.0)
+
+        report = {
+            "games": num_games,
+            "wins": scores.count(1.0),
+            "losses": scores.count(0.0),
+            "draws": scores.count(0.5),
+            "score": score,
+            "win_rate": (scores.count(1.0) / float(num_games)
+                         if num_games else 0.0),
+            "win_rate_black": win_rates["black"],
+            "win_rate_white": win_rates["white"],
+            "elo_difference": self.calculate_elo_difference(score),
+            "elo_confidence_interval": self.calculate_confidence_interval(
+                scores),
+        }
+        if self._sprt is not None:
+            report["llr"] = self._sprt.calculate_llr(self._scores())
+            report["llr_bounds"] = (self._sprt.LOWER_BOUND,
+                                    self._sprt.UPPER_BOUND)
+            report["decision"] = self.decision()
+        return report
+
+
+def main(argv=None):
+    """
+    Function -- main
+        Command-line entry point: plays a tournament between two AI
+        difficulties, printing each game as it finishes and the report at
+        the end
+    Parameters:
+        argv: Optional[list[str]], the command-line arguments
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(
+        description="Play a self-play Othello tournament between two AIs")
+    parser.add_argument("--a", default="h",
+                        choices=HeadlessRunner.DIFFICULTIES)
+    parser.add_argument("--b", default="m",
+                        choices=HeadlessRunner.DIFFICULTIES)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--size", type=int, default=8)
+    parser.add_argument("--time-budget-ms", type=int, default=None)
+    parser.add_argument("--opening-plies", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--sprt", action="store_true",
+                        help="stop early once an SPRT decides the match")
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=10.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    sprt = (SPRT(args.elo0, args.elo1, args.alpha, args.beta) if args.sprt
+            else None)
+
+    def print_game(record):
+        print("Game " + str(record["game"] + 1) + ": A (" +
+              record["a_color"] + ") scores " + str(record["score"]) +
+              ", " + str(record["black_tiles"]) + " - " +
+              str(record["white_tiles"]) +
+              (", LLR " + str(round(record["llr"], 2))
+               if "llr" in record else ""))
+
+    tournament = Tournament(args.a, args.b, args.games, args.workers,
+                            args.size, args.time_budget_ms,
+                            args.opening_plies, args.seed, args.checkpoint,
+                            print_game, sprt)
+    report = tournament.run()
+
+    lower, upper = report["elo_confidence_interval"]
+    print("A: +" + str(report["wins"]) + " -" + str(report["losses"]) +
+          " =" + str(report["draws"]) + " (score " +
+          str(round(report["score"], 3)) + ")")
+    print("Elo difference: " + str(round(report["elo_difference"], 1)) +
+          " [" + str(round(lower, 1)) + ", " + str(round(upper, 1)) + "]")
+    if sprt is not None:
+        print("SPRT: LLR " + str(round(report["llr"], 2)) + " [" +
+              str(round(sprt.LOWER_BOUND, 2)) + ", " +
+              str(round(sprt.UPPER_BOUND, 2)) + "], " +
+              (report["decision"] + " accepted" if report["decision"]
+               else "undecided"))
+
+
+if __name__ == "__main__":
+    main()
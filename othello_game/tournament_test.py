@@ -0,0 +1,154 @@
+from sprt import SPRT
+from tournament import Tournament, main
+
+import json
+import pytest
+
+
+def test_constructor():
+    t: Tournament = Tournament("e", "m", num_games=6, opening_plies=3)
+    assert t.num_games == 6
+    assert t.workers == 1
+    assert t.games == {}
+    # One opening per pair of games
+    assert len(t.openings) == 3
+    assert all(len(opening) == 3 for opening in t.openings)
+
+    # The same seed gives the same openings
+    assert Tournament("e", "m", num_games=6, opening_plies=3).openings == (
+        t.openings)
+
+
+def test_play_opening():
+    position = Tournament.play_opening([19, 18])
+    assert position.side_to_move == "black"
+    assert position.black_tiles == 3
+    assert position.white_tiles == 3
+
+    position = Tournament.play_opening([19, None])
+    assert position.side_to_move == "black"
+
+
+def test_calculate_elo_difference():
+    assert Tournament.calculate_elo_difference(0.5) == 0.0
+    assert Tournament.calculate_elo_difference(0.75) == pytest.approx(
+        190.85, abs=0.01)
+    assert Tournament.calculate_elo_difference(0.25) == pytest.approx(
+        -190.85, abs=0.01)
+    assert Tournament.calculate_elo_difference(1.0) == Tournament.MAX_ELO
+    assert Tournament.calculate_elo_difference(0.0) == -Tournament.MAX_ELO
+
+
+def test_calculate_confidence_interval():
+    lower, upper = Tournament.calculate_confidence_interval(
+        [1.0, 0.0] * 50)
+    assert lower == pytest.approx(-upper)
+    assert -80 < lower < -60
+
+    # More games narrow the interval
+    wide = Tournament.calculate_confidence_interval([1.0, 0.0] * 10)
+    assert wide[0] < lower
+    assert Tournament.calculate_confidence_interval([]) == (
+        -Tournament.MAX_ELO, Tournament.MAX_ELO)
+
+
+def test__schedule_game():
+    t: Tournament = Tournament("e", "m", num_games=4)
+    # Games of a pair share an opening with the colors swapped
+    assert t._schedule_game(0) == ("e", "m", t.openings[0], True)
+    assert t._schedule_game(1) == ("m", "e", t.openings[0], False)
+    assert t._schedule_game(2) == ("e", "m", t.openings[1], True)
+
+
+def test_run(tmp_path):
+    checkpoint = str(tmp_path / "games.jsonl")
+    streamed = []
+    t: Tournament = Tournament("m", "e", num_games=6,
+                               checkpoint_path=checkpoint,
+                               on_result=streamed.append)
+    report = t.run()
+    assert report["games"] == 6
+    assert report["wins"] + report["losses"] + report["draws"] == 6
+    assert [record["game"] for record in streamed] == list(range(6))
+    assert report["elo_difference"] == Tournament.calculate_elo_difference(
+        report["score"])
+    lower, upper = report["elo_confidence_interval"]
+    assert lower <= report["elo_difference"] <= upper
+
+    with open(checkpoint) as f:
+        records = [json.loads(line) for line in f]
+    assert [record["a_color"] for record in records[:2]] == (
+        ["black", "white"])
+
+    # A tournament resumed from the checkpoint only plays the new games
+    streamed = []
+    t = Tournament("m", "e", num_games=8, checkpoint_path=checkpoint,
+                   on_result=streamed.append)
+    assert len(t.games) == 6
+    assert t.run()["games"] == 8
+    assert [record["game"] for record in streamed] == [6, 7]
+
+    # An interrupted write leaves a partial line, which is replayed
+    with open(checkpoint, "a") as f:
+        f.write('{"game": 8, "sco')
+    t = Tournament("m", "e", num_games=9, checkpoint_path=checkpoint)
+    assert len(t.games) == 8
+
+
+def test_run_workers():
+    single = Tournament("e", "e", num_games=4).run()
+    # Games play the same in worker processes as in the main process
+    parallel = Tournament("e", "e", num_games=4, workers=2).run()
+    assert parallel == single
+
+
+def test_main(capsys):
+    main(["--a", "m", "--b", "e", "--games", "2", "--workers", "1"])
+    out = capsys.readouterr().out
+    assert "Game 2:" in out
+    assert "Elo difference" in out
+
+    main(["--a", "m", "--b", "e", "--games", "2", "--workers", "1",
+          "--sprt", "--elo1", "100"])
+    out = capsys.readouterr().out
+    assert "LLR" in out
+    assert "undecided" in out
+
+
+def test_run_sprt(tmp_path):
+    checkpoint = str(tmp_path / "games.jsonl")
+    streamed = []
+    sprt: SPRT = SPRT(elo0=0, elo1=150)
+    t: Tournament = Tournament("m", "e", num_games=400, sprt=sprt,
+                               checkpoint_path=checkpoint,
+                               on_result=streamed.append)
+    assert t.sprt is sprt
+    assert t.decision() is None
+    report = t.run()
+
+    # The tournament stops as soon as the SPRT accepts a hypothesis
+    assert report["decision"] in (SPRT.H0, SPRT.H1)
+    assert report["games"] < 400
+    assert report["decision"] == sprt.decide(
+        [record["score"] for record in streamed])
+    assert sprt.decide([record["score"] for record in streamed[:-1]]) is None
+    assert report["llr_bounds"] == (sprt.LOWER_BOUND, sprt.UPPER_BOUND)
+    assert streamed[-1]["llr"] == report["llr"]
+
+    # A decided tournament resumed from its checkpoint plays no more games
+    streamed = []
+    t = Tournament("m", "e", num_games=400, sprt=sprt,
+                   checkpoint_path=checkpoint, on_result=streamed.append)
+    assert t.run()["games"] == report["games"]
+    assert streamed == []
+
+    # Without an SPRT, reports carry no LLR
+    assert "llr" not in Tournament("m", "e", num_games=2).run()
+
+
+def test_run_sprt_workers():
+    t: Tournament = Tournament("m", "e", num_games=400, workers=2,
+                               sprt=SPRT(elo0=0, elo1=150))
+    report = t.run()
+    assert report["decision"] is not None
+    assert report["games"] < 400
@@ -0,0 +1,258 @@
+import array
+
+
+class TranspositionTable:
+    """
+    Purpose:
+    The TranspositionTable class caches search results by position hash so
+    that a position reached through different move orders is only searched
+    once. The table has a fixed memory footprint: it is preallocated as flat
+    arrays of keys, scores and packed entry data rather than a dict of
+    objects. Entries are grouped into two-slot buckets; the first slot keeps
+    the deepest result seen for the bucket (depth-preferred) and the second
+    slot always takes the newest result (always-replace).
+
+    A table given a byte buffer, such as a shared memory block used by
+    several processes at once, views its arrays onto that buffer. Each slot
+    stores its key XORed with its score and data, so a slot torn by two
+    processes writing at the same time fails the key check and reads as a
+    miss. A table of its own uses plain arrays instead, since viewing bytes
+    as integers (memoryview.cast) needs Python 3, and the Processing sketch
+    runs on Python 2.7 under Jython.
+
+    Methods:
+    calculate_bytes: returns the size of the buffer backing a table
+    _calculate_num_buckets: returns the number of buckets in a table
+    _allocate: creates the arrays of a table of its own
+    probe: looks up the entry stored for a position hash
+    store: saves a search result for a position hash
+    clear: empties the table and resets its counters
+
+    Attributes:
+    _size_mb: float, the memory budget of the table (MB)
+    _num_buckets: int, the number of two-slot buckets in the table
+    _BUCKET_MASK: int, bitmask mapping a hash onto a bucket index
+    _buffer: Optional[bytearray or memoryview], the memory backing the
+        table, or None for a table of its own
+    _keys: array or memoryview[int], the 64-bit hash stored in each slot,
+        XORed with the slot's score and data
+    _scores: array or memoryview[int], the score stored in each slot
+    _data: array or memoryview[int], the move, bound type and depth of each
+        slot packed into one integer (bound type 0 marks an empty slot)
+    _hits: int, the number of probes that found their position
+    _misses: int, the number of probes that did not find their position
+    _collisions: int, the number of misses whose bucket held other positions
+    _stores: int, the number of results stored
+    """
+
+    EXACT = 1
+    LOWER_BOUND = 2
+    UPPER_BOUND = 3
+
+    SLOT_BYTES = 16  # 8 byte key + 4 byte score + 4 byte data
+    SLOTS_PER_BUCKET = 2
+    NO_MOVE = -1
+
+    # Layout of the packed data: move + 1 in bits 0-9, bound in bits 10-11
+    # and depth in the bits above
+    MOVE_MASK = 0x3FF
+    BOUND_SHIFT = 10
+    DEPTH_SHIFT = 12
+
+    def __init__(self, size_mb=4, buffer=None):
+        self._size_mb = size_mb
+        self._num_buckets = self._calculate_num_buckets(size_mb)
+        self._BUCKET_MASK = self._num_buckets - 1
+
+        num_slots = self._num_buckets * self.SLOTS_PER_BUCKET
+        self._buffer = buffer
+        if buffer is None:
+            self._keys, self._scores, self._data = self._allocate(num_slots)
+        else:
+            view = memoryview(buffer)
+            self._keys = view[:8 * num_slots].cast("Q")
+            self._scores = view[8 * num_slots:12 * num_slots].cast("i")
+            self._data = view[12 * num_slots:16 * num_slots].cast("I")
+
+        self._hits = 0
+        self._misses = 0
+        self._collisions = 0
+        self._stores = 0
+
+    @property
+    def size_mb(self):
+        """getter method for self._size_mb"""
+        return self._size_mb
+
+    @property
+    def num_buckets(self):
+        """getter method for self._num_buckets"""
+        return self._num_buckets
+
+    @property
+    def buffer(self):
+        """getter method for self._buffer"""
+        return self._buffer
+
+    @property
+    def hits(self):
+        """getter method for self._hits"""
+        return self._hits
+
+    @property
+    def misses(self):
+        """getter method for self._misses"""
+        return self._misses
+
+    @property
+    def collisions(self):
+        """getter method for self._collisions"""
+        return self._collisions
+
+    @property
+    def stores(self):
+        """getter method for self._stores"""
+        return self._stores
+
+    @property
+    def hit_rate(self):
+        """getter method for the fraction of probes that were hits"""
+        probes = self._hits + self._misses
+        return self._hits / float(probes) if probes else 0.0
+
+    @classmethod
+    def _calculate_num_buckets(cls, size_mb):
+        """
+        Function -- _calculate_num_buckets
+            Calculates the number of buckets that fit in the memory budget,
+            rounded down to a power of two so that a hash maps onto a bucket
+            by masking
+        Parameters:
+            size_mb: float, the memory budget of the table (MB)
+        Returns:
+            num_buckets: int, the number of two-slot buckets
+        """
+        bucket_bytes = cls.SLOT_BYTES * cls.SLOTS_PER_BUCKET
+        max_buckets = max(1, int(size_mb * (1 << 20)) // bucket_bytes)
+        return 1 << (max_buckets.bit_length() - 1)
+
+    @classmethod
+    def calculate_bytes(cls, size_mb):
+        """
+        Function -- calculate_bytes
+            Calculates the size of the buffer backing a table with the given
+            memory budget, for callers that allocate the buffer themselves
+        Parameters:
+            size_mb: float, the memory budget of the table (MB)
+        Returns:
+            num_bytes: int, the size of the buffer in bytes
+        """
+        return (cls._calculate_num_buckets(size_mb) *
+                cls.SLOTS_PER_BUCKET * cls.SLOT_BYTES)
+
+    @staticmethod
+    def _allocate(num_slots):
+        """
+        Function -- _allocate
+            Creates the zeroed key, score and data arrays of a table that
+            does not share a buffer. Python 2.7 has no 64-bit array type, so
+            the keys are kept in a list there.
+        Parameters:
+            num_slots: int, the number of slots in the table
+        Returns:
+            arrays: tuple[array or list, array, array], the keys, scores and
+                data of every slot
+        """
+        try:
+            keys = array.array("Q", [0]) * num_slots
+        except ValueError:
+            keys = [0] * num_slots
+        return (keys,
+                array.array("i", [0]) * num_slots,
+                array.array("I", [0]) * num_slots)
+
+    def probe(self, key):
+        """
+        Function -- probe
+            Looks up the entry stored for a position hash in both slots of
+            its bucket
+        Parameters:
+            key: int, the 64-bit hash of the position
+        Returns:
+            entry: Optional[tuple[int, int, int, int]], the depth, bound type,
+                score and best move (NO_MOVE if none) of the stored result,
+                or None if the position is not in the table
+        """
+        slot = (key & self._BUCKET_MASK) * self.SLOTS_PER_BUCKET
+        occupied = False
+
+        for slot in (slot, slot + 1):
+            data = self._data[slot]
+            if not data:
+                continue
+            score = self._scores[slot]
+            if self._keys[slot] == key ^ (
+                    (data << 32) | (score & 0xFFFFFFFF)):
+                self._hits += 1
+                return (data >> self.DEPTH_SHIFT,
+                        (data >> self.BOUND_SHIFT) & 0x3,
+                        score,
+                        (data & self.MOVE_MASK) - 1)
+            occupied = True
+
+        self._misses += 1
+        if occupied:
+            self._collisions += 1
+        return None
+
+    def store(self, key, depth, bound, score, move):
+        """
+        Function -- store
+            Saves a search result for a position hash. The result replaces the
+            depth-preferred slot of its bucket if that slot holds the same
+            position or a result searched no deeper; otherwise it replaces
+            the always-replace slot.
+        Parameters:
+            key: int, the 64-bit hash of the position
+            depth: int, the number of plies the position was searched
+            bound: int, EXACT, LOWER_BOUND or UPPER_BOUND
+            score: int, the score of the position for the player to move
+            move: int, the bit index of the best move, or NO_MOVE
+        Returns:
+            None
+        """
+        slot = (key & self._BUCKET_MASK) * self.SLOTS_PER_BUCKET
+        data = self._data[slot]
+
+        if data and depth < data >> self.DEPTH_SHIFT and (
+                self._keys[slot] != key ^ (
+                    (data << 32) | (self._scores[slot] & 0xFFFFFFFF))):
+            slot += 1
+
+        data = ((depth << self.DEPTH_SHIFT) |
+                (bound << self.BOUND_SHIFT) |
+                (move + 1))
+        self._keys[slot] = key ^ ((data << 32) | (score & 0xFFFFFFFF))
+        self._scores[slot] = score
+        self._data[slot] = data
+        self._stores += 1
+
+    def clear(self):
+        """
+        Function -- clear
+            Empties every slot of the table and resets its counters
+        Parameters:
+            None
+        Returns:
+            None
+        """
+        if self._buffer is None:
+            self._keys, self._scores, self._data = self._allocate(
+                len(self._keys))
+        else:
+            self._buffer[:] = bytes(len(self._buffer))
+
+        self._hits = 0
+        self._misses = 0
+        self._collisions = 0
+        self._stores = 0
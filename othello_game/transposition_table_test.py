@@ -0,0 +1,89 @@
+from transposition_table import TranspositionTable
+
+
+def test_constructor():
+    tt: TranspositionTable = TranspositionTable(size_mb=1)
+    assert isinstance(tt, TranspositionTable)
+    assert tt.size_mb == 1
+    # 1 MB of 32 byte buckets
+    assert tt.num_buckets == (1 << 20) // 32
+    assert tt.hits == 0
+    assert tt.misses == 0
+    assert tt.collisions == 0
+    assert tt.stores == 0
+    assert tt.hit_rate == 0.0
+    # A table of its own is backed by arrays rather than a byte buffer
+    assert tt.buffer is None
+
+    # Bucket counts are rounded down to a power of two
+    tt = TranspositionTable(size_mb=0.05)
+    assert tt.num_buckets == 1024
+
+
+def test_probe_and_store():
+    tt: TranspositionTable = TranspositionTable(size_mb=1)
+    key = 0x123456789ABCDEF0
+    assert tt.probe(key) is None
+    assert tt.misses == 1
+
+    tt.store(key, 5, TranspositionTable.EXACT, -250, 19)
+    assert tt.probe(key) == (5, TranspositionTable.EXACT, -250, 19)
+    assert tt.hits == 1
+    assert tt.hit_rate == 0.5
+
+    tt.store(key, 3, TranspositionTable.LOWER_BOUND, 40,
+             TranspositionTable.NO_MOVE)
+    assert tt.probe(key) == (3, TranspositionTable.LOWER_BOUND, 40,
+                             TranspositionTable.NO_MOVE)
+
+
+def test_replacement_policy():
+    tt: TranspositionTable = TranspositionTable(size_mb=1)
+    bucket_offset = tt.num_buckets
+    deep_key = 7
+    shallow_key = 7 + bucket_offset
+    newest_key = 7 + 2 * bucket_offset
+
+    # The deep result keeps the depth-preferred slot of the bucket
+    tt.store(deep_key, 8, TranspositionTable.EXACT, 1, 0)
+    tt.store(shallow_key, 2, TranspositionTable.EXACT, 2, 1)
+    assert tt.probe(deep_key) is not None
+    assert tt.probe(shallow_key) is not None
+
+    # Shallower results always replace the second slot
+    tt.store(newest_key, 1, TranspositionTable.EXACT, 3, 2)
+    assert tt.probe(deep_key) is not None
+    assert tt.probe(newest_key) is not None
+    assert tt.probe(shallow_key) is None
+    assert tt.collisions == 1
+
+    # Deeper results take over the depth-preferred slot
+    tt.store(shallow_key, 9, TranspositionTable.EXACT, 4, 3)
+    assert tt.probe(shallow_key) == (9, TranspositionTable.EXACT, 4, 3)
+    assert tt.probe(deep_key) is None
+
+
+def test_clear():
+    tt: TranspositionTable = TranspositionTable(size_mb=1)
+    tt.store(42, 4, TranspositionTable.UPPER_BOUND, 0, 5)
+    tt.probe(42)
+    tt.clear()
+    assert tt.probe(42) is None
+    assert tt.hits == 0
+    assert tt.stores == 0
+
+
+def test_shared_buffer():
+    buffer = bytearray(TranspositionTable.calculate_bytes(1))
+    assert len(buffer) == (1 << 20)
+    writer: TranspositionTable = TranspositionTable(1, buffer=buffer)
+    reader: TranspositionTable = TranspositionTable(1, buffer=buffer)
+    assert reader.buffer is buffer
+
+    # Tables on the same buffer see each other's results
+    writer.store(42, 4, TranspositionTable.EXACT, -7, 5)
+    assert reader.probe(42) == (4, TranspositionTable.EXACT, -7, 5)
+
+    # A slot whose score no longer matches its key reads as a miss
+    reader._scores[42 * TranspositionTable.SLOTS_PER_BUCKET] = 99
+    assert reader.probe(42) is None
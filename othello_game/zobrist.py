@@ -0,0 +1,123 @@
+import random
+
+
+class Zobrist:
+    """
+    Purpose:
+    The Zobrist class supplies the random 64-bit keys used to hash Othello
+    positions. A position's hash is the XOR of one key per tile (chosen by
+    square and color) and, when white is to move, the side-to-move key.
+    Because XOR is its own inverse, a hash can be updated in constant time
+    as tiles are placed and flipped instead of being recomputed from the
+    whole board. Keys are generated from a fixed seed so that every process
+    produces the same hash for the same position.
+
+    Methods:
+    _generate_keys: creates the tile and side-to-move keys for a board size
+    tile_key: returns the key of a tile of a given color on a given square
+    flip_key: returns the key change of flipping the tile on a given square
+    calculate_hash: computes the full hash of a position from its bitmasks
+
+    Attributes:
+    _size: int, the number of squares along one side of the board
+    _BLACK_KEYS: list[int], the key of a black tile on each square
+    _WHITE_KEYS: list[int], the key of a white tile on each square
+    _FLIP_KEYS: list[int], the XOR of the black and white key of each square
+    _SIDE_KEY: int, the key XORed into the hash when white is to move
+    """
+
+    SEED = 20220624
+
+    # Keys depend only on the board size, so they are shared by all Zobrist
+    # instances of the same size
+    _KEY_CACHE = {}
+
+    def __init__(self, size):
+        self._size = size
+        (self._BLACK_KEYS,
+         self._WHITE_KEYS,
+         self._FLIP_KEYS,
+         self._SIDE_KEY) = self._generate_keys(size)
+
+    @property
+    def size(self):
+        """getter method for self._size"""
+        return self._size
+
+    @property
+    def SIDE_KEY(self):
+        """getter method for self._SIDE_KEY"""
+        return self._SIDE_KEY
+
+    @classmethod
+    def _generate_keys(cls, size):
+        """
+        Function -- _generate_keys
+            Creates the black, white, flip and side-to-move keys for a board
+            of the given size from the fixed SEED
+        Parameters:
+            size: int, the number of squares along one side of the board
+        Returns:
+            keys: tuple[list[int], list[int], list[int], int], the black,
+                white and flip keys of each square and the side-to-move key
+        """
+        if size in cls._KEY_CACHE:
+            return cls._KEY_CACHE[size]
+
+        rng = random.Random(cls.SEED + size)
+        black_keys = [rng.getrandbits(64) for _ in range(size * size)]
+        white_keys = [rng.getrandbits(64) for _ in range(size * size)]
+        flip_keys = [black_key ^ white_key
+                     for black_key, white_key in zip(black_keys, white_keys)]
+        side_key = rng.getrandbits(64)
+
+        cls._KEY_CACHE[size] = (black_keys, white_keys, flip_keys, side_key)
+        return cls._KEY_CACHE[size]
+
+    def tile_key(self, color, index):
+        """
+        Function -- tile_key
+            Returns the key of a tile of the given color on a square
+        Parameters:
+            color: str, the tile color ("black" or "white")
+            index: int, the bit index of the square
+        Returns:
+            key: int, the 64-bit key of the tile
+        """
+        if color == "black":
+            return self._BLACK_KEYS[index]
+        return self._WHITE_KEYS[index]
+
+    def flip_key(self, index):
+        """
+        Function -- flip_key
+            Returns the key that changes a hash when the tile on a square is
+            flipped from one color to the other
+        Parameters:
+            index: int, the bit index of the square
+        Returns:
+            key: int, the 64-bit flip key of the square
+        """
+        return self._FLIP_KEYS[index]
+
+    def calculate_hash(self, black, white, side_to_move):
+        """
+        Function -- calculate_hash
+            Computes the full hash of a position from its tile bitmasks
+        Parameters:
+            black: int, bitmask of all squares holding a black tile
+            white: int, bitmask of all squares holding a white tile
+            side_to_move: str, the color of the player to move
+        Returns:
+            position_hash: int, the 64-bit hash of the position
+        """
+        position_hash = self._SIDE_KEY if side_to_move == "white" else 0
+
+        for index in range(self._size * self._size):
+            bit = 1 << index
+            if black & bit:
+                position_hash ^= self._BLACK_KEYS[index]
+            elif white & bit:
+                position_hash ^= self._WHITE_KEYS[index]
+
+        return position_hash
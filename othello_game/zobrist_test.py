@@ -0,0 +1,25 @@
+from zobrist import Zobrist
+
+
+def test_constructor():
+    z: Zobrist = Zobrist(8)
+    assert isinstance(z, Zobrist)
+    assert z.size == 8
+    assert 0 <= z.SIDE_KEY < 1 << 64
+
+    # Keys are deterministic across instances (and processes)
+    assert Zobrist(8).tile_key("black", 10) == z.tile_key("black", 10)
+
+
+def test_tile_and_flip_keys():
+    z: Zobrist = Zobrist(8)
+    assert z.tile_key("black", 0) != z.tile_key("white", 0)
+    assert z.flip_key(5) == z.tile_key("black", 5) ^ z.tile_key("white", 5)
+
+
+def test_calculate_hash():
+    z: Zobrist = Zobrist(8)
+    assert z.calculate_hash(0, 0, "black") == 0
+    assert z.calculate_hash(0, 0, "white") == z.SIDE_KEY
+    assert z.calculate_hash(0b1, 0b10, "black") == (
+        z.tile_key("black", 0) ^ z.tile_key("white", 1))